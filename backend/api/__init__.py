@@ -62,5 +62,15 @@ def create_app():
     # Register blueprints (import here to avoid circular imports)
     from api.controllers.api import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
+
+    # In debug mode, report per-request identity map hits vs. user/follow queries
+    from api.repositories import identity_map
+
+    @app.after_request
+    def add_identity_map_stats(response):
+        if app.debug:
+            stats = identity_map.stats()
+            response.headers['X-Identity-Map'] = f"hits={stats['hits']}; queries={stats['queries']}"
+        return response
     
     return app
\ No newline at end of file
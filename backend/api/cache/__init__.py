@@ -0,0 +1,30 @@
+from api.config import Config
+from api.cache.backends import MISS, MemoryBackend
+from api.cache.cache import Cache, cache_key, cached
+from api.cache.redis_backend import RedisBackend, RespConnection
+
+# How query results are cached: 'memory' (per process), 'redis' (shared) or 'none'
+CACHE_BACKENDS = ("memory", "redis", "none")
+
+
+def build_backend(name: str):
+    """Backend instance for a CACHE_BACKEND setting"""
+    if name == "memory":
+        return MemoryBackend(Config.CACHE_MAX_ENTRIES)
+    if name == "redis":
+        return RedisBackend.from_url(Config.CACHE_REDIS_URL)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+# Process-wide cache used by @cached repository methods
+cache = Cache(
+    build_backend(Config.CACHE_BACKEND), Config.CACHE_DEFAULT_TTL,
+    Config.CACHE_REBUILD_LOCK_TTL, Config.CACHE_REBUILD_WAIT
+)
+
+__all__ = [
+    "CACHE_BACKENDS", "Cache", "MISS", "MemoryBackend", "RedisBackend", "RespConnection",
+    "build_backend", "cache", "cache_key", "cached"
+]
@@ -0,0 +1,97 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+# Returned by backends on a miss (None is a cacheable value)
+MISS = object()
+
+
+class MemoryBackend:
+    """In-process LRU cache with per-entry TTLs and tag-based invalidation.
+
+    Values are deep-copied on read and write, so callers can modify what they get back
+    without changing the cached entry.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        # key -> (expires_at, value, tags), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # Reentrant so add() can check and set atomically
+        self._lock = threading.RLock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return MISS
+            self._entries.move_to_end(key)
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        value = copy.deepcopy(value)
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store value only if key is absent (or expired). Returns whether it was stored."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            self.set(key, value, ttl)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        with self._lock:
+            keys = set().union(*(self._tags.get(tag, set()) for tag in tags)) if tags else set()
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its tag memberships (caller holds the lock)"""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tags[tag]
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        return {"entries": len(self._entries), "evictions": self.evictions, "expirations": self.expirations}
@@ -0,0 +1,235 @@
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from flask import current_app, has_app_context
+
+from api.cache.backends import MISS
+
+# Tags of a cached result: fixed strings, or a function of (result, *args, **kwargs)
+Tags = Union[Iterable[str], Callable[..., Iterable[str]]]
+
+
+class Cache:
+    """Process-wide cache front end: metrics and error handling around a pluggable backend.
+
+    A backend error (e.g. the cache server is down) counts as a miss and never fails the
+    request. With no backend configured every lookup is a miss and nothing is stored.
+    """
+
+    def __init__(self, backend=None, default_ttl: float = 60, rebuild_lock_ttl: float = 30,
+                 rebuild_wait: float = 5):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        # Stale-while-revalidate: how long one worker may hold a key's rebuild lock, and how
+        # long other workers wait for that rebuild on a cold miss before building it themselves
+        self.rebuild_lock_ttl = rebuild_lock_ttl
+        self.rebuild_wait = rebuild_wait
+        self._lock = threading.Lock()
+        # Keys this process is already refreshing in the background
+        self._refreshing = set()
+        self._counters = {
+            "hits": 0, "misses": 0, "sets": 0, "invalidations": 0, "errors": 0,
+            "stale_hits": 0, "refreshes": 0
+        }
+
+    def configure(self, backend, default_ttl: Optional[float] = None) -> None:
+        """Swap the backend (None disables caching) and reset the metrics"""
+        self.backend = backend
+        if default_ttl is not None:
+            self.default_ttl = default_ttl
+        self.reset_metrics()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, key: str) -> Any:
+        """Cached value for key, or MISS"""
+        if self.backend is None:
+            self._count("misses")
+            return MISS
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            self._count("errors")
+            print(f"Cache get failed for {key}: {e}")
+            value = MISS
+        self._count("misses" if value is MISS else "hits")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        """Store value under key for ttl seconds, listed under each of tags"""
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value, self.default_ttl if ttl is None else ttl, tags)
+            self._count("sets")
+        except Exception as e:
+            self._count("errors")
+            print(f"Cache set failed for {key}: {e}")
+
+    def delete(self, *keys: str) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.delete(*keys)
+        except Exception as e:
+            self._count("errors")
+            print(f"Cache delete failed: {e}")
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry stored under any of tags. Returns the number of entries dropped."""
+        if self.backend is None or not tags:
+            return 0
+        try:
+            dropped = self.backend.invalidate_tags(*tags)
+        except Exception as e:
+            self._count("errors")
+            print(f"Cache invalidation failed for {tags}: {e}")
+            return 0
+        self._count("invalidations", dropped)
+        return dropped
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def fetch(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None,
+              soft_ttl: Optional[float] = None, tags: Tags = ()) -> Any:
+        """Cached value for key, calling loader() to build (and store) it on a miss.
+
+        With soft_ttl the entry is served stale-while-revalidate: once older than soft_ttl
+        it is still returned immediately while one background thread rebuilds it, and it
+        is only dropped after ttl (the hard limit on staleness). Rebuilds of a key are
+        single-flight across every worker sharing the backend.
+        """
+        if self.backend is None:
+            self._count("misses")
+            return loader()
+        ttl = self.default_ttl if ttl is None else ttl
+        if soft_ttl is None:
+            value = self.get(key)
+            if value is MISS:
+                value = loader()
+                self.set(key, value, ttl, _resolve_tags(tags, value))
+            return value
+
+        entry = self.get(key)
+        if entry is not MISS:
+            fresh_until, value = entry
+            if time.time() >= fresh_until:
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader, ttl, soft_ttl, tags)
+            return value
+
+        value = self._rebuild(key, loader, ttl, soft_ttl, tags)
+        if value is not MISS:
+            return value
+        # Another worker is building it: wait for its result rather than piling onto the database
+        deadline = time.monotonic() + self.rebuild_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = self.get(key)
+            if entry is not MISS:
+                return entry[1]
+        return loader()
+
+    def _rebuild(self, key: str, loader: Callable[[], Any], ttl: float, soft_ttl: float, tags: Tags) -> Any:
+        """Build and store the entry if this worker wins the key's rebuild lock, else return MISS"""
+        lock_key = f"rebuild-lock:{key}"
+        try:
+            acquired = self.backend.add(lock_key, True, self.rebuild_lock_ttl)
+        except Exception as e:
+            self._count("errors")
+            print(f"Cache lock failed for {key}: {e}")
+            acquired = True
+        if not acquired:
+            return MISS
+        try:
+            value = loader()
+            self.set(key, (time.time() + soft_ttl, value), ttl, _resolve_tags(tags, value))
+            self._count("refreshes")
+            return value
+        finally:
+            self.delete(lock_key)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any], ttl: float, soft_ttl: float,
+                               tags: Tags) -> None:
+        """Rebuild a stale entry on a daemon thread (inside a copy of the Flask app context)"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def run():
+            try:
+                if app is None:
+                    self._rebuild(key, loader, ttl, soft_ttl, tags)
+                else:
+                    with app.app_context():
+                        self._rebuild(key, loader, ttl, soft_ttl, tags)
+            except Exception as e:
+                print(f"Background cache refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"cache-refresh:{key}", daemon=True).start()
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss/stale hit/refresh/set/invalidation/error counters plus the backend's entry and eviction counts"""
+        with self._lock:
+            metrics = dict(self._counters)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_ratio"] = round(metrics["hits"] / lookups, 4) if lookups else None
+        metrics["backend"] = self.backend.name if self.backend is not None else None
+        if self.backend is not None:
+            metrics.update(self.backend.stats())
+        return metrics
+
+
+def cache_key(namespace: str, args: tuple, kwargs: dict) -> str:
+    """Deterministic key for a call: namespace plus the repr of its arguments"""
+    parts = [repr(arg) for arg in args]
+    parts += [f"{name}={value!r}" for name, value in sorted(kwargs.items())]
+    return f"{namespace}({', '.join(parts)})"
+
+
+def _resolve_tags(tags: Tags, value: Any) -> Iterable[str]:
+    return tags(value) if callable(tags) else tags
+
+
+def cached(namespace: str, ttl: Optional[float] = None, tags: Tags = (), cache: Optional[Cache] = None,
+           soft_ttl: Optional[float] = None):
+    """Cache a repository method's result under namespace + its arguments (self excluded).
+
+    tags is a list of tags, or a function called as tags(result, *args, **kwargs) returning
+    them, so results can be tagged with the rows they contain (e.g. "user:42"). With
+    soft_ttl, results are served stale-while-revalidate (see Cache.fetch).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            target = cache if cache is not None else _default_cache()
+            entry_tags = (lambda value: tags(value, *args, **kwargs)) if callable(tags) else tags
+            return target.fetch(
+                cache_key(namespace, args, kwargs),
+                lambda: method(self, *args, **kwargs),
+                ttl, soft_ttl, entry_tags
+            )
+        return wrapper
+    return decorator
+
+
+def _default_cache() -> Cache:
+    # Imported lazily so tests can reconfigure the process-wide instance
+    from api.cache import cache
+    return cache
@@ -0,0 +1,245 @@
+import pickle
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from api.cache.backends import MISS
+
+
+class RedisError(Exception):
+    """Error reply from the server (-ERR ...)"""
+
+
+class RedisUnavailable(ConnectionError):
+    """Raised without contacting the server while the connection's circuit breaker is open"""
+
+
+class _RespSocket:
+    """One open connection to the server"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile("rb")
+
+    def send(self, payload: bytes) -> None:
+        self.sock.sendall(payload)
+
+    def read_reply(self) -> Any:
+        line = self.file.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("Connection closed by server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.file.read(length + 2)
+            if len(data) != length + 2:
+                raise EOFError("Connection closed by server")
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self.read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespConnection:
+    """Minimal RESP2 client: just enough of the Redis protocol for the cache backend.
+
+    Keeps a pool of sockets so concurrent threads never wait on each other's round trips;
+    a socket is dropped after any I/O error. After a failure the server is not contacted
+    again for retry_after seconds (calls raise RedisUnavailable at once), so an outage
+    costs one timeout per window instead of one per cached call.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 1.0,
+                 max_idle: int = 16, retry_after: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.retry_after = retry_after
+        self._idle: List[_RespSocket] = []
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 1.0) -> 'RespConnection':
+        """Parse redis://[:password@]host[:port][/db]"""
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(parsed.hostname or "localhost", parsed.port or 6379, db, parsed.password, timeout)
+
+    def execute(self, *args) -> Any:
+        """Send one command and return its reply"""
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: Sequence[Sequence]) -> List[Any]:
+        """Send several commands in one write and read all their replies"""
+        if time.monotonic() < self._down_until:
+            raise RedisUnavailable(f"Redis at {self.host}:{self.port} is unavailable")
+        payload = b"".join(self._encode(command) for command in commands)
+        try:
+            conn = self._acquire()
+        except (OSError, EOFError, RedisError):
+            self._trip()
+            raise
+        try:
+            conn.send(payload)
+            replies = [conn.read_reply() for _ in commands]
+        except (OSError, EOFError):
+            conn.close()
+            self._trip()
+            raise
+        self._release(conn)
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _acquire(self) -> _RespSocket:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        conn = _RespSocket(self.host, self.port, self.timeout)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                conn.send(b"".join(self._encode(command) for command in setup))
+                for _ in setup:
+                    reply = conn.read_reply()
+                    if isinstance(reply, RedisError):
+                        raise reply
+            except BaseException:
+                conn.close()
+                raise
+        return conn
+
+    def _release(self, conn: _RespSocket) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _trip(self) -> None:
+        """Open the circuit breaker and drop idle sockets, which likely broke too"""
+        with self._lock:
+            self._down_until = time.monotonic() + self.retry_after
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    @staticmethod
+    def _encode(command: Sequence) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+
+class RedisBackend:
+    """Cache backend on a Redis-protocol server, shared by every process that points at it.
+
+    Values are pickled; each tag is a set of the keys stored under it, kept at least as
+    long as its longest-lived member.
+    """
+
+    name = "redis"
+
+    def __init__(self, connection: RespConnection, prefix: str = "socialmedia:cache:"):
+        self.connection = connection
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "socialmedia:cache:", timeout: float = 1.0) -> 'RedisBackend':
+        return cls(RespConnection.from_url(url, timeout), prefix)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}key:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Any:
+        data = self.connection.execute("GET", self._key(key))
+        return MISS if data is None else pickle.loads(data)
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        ttl_ms = max(int(ttl * 1000), 1)
+        tags = list(tags)
+        commands = [("SET", self._key(key), pickle.dumps(value), "PX", ttl_ms)]
+        for tag in tags:
+            commands.append(("SADD", self._tag(tag), key))
+            commands.append(("PTTL", self._tag(tag)))
+        replies = self.connection.pipeline(commands)
+        # Only ever extend a tag's lifetime, so it outlives every key it lists
+        extend = [
+            ("PEXPIRE", self._tag(tag), ttl_ms)
+            for tag, remaining in zip(tags, replies[2::2])
+            if remaining < ttl_ms
+        ]
+        if extend:
+            self.connection.pipeline(extend)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        reply = self.connection.execute("SET", self._key(key), pickle.dumps(value), "PX", max(int(ttl * 1000), 1), "NX")
+        return reply is not None
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.connection.execute("DEL", *(self._key(key) for key in keys))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        members = self.connection.pipeline([("SMEMBERS", self._tag(tag)) for tag in tags])
+        keys = {member.decode() for reply in members for member in reply or []}
+        commands = [("DEL", *(self._tag(tag) for tag in tags))]
+        if keys:
+            commands.append(("DEL", *(self._key(key) for key in keys)))
+        replies = self.connection.pipeline(commands)
+        # Tag sets may still list keys that already expired or were invalidated via another tag
+        return replies[1] if keys else 0
+
+    def clear(self) -> None:
+        cursor = "0"
+        while True:
+            cursor, keys = self.connection.execute("SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", 1000)
+            cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+            if keys:
+                self.connection.execute("DEL", *keys)
+            if cursor == "0":
+                break
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        return {"entries": None, "evictions": None, "expirations": None}
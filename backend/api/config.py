@@ -19,3 +19,81 @@ class Config:
     
     # CORS Configuration - allow all origins for development
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
+
+    # Home timeline: how many recent posts to copy into a follower's timeline when a follow is accepted
+    HOME_TIMELINE_BACKFILL_LIMIT = int(os.getenv('HOME_TIMELINE_BACKFILL_LIMIT', '200'))
+
+    # Trending hashtags: default lookback window when ?window= is not given (1h, 24h or 7d)
+    TRENDING_DEFAULT_WINDOW = os.getenv('TRENDING_DEFAULT_WINDOW', '24h')
+
+    # Bulk post hydration: maximum number of IDs accepted by GET /api/posts/batch
+    POST_BATCH_MAX_IDS = int(os.getenv('POST_BATCH_MAX_IDS', '100'))
+
+    # Post search: queries shorter than this fall back to substring (ILIKE) matching
+    SEARCH_MIN_FULLTEXT_LENGTH = int(os.getenv('SEARCH_MIN_FULLTEXT_LENGTH', '3'))
+
+    # Query result cache: 'memory' (LRU per process), 'redis' (shared, any Redis-protocol server) or 'none'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    # Server for the 'redis' backend: redis://[:password@]host[:port][/db]
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # Entries kept by the 'memory' backend before least recently used ones are evicted
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '10000'))
+    # Seconds a cached result lives unless the cached method sets its own TTL
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', '60'))
+    # Stale-while-revalidate (discover, trending, popular posts, active users): entries older than
+    # the soft TTL are served while one background thread rebuilds them ...
+    CACHE_SWR_SOFT_TTL = int(os.getenv('CACHE_SWR_SOFT_TTL', '30'))
+    # ... and are never served once older than the hard TTL (seconds)
+    CACHE_SWR_HARD_TTL = int(os.getenv('CACHE_SWR_HARD_TTL', '300'))
+    # Seconds one worker may hold a key's rebuild lock
+    CACHE_REBUILD_LOCK_TTL = int(os.getenv('CACHE_REBUILD_LOCK_TTL', '30'))
+    # Seconds other workers wait for that rebuild on a cold miss before querying themselves
+    CACHE_REBUILD_WAIT = float(os.getenv('CACHE_REBUILD_WAIT', '5'))
+
+    # Message stream (GET /api/messages/stream): seconds between keep-alive comments on idle streams
+    MESSAGE_STREAM_HEARTBEAT_SECONDS = int(os.getenv('MESSAGE_STREAM_HEARTBEAT_SECONDS', '15'))
+    # Events buffered per open stream; a stream further behind than this is told to resync
+    MESSAGE_STREAM_QUEUE_SIZE = int(os.getenv('MESSAGE_STREAM_QUEUE_SIZE', '100'))
+    # Open streams allowed per process; further stream requests get 503 until one closes
+    MESSAGE_STREAM_MAX_CONNECTIONS = int(os.getenv('MESSAGE_STREAM_MAX_CONNECTIONS', '500'))
+
+    # Like write-behind: queue like/unlike events in process and write them in batches
+    LIKE_WRITE_BEHIND_ENABLED = os.getenv('LIKE_WRITE_BEHIND_ENABLED', 'false').lower() == 'true'
+    # Flush queued likes at least this often (milliseconds) ...
+    LIKE_WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv('LIKE_WRITE_BEHIND_FLUSH_INTERVAL_MS', '200'))
+    # ... or as soon as this many events are queued (also the most a crash can lose per process)
+    LIKE_WRITE_BEHIND_MAX_EVENTS = int(os.getenv('LIKE_WRITE_BEHIND_MAX_EVENTS', '1000'))
+    # Failed flushes in a row after which the queued events are dropped instead of retried
+    LIKE_WRITE_BEHIND_MAX_RETRIES = int(os.getenv('LIKE_WRITE_BEHIND_MAX_RETRIES', '3'))
+
+    # Background scheduler (started by app.py) for periodic maintenance jobs
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    # Seconds between REFRESH MATERIALIZED VIEW CONCURRENTLY popular_posts_view (0 disables the job)
+    POPULAR_POSTS_REFRESH_INTERVAL = int(os.getenv('POPULAR_POSTS_REFRESH_INTERVAL', '60'))
+    # Seconds between hot score recomputations for the discover feed (0 disables the job)
+    HOT_SCORE_REFRESH_INTERVAL = int(os.getenv('HOT_SCORE_REFRESH_INTERVAL', '300'))
+    # Only posts younger than this are re-scored; older posts are dropped from the ranking (score 0)
+    HOT_SCORE_WINDOW_HOURS = int(os.getenv('HOT_SCORE_WINDOW_HOURS', '168'))
+
+    # Monthly Messages partitions: how many months ahead of the current one to keep created
+    MESSAGE_PARTITIONS_AHEAD = int(os.getenv('MESSAGE_PARTITIONS_AHEAD', '3'))
+    # Seconds between runs of the partition creation job (0 disables the job)
+    MESSAGE_PARTITIONS_INTERVAL = int(os.getenv('MESSAGE_PARTITIONS_INTERVAL', '86400'))
+    # archive_messages.py detaches partitions of months older than this many months
+    MESSAGE_RETENTION_MONTHS = int(os.getenv('MESSAGE_RETENTION_MONTHS', '24'))
+
+    # Message sync: deletions are remembered this many days; older sync tokens get a reset
+    MESSAGE_SYNC_RETENTION_DAYS = int(os.getenv('MESSAGE_SYNC_RETENTION_DAYS', '30'))
+    # Seconds between runs of the deleted-message tombstone pruning job (0 disables the job)
+    MESSAGE_TOMBSTONE_PRUNE_INTERVAL = int(os.getenv('MESSAGE_TOMBSTONE_PRUNE_INTERVAL', '86400'))
+
+    # Friend recommendations: how many suggestions to precompute per user
+    FRIEND_RECOMMENDATIONS_TOP_N = int(os.getenv('FRIEND_RECOMMENDATIONS_TOP_N', '50'))
+    # Users recomputed per batch (one commit per batch during full rebuilds)
+    FRIEND_RECOMMENDATIONS_BATCH_SIZE = int(os.getenv('FRIEND_RECOMMENDATIONS_BATCH_SIZE', '500'))
+    # Recommendation engine: 'sql' (set-based query per batch) or 'numpy' (in-memory CSR follow graph)
+    FRIEND_RECOMMENDATIONS_ENGINE = os.getenv('FRIEND_RECOMMENDATIONS_ENGINE', 'sql')
+    # Seconds between incremental runs for users whose follows changed (0 disables the job)
+    FRIEND_RECOMMENDATIONS_REFRESH_INTERVAL = int(os.getenv('FRIEND_RECOMMENDATIONS_REFRESH_INTERVAL', '300'))
+    # Seconds between full rebuilds for every user (0 disables the job)
+    FRIEND_RECOMMENDATIONS_REBUILD_INTERVAL = int(os.getenv('FRIEND_RECOMMENDATIONS_REBUILD_INTERVAL', '86400'))
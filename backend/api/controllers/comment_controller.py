@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from api.services.comment_service import CommentService
 from api.middleware.jwt import token_required
+from api.utils.pagination import decode_cursor
 
 comment_bp = Blueprint('comment', __name__)
 comment_service = CommentService()
@@ -33,8 +34,12 @@ def get_post_comments(post_id):
     """Get all comments for a specific post"""
     limit = request.args.get('limit', 100, type=int)
     offset = request.args.get('offset', 0, type=int)
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     
-    result = comment_service.get_post_comments(post_id, limit, offset)
+    result = comment_service.get_post_comments(post_id, limit, offset, cursor)
     return jsonify({"success": True, **result}), 200
 
 
@@ -90,8 +95,12 @@ def get_comment_replies(comment_id):
     """Get all replies to a specific comment"""
     limit = request.args.get('limit', 100, type=int)
     offset = request.args.get('offset', 0, type=int)
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     
-    result = comment_service.get_comment_replies(comment_id, limit, offset)
+    result = comment_service.get_comment_replies(comment_id, limit, offset, cursor)
     
     if result.get('success', True):
         return jsonify(result), 200
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from api.services.community_service import CommunityService
 from api.middleware.jwt import token_required
+from api.utils.pagination import decode_cursor, next_cursor
 
 community_bp = Blueprint('community', __name__)
 community_service = CommunityService()
@@ -76,6 +77,7 @@ def search_communities():
         search_term = request.args.get('q', '').strip()
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        mode = request.args.get('mode', 'contains')
         
         if not search_term:
             return jsonify({"error": "Search query parameter 'q' is required"}), 400
@@ -89,7 +91,7 @@ def search_communities():
         # Get user_id if authenticated
         user_id = getattr(request, 'user_id', None)
         
-        communities = community_service.search_communities(search_term, limit, offset, user_id)
+        communities = community_service.search_communities(search_term, limit, offset, user_id, mode)
         
         return jsonify({
             "communities": [c.to_dict() for c in communities],
@@ -224,13 +226,18 @@ def get_community_members(community_id):
             return jsonify({"error": "Limit must be between 1 and 100"}), 400
         if offset < 0:
             return jsonify({"error": "Offset must be non-negative"}), 400
+        try:
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        members = community_service.get_members(community_id, limit, offset)
+        members = community_service.get_members(community_id, limit, offset, cursor)
         
         return jsonify({
             "members": members,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor(members, limit, created_key="joined_at", id_key="user_id")
         }), 200
         
     except ValueError as e:
@@ -19,7 +19,8 @@ def get_popular_posts():
         if result["success"]:
             return jsonify({
                 "posts": result["posts"],
-                "count": result["count"]
+                "count": result["count"],
+                "refreshed_at": result["refreshed_at"]
             }), 200
         
         return jsonify({"error": result.get("error", "Unknown error")}), 500
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, make_response, g
 from api.services.follow_service import FollowService
 from api.middleware.authorization import token_required
+from api.utils.pagination import decode_cursor, next_cursor
 
 follow_bp = Blueprint('follow', __name__)
 follow_service = FollowService()
@@ -49,15 +50,19 @@ def get_followers(user_id):
     try:
         limit = request.args.get('limit', 100, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = decode_cursor(request.args.get('cursor'))
         current_user_id = getattr(g, 'current_user_id', None)
         
-        followers = follow_service.get_followers(user_id, current_user_id, limit, offset)
+        followers = follow_service.get_followers(user_id, current_user_id, limit, offset, cursor)
         
         return make_response(jsonify({
             "followers": followers,
-            "count": len(followers)
+            "count": len(followers),
+            "next_cursor": next_cursor(followers, limit, id_key="follower_id")
         }), 200)
     
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"error": str(e)}), 500)
 
@@ -69,15 +74,19 @@ def get_following(user_id):
     try:
         limit = request.args.get('limit', 100, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = decode_cursor(request.args.get('cursor'))
         current_user_id = getattr(g, 'current_user_id', None)
         
-        following = follow_service.get_following(user_id, current_user_id, limit, offset)
+        following = follow_service.get_following(user_id, current_user_id, limit, offset, cursor)
         
         return make_response(jsonify({
             "following": following,
-            "count": len(following)
+            "count": len(following),
+            "next_cursor": next_cursor(following, limit, id_key="following_id")
         }), 200)
     
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"error": str(e)}), 500)
 
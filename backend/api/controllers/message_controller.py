@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify, make_response, g
+from flask import Blueprint, Response, request, jsonify, make_response, g, stream_with_context
 from api.services.message_service import MessageService
 from api.middleware.authorization import token_required
+from api.utils.pagination import decode_cursor, decode_sync_token
 
 message_bp = Blueprint('message', __name__)
 message_service = MessageService()
@@ -39,11 +40,14 @@ def get_conversations():
         user_id = g.current_user_id
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = decode_cursor(request.args.get('cursor'))
         
-        conversations = message_service.get_conversations(user_id, limit, offset)
+        conversations = message_service.get_conversations(user_id, limit, offset, cursor)
         
         return make_response(jsonify(conversations), 200)
     
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"error": str(e)}), 500)
 
@@ -56,14 +60,17 @@ def get_conversation(other_user_id):
         user_id = g.current_user_id
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        before = decode_cursor(request.args.get('before'))
         
-        result = message_service.get_conversation(user_id, other_user_id, limit, offset)
+        result = message_service.get_conversation(user_id, other_user_id, limit, offset, before)
         
         if not result["success"]:
             return make_response(jsonify({"error": result["error"]}), 400)
         
         return make_response(jsonify(result), 200)
     
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"error": str(e)}), 500)
 
@@ -117,3 +124,48 @@ def get_unread_count():
     
     except Exception as e:
         return make_response(jsonify({"error": str(e)}), 500)
+
+
+@message_bp.route('/messages/sync', methods=['GET'])
+@token_required
+def sync_messages():
+    """Messages and conversation changes of current user since the ?since= sync token"""
+    try:
+        user_id = g.current_user_id
+        since = decode_sync_token(request.args.get('since'))
+        limit = request.args.get('limit', 200, type=int)
+        if limit < 1 or limit > 500:
+            return make_response(jsonify({"error": "Limit must be between 1 and 500"}), 400)
+        
+        result = message_service.sync(user_id, since, limit)
+        
+        return make_response(jsonify(result), 200)
+    
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
+    except Exception as e:
+        return make_response(jsonify({"error": str(e)}), 500)
+
+
+@message_bp.route('/messages/stream', methods=['GET'])
+@token_required
+def stream_messages():
+    """Server-Sent Events stream of new messages and unread count changes for current user"""
+    try:
+        user_id = g.current_user_id
+        
+        stream = message_service.stream_events(user_id)
+        if stream is None:
+            response = make_response(jsonify({"error": "Too many open message streams, try again later"}), 503)
+            response.headers["Retry-After"] = "30"
+            return response
+        
+        return Response(
+            stream_with_context(stream),
+            mimetype='text/event-stream',
+            # Keep proxies from caching or buffering the stream
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    except Exception as e:
+        return make_response(jsonify({"error": str(e)}), 500)
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from api.services.post_service import PostService
 from api.middleware.jwt import token_required
+from api.utils.pagination import decode_cursor
 
 post_bp = Blueprint('post', __name__)
 post_service = PostService()
@@ -35,14 +36,34 @@ def get_post(post_id):
     return jsonify({"success": False, "error": "Post not found"}), 404
 
 
+@post_bp.route('/posts/batch', methods=['GET'])
+@token_required
+def get_posts_batch():
+    """Get many posts by ID (?ids=1,2,3) in the requested order"""
+    try:
+        post_ids = [int(post_id) for post_id in request.args.get('ids', '').split(',') if post_id.strip()]
+    except ValueError:
+        return jsonify({"success": False, "error": "ids must be a comma-separated list of post IDs"}), 400
+    
+    result = post_service.get_posts_batch(post_ids, request.user_id)
+    if result['success']:
+        return jsonify(result), 200
+    return jsonify(result), 400
+
+
 @post_bp.route('/posts/user/<int:user_id>', methods=['GET'])
 @token_required
 def get_user_posts(user_id):
     """Get all posts by a specific user with privacy checks"""
     limit = request.args.get('limit', 50, type=int)
     offset = request.args.get('offset', 0, type=int)
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     
-    result = post_service.get_user_posts(user_id, current_user_id=request.user_id, limit=limit, offset=offset)
+    result = post_service.get_user_posts(user_id, current_user_id=request.user_id, limit=limit, offset=offset,
+                                         cursor=cursor)
     
     if result.get('message') == 'This account is private':
         return jsonify({"success": False, "error": "This account is private", **result}), 403
@@ -56,8 +77,13 @@ def get_community_posts(community_id):
     """Get all posts in a specific community with engagement metrics"""
     limit = request.args.get('limit', 50, type=int)
     offset = request.args.get('offset', 0, type=int)
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     
-    result = post_service.get_community_posts(community_id, current_user_id=request.user_id, limit=limit, offset=offset)
+    result = post_service.get_community_posts(community_id, current_user_id=request.user_id, limit=limit, offset=offset,
+                                              cursor=cursor)
     
     return jsonify({"success": True, **result}), 200
 
@@ -100,8 +126,12 @@ def get_feed():
     """Get authenticated user's feed (posts from followed users)"""
     limit = request.args.get('limit', 50, type=int)
     offset = request.args.get('offset', 0, type=int)
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     
-    result = post_service.get_feed(request.user_id, limit, offset)
+    result = post_service.get_feed(request.user_id, limit, offset, cursor)
     return jsonify({"success": True, **result}), 200
 
 
@@ -111,6 +141,10 @@ def get_discover_feed():
     """Get popular posts for discovery"""
     limit = request.args.get('limit', 50, type=int)
     offset = request.args.get('offset', 0, type=int)
+    if limit < 1 or limit > 100:
+        return jsonify({"success": False, "error": "Limit must be between 1 and 100"}), 400
+    if offset < 0:
+        return jsonify({"success": False, "error": "Offset must be non-negative"}), 400
     
     result = post_service.get_discover_feed(request.user_id, limit, offset)
     return jsonify({"success": True, **result}), 200
@@ -121,8 +155,12 @@ def get_discover_feed():
 def get_trending_hashtags():
     """Get trending hashtags"""
     limit = request.args.get('limit', 5, type=int)
-    result = post_service.get_trending_hashtags(limit)
-    return jsonify(result), 200
+    window = request.args.get('window')
+    result = post_service.get_trending_hashtags(limit, window)
+    
+    if result['success']:
+        return jsonify(result), 200
+    return jsonify(result), 400
 
 
 @post_bp.route('/posts/search', methods=['GET'])
@@ -136,8 +174,12 @@ def search_posts():
     limit = request.args.get('limit', 50, type=int)
     offset = request.args.get('offset', 0, type=int)
     
-    result = post_service.search_posts(query, limit, offset)
-    return jsonify(result), 200
+    cursor = request.args.get('cursor')
+    
+    result = post_service.search_posts(query, limit, offset, request.user_id, cursor)
+    if result['success']:
+        return jsonify(result), 200
+    return jsonify(result), 400
 
 
 @post_bp.route('/posts/<int:post_id>/like', methods=['POST'])
@@ -172,15 +172,19 @@ def search_users():
         query = request.args.get('q', '')
         limit = request.args.get('limit', 20, type=int)
         following_only = request.args.get('following_only', 'false').lower() == 'true'
+        mode = request.args.get('mode', 'contains')
 
         if not query:
             return make_response(jsonify({"error": "Search query 'q' is required"}), 400)
 
         only_following_id = g.current_user_id if following_only else None
-        users = user_service.search_users(query=query, limit=limit, only_following_for_user_id=only_following_id)
+        users = user_service.search_users(query=query, limit=limit, only_following_for_user_id=only_following_id,
+                                          mode=mode)
 
         return make_response(jsonify({"users": users, "count": len(users)}), 200)
 
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"error": str(e)}), 500)
 
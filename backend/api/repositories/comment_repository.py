@@ -1,6 +1,7 @@
 from sqlalchemy import text
 from api.extensions import db
 from api.entities.entities import Comment
+from api.utils.pagination import Cursor, keyset_params
 from typing import Optional, List
 
 
@@ -41,20 +42,22 @@ class CommentRepository:
         row = result.fetchone()
         return Comment.from_row(row)
 
-    def get_by_post_id(self, post_id: int, limit: int = 100, offset: int = 0) -> List[Comment]:
+    def get_by_post_id(self, post_id: int, limit: int = 100, offset: int = 0,
+                       cursor: Optional[Cursor] = None) -> List[Comment]:
         """Get all top-level comments for a specific post (no parent)"""
         query = text("""
             SELECT c.*, u.username, u.profile_picture_url
             FROM Comments c
             JOIN Users u ON c.user_id = u.user_id
             WHERE c.post_id = :post_id AND c.parent_comment_id IS NULL
-            ORDER BY c.created_at ASC 
+              AND (:cursor_created_at IS NULL OR (c.created_at, c.comment_id) > (:cursor_created_at, :cursor_id))
+            ORDER BY c.created_at ASC, c.comment_id ASC 
             LIMIT :limit OFFSET :offset
         """)
         result = self.db.session.execute(query, {
             "post_id": post_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         return [Comment.from_row(row) for row in result.fetchall()]
 
@@ -108,20 +111,22 @@ class CommentRepository:
         result = self.db.session.execute(query, {"post_id": post_id})
         return result.scalar()
 
-    def get_replies(self, comment_id: int, limit: int = 100, offset: int = 0) -> List[Comment]:
+    def get_replies(self, comment_id: int, limit: int = 100, offset: int = 0,
+                    cursor: Optional[Cursor] = None) -> List[Comment]:
         """Get all replies to a specific comment"""
         query = text("""
             SELECT c.*, u.username, u.profile_picture_url
             FROM Comments c
             JOIN Users u ON c.user_id = u.user_id
             WHERE c.parent_comment_id = :comment_id 
-            ORDER BY c.created_at ASC 
+              AND (:cursor_created_at IS NULL OR (c.created_at, c.comment_id) > (:cursor_created_at, :cursor_id))
+            ORDER BY c.created_at ASC, c.comment_id ASC 
             LIMIT :limit OFFSET :offset
         """)
         result = self.db.session.execute(query, {
             "comment_id": comment_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         return [Comment.from_row(row) for row in result.fetchall()]
 
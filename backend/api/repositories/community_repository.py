@@ -1,7 +1,10 @@
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from api.extensions import db
+from api.cache import cache
 from api.entities.entities import Community, CommunityMember
+from api.utils.pagination import Cursor, keyset_params
+from api.utils.search import search_patterns
 from typing import Optional, List
 
 
@@ -85,39 +88,37 @@ class CommunityRepository:
             
         return [Community.from_row(row) for row in result.fetchall()]
     
-    def search(self, search_term: str, limit: int = 50, offset: int = 0, user_id: int = None) -> List[Community]:
-        """Search communities by name or description"""
-        if user_id:
-            query = text("""
-                SELECT c.*, 
-                    CASE WHEN cm.user_id IS NOT NULL THEN TRUE ELSE FALSE END as is_member,
-                    cm.role_id
-                FROM Communities c
-                LEFT JOIN CommunityMembers cm ON c.community_id = cm.community_id AND cm.user_id = :user_id
-                WHERE c.name ILIKE :search_term OR c.description ILIKE :search_term
-                ORDER BY c.created_at DESC 
-                LIMIT :limit OFFSET :offset
-            """)
-            result = self.db.session.execute(query, {
-                "search_term": f"%{search_term}%",
-                "limit": limit,
-                "offset": offset,
-                "user_id": user_id
-            })
+    def search(self, search_term: str, limit: int = 50, offset: int = 0, user_id: int = None,
+               mode: str = "contains") -> List[Community]:
+        """Search communities by name or description, ranked by trigram similarity (or by name prefix)"""
+        contains_pattern, prefix_pattern = search_patterns(search_term)
+        if mode == "prefix":
+            # Served by idx_communities_name_prefix (LOWER(name) text_pattern_ops)
+            match_clause = "LOWER(c.name) LIKE :prefix"
+            order_clause = "LOWER(c.name) ASC"
         else:
-            query = text("""
-                SELECT *, FALSE as is_member, NULL as role_id
-                FROM Communities
-                WHERE name ILIKE :search_term OR description ILIKE :search_term
-                ORDER BY created_at DESC 
-                LIMIT :limit OFFSET :offset
-            """)
-            result = self.db.session.execute(query, {
-                "search_term": f"%{search_term}%",
-                "limit": limit,
-                "offset": offset
-            })
-            
+            # Served by the name/description trigram GIN indexes
+            match_clause = "(c.name ILIKE :search OR c.description ILIKE :search OR c.name % :term)"
+            order_clause = """GREATEST(similarity(c.name, :term), word_similarity(:term, COALESCE(c.description, ''))) DESC,
+                    c.created_at DESC"""
+        query = text(f"""
+            SELECT c.*, 
+                CASE WHEN cm.user_id IS NOT NULL THEN TRUE ELSE FALSE END as is_member,
+                cm.role_id
+            FROM Communities c
+            LEFT JOIN CommunityMembers cm ON c.community_id = cm.community_id AND cm.user_id = :user_id
+            WHERE {match_clause}
+            ORDER BY {order_clause}
+            LIMIT :limit OFFSET :offset
+        """)
+        result = self.db.session.execute(query, {
+            "term": search_term.strip(),
+            "search": contains_pattern,
+            "prefix": prefix_pattern,
+            "limit": limit,
+            "offset": offset,
+            "user_id": user_id
+        })
         return [Community.from_row(row) for row in result.fetchall()]
     
     def update(self, community: Community) -> Optional[Community]:
@@ -139,6 +140,7 @@ class CommunityRepository:
                 "privacy_id": community.privacy_id
             })
             self.db.session.commit()
+            cache.invalidate_tags(f"community:{community.community_id}")
             return Community.from_row(result.fetchone())
         except IntegrityError:
             self.db.session.rollback()
@@ -152,6 +154,7 @@ class CommunityRepository:
         query = text("DELETE FROM Communities WHERE community_id = :community_id RETURNING community_id")
         result = self.db.session.execute(query, {"community_id": community_id})
         self.db.session.commit()
+        cache.invalidate_tags(f"community:{community_id}")
         return result.fetchone() is not None
     
     def add_member(self, community_id: int, user_id: int, role_id: int) -> CommunityMember:
@@ -168,8 +171,10 @@ class CommunityRepository:
                 "user_id": user_id,
                 "role_id": role_id
             })
+            row = result.fetchone()
             self.db.session.commit()
-            return CommunityMember.from_row(result.fetchone())
+            cache.invalidate_tags(f"community:{community_id}")
+            return CommunityMember.from_row(row)
         except IntegrityError:
             self.db.session.rollback()
             raise ValueError("User is already a member of this community")
@@ -188,8 +193,11 @@ class CommunityRepository:
             "community_id": community_id,
             "user_id": user_id
         })
+        removed = result.fetchone() is not None
         self.db.session.commit()
-        return result.fetchone() is not None
+        if removed:
+            cache.invalidate_tags(f"community:{community_id}")
+        return removed
     
     def update_member_role(self, community_id: int, user_id: int, role_id: int) -> Optional[CommunityMember]:
         """Update a member's role in a community"""
@@ -206,13 +214,17 @@ class CommunityRepository:
                 "user_id": user_id,
                 "role_id": role_id
             })
+            row = result.fetchone()
             self.db.session.commit()
-            return CommunityMember.from_row(result.fetchone())
+            if row:
+                cache.invalidate_tags(f"community:{community_id}")
+            return CommunityMember.from_row(row)
         except SQLAlchemyError:
             self.db.session.rollback()
             raise
     
-    def get_members(self, community_id: int, limit: int = 50, offset: int = 0) -> List[dict]:
+    def get_members(self, community_id: int, limit: int = 50, offset: int = 0,
+                    cursor: Optional[Cursor] = None) -> List[dict]:
         """Get all members of a community with user and role details"""
         query = text("""
             SELECT 
@@ -223,13 +235,14 @@ class CommunityRepository:
             JOIN Users u ON cm.user_id = u.user_id
             JOIN Roles r ON cm.role_id = r.role_id
             WHERE cm.community_id = :community_id
-            ORDER BY cm.joined_at DESC
+              AND (:cursor_created_at IS NULL OR (cm.joined_at, cm.user_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY cm.joined_at DESC, cm.user_id DESC
             LIMIT :limit OFFSET :offset
         """)
         result = self.db.session.execute(query, {
             "community_id": community_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         return [dict(row._mapping) for row in result.fetchall()]
     
@@ -1,5 +1,7 @@
 from sqlalchemy import text
 from api.extensions import db
+from api.cache import cached
+from api.config import Config
 from typing import Optional, List, Dict
 
 
@@ -9,9 +11,19 @@ class FeaturesRepository:
     def __init__(self):
         self.db = db
 
+    @cached("features.popular_posts", ttl=Config.CACHE_SWR_HARD_TTL, soft_ttl=Config.CACHE_SWR_SOFT_TTL,
+            tags=lambda posts, *args, **kwargs: [
+        "view:popular_posts_view",
+        *{f"user:{post['author_id']}" for post in posts},
+        *(f"post:{post['post_id']}" for post in posts)
+    ])
     def get_popular_posts(self, limit: int = 20) -> List[Dict]:
         """Get popular posts from the materialized view"""
-        query = text("SELECT * FROM popular_posts_view LIMIT :limit")
+        query = text("""
+            SELECT * FROM popular_posts_view
+            ORDER BY engagement_score DESC, created_at DESC, post_id DESC
+            LIMIT :limit
+        """)
         result = self.db.session.execute(query, {"limit": limit})
         
         posts = []
@@ -33,6 +45,10 @@ class FeaturesRepository:
         
         return posts
 
+    @cached("features.active_users", ttl=Config.CACHE_SWR_HARD_TTL, soft_ttl=Config.CACHE_SWR_SOFT_TTL,
+            tags=lambda users, *args, **kwargs: [
+        f"user:{user['user_id']}" for user in users
+    ])
     def get_active_users(self, limit: int = 20) -> List[Dict]:
         """Get most active users from the view"""
         query = text("SELECT * FROM active_users_view LIMIT :limit")
@@ -50,6 +66,7 @@ class FeaturesRepository:
         
         return users
 
+    @cached("features.community_stats", tags=lambda stats, community_id: [f"community:{community_id}"])
     def get_community_stats(self, community_id: int) -> Optional[Dict]:
         """Get detailed statistics for a community"""
         query = text("SELECT * FROM community_statistics_view WHERE community_id = :cid")
@@ -77,17 +94,24 @@ class FeaturesRepository:
         }
 
     def get_advanced_friend_recommendations(self, user_id: int, limit: int = 20) -> List[Dict]:
-        """Get friend recommendations using friend-of-friend logic"""
-        query = text("SELECT * FROM advanced_friend_recommendations WHERE user_id = :uid LIMIT :limit")
+        """Get precomputed friend-of-friend recommendations (primary key range scan)"""
+        query = text("""
+            SELECT fr.suggested_user_id, u.username, fr.mutual_count, fr.score
+            FROM FriendRecommendations fr
+            JOIN Users u ON u.user_id = fr.suggested_user_id
+            WHERE fr.user_id = :uid
+            ORDER BY fr.rank
+            LIMIT :limit
+        """)
         result = self.db.session.execute(query, {"uid": user_id, "limit": limit})
         
         recommendations = []
         for row in result:
             recommendations.append({
-                "suggested_user_id": row.user_id,
-                "username": row.suggested_username,
+                "suggested_user_id": row.suggested_user_id,
+                "username": row.username,
                 "mutual_count": row.mutual_count,
-                "score": row.recommendation_score
+                "score": row.score
             })
         
         return recommendations
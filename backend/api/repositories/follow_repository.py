@@ -2,6 +2,8 @@ from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from api.extensions import db
 from api.entities.entities import Follow
+from api.repositories import identity_map
+from api.utils.pagination import Cursor, keyset_params
 from typing import Optional, List
 
 
@@ -24,6 +26,7 @@ class FollowRepository:
                 "status_id": follow.status_id
             })
             self.db.session.commit()
+            identity_map.invalidate(("follow", follow.follower_id, follow.following_id))
             return Follow.from_row(result.fetchone())
         except IntegrityError:
             self.db.session.rollback()
@@ -33,7 +36,13 @@ class FollowRepository:
             raise
 
     def get_by_ids(self, follower_id: int, following_id: int) -> Optional[Follow]:
-        """Get follow relationship by follower and following IDs"""
+        """Get follow relationship by follower and following IDs (cached for the rest of the request)"""
+        return identity_map.get_or_load(
+            ("follow", follower_id, following_id),
+            lambda: self._fetch_by_ids(follower_id, following_id)
+        )
+
+    def _fetch_by_ids(self, follower_id: int, following_id: int) -> Optional[Follow]:
         query = text("""
             SELECT * FROM Follows 
             WHERE follower_id = :follower_id AND following_id = :following_id
@@ -60,6 +69,7 @@ class FollowRepository:
                 "status_id": status_id
             })
             self.db.session.commit()
+            identity_map.invalidate(("follow", follower_id, following_id))
             return Follow.from_row(result.fetchone())
         except SQLAlchemyError:
             self.db.session.rollback()
@@ -77,9 +87,11 @@ class FollowRepository:
             "following_id": following_id
         })
         self.db.session.commit()
+        identity_map.invalidate(("follow", follower_id, following_id))
         return result.fetchone() is not None
 
-    def get_followers(self, user_id: int, current_user_id: Optional[int] = None, limit: int = 100, offset: int = 0) -> List[dict]:
+    def get_followers(self, user_id: int, current_user_id: Optional[int] = None, limit: int = 100, offset: int = 0,
+                      cursor: Optional[Cursor] = None) -> List[dict]:
         """Get all followers of a user (only accepted follows)"""
         query = text("""
             SELECT 
@@ -97,18 +109,20 @@ class FollowRepository:
             FROM Follows f
             JOIN Users u ON f.follower_id = u.user_id
             WHERE f.following_id = :user_id AND f.status_id = 2
-            ORDER BY f.created_at DESC
+              AND (:cursor_created_at IS NULL OR (f.created_at, f.follower_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY f.created_at DESC, f.follower_id DESC
             LIMIT :limit OFFSET :offset
         """)
         result = self.db.session.execute(query, {
             "user_id": user_id,
             "current_user_id": current_user_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         return [dict(row._mapping) for row in result.fetchall()]
 
-    def get_following(self, user_id: int, current_user_id: Optional[int] = None, limit: int = 100, offset: int = 0) -> List[dict]:
+    def get_following(self, user_id: int, current_user_id: Optional[int] = None, limit: int = 100, offset: int = 0,
+                      cursor: Optional[Cursor] = None) -> List[dict]:
         """Get all users that a user is following (only accepted follows)"""
         query = text("""
             SELECT 
@@ -126,14 +140,15 @@ class FollowRepository:
             FROM Follows f
             JOIN Users u ON f.following_id = u.user_id
             WHERE f.follower_id = :user_id AND f.status_id = 2
-            ORDER BY f.created_at DESC
+              AND (:cursor_created_at IS NULL OR (f.created_at, f.following_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY f.created_at DESC, f.following_id DESC
             LIMIT :limit OFFSET :offset
         """)
         result = self.db.session.execute(query, {
             "user_id": user_id,
             "current_user_id": current_user_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         return [dict(row._mapping) for row in result.fetchall()]
 
@@ -184,15 +199,14 @@ class FollowRepository:
     def is_following(self, follower_id: int, following_id: int) -> bool:
         """Check if follower is following another user (accepted status)"""
         query = text("""
-            SELECT COUNT(*) as count 
-            FROM Follows 
-            WHERE follower_id = :follower_id 
-            AND following_id = :following_id 
-            AND status_id = 2
+            SELECT EXISTS (
+                SELECT 1 FROM Follows 
+                WHERE follower_id = :follower_id 
+                AND following_id = :following_id 
+                AND status_id = 2
+            )
         """)
-        result = self.db.session.execute(query, {
+        return self.db.session.execute(query, {
             "follower_id": follower_id,
             "following_id": following_id
-        })
-        row = result.fetchone()
-        return row.count > 0 if row else False
+        }).scalar()
@@ -0,0 +1,205 @@
+from sqlalchemy import text
+from api.extensions import db
+from api.utils.follow_graph import FollowGraph, RecommendationBatch
+from typing import List, Optional
+
+# How recommendations are computed: set-based SQL per batch of users, or the in-memory NumPy CSR engine
+RECOMMENDATION_ENGINES = ("sql", "numpy")
+
+# Friend-of-friend candidates scored like get_friend_of_friend_recommendations:
+# mutual friends * 10 + posts * 0.5 + followers * 0.1, keeping the top N per user
+COMPUTE_RECOMMENDATIONS_SQL = """
+    INSERT INTO FriendRecommendations (
+        user_id, rank, suggested_user_id, mutual_count, post_count, follower_count, score, computed_at
+    )
+    WITH candidates AS (
+        SELECT
+            f1.follower_id AS user_id,
+            f2.following_id AS suggested_user_id,
+            COUNT(*) AS mutual_count
+        FROM Follows f1
+        JOIN Follows f2 ON f2.follower_id = f1.following_id AND f2.status_id = f1.status_id
+        WHERE f1.follower_id = ANY(:user_ids)
+          AND f1.status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
+          AND f2.following_id != f1.follower_id
+          AND NOT EXISTS (
+              SELECT 1 FROM Follows f3
+              WHERE f3.follower_id = f1.follower_id
+                AND f3.following_id = f2.following_id
+                AND f3.status_id = f1.status_id
+          )
+        GROUP BY f1.follower_id, f2.following_id
+    ),
+    post_counts AS (
+        SELECT user_id, COUNT(*) AS post_count
+        FROM Posts
+        WHERE user_id IN (SELECT suggested_user_id FROM candidates)
+        GROUP BY user_id
+    ),
+    follower_counts AS (
+        SELECT following_id AS user_id, COUNT(*) AS follower_count
+        FROM Follows
+        WHERE following_id IN (SELECT suggested_user_id FROM candidates)
+          AND status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
+        GROUP BY following_id
+    ),
+    scored AS (
+        SELECT
+            c.user_id,
+            c.suggested_user_id,
+            c.mutual_count,
+            COALESCE(pc.post_count, 0) AS post_count,
+            COALESCE(fc.follower_count, 0) AS follower_count,
+            c.mutual_count * 10.0 + COALESCE(pc.post_count, 0) * 0.5 + COALESCE(fc.follower_count, 0) * 0.1 AS score
+        FROM candidates c
+        LEFT JOIN post_counts pc ON pc.user_id = c.suggested_user_id
+        LEFT JOIN follower_counts fc ON fc.user_id = c.suggested_user_id
+    ),
+    ranked AS (
+        SELECT
+            s.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY s.user_id
+                ORDER BY s.score DESC, s.mutual_count DESC, s.suggested_user_id ASC
+            ) AS rank
+        FROM scored s
+    )
+    SELECT user_id, rank, suggested_user_id, mutual_count, post_count, follower_count, score, CURRENT_TIMESTAMP
+    FROM ranked
+    WHERE rank <= :top_n
+"""
+
+
+class FriendRecommendationRepository:
+    """Repository for the precomputed FriendRecommendations table (batch job side)"""
+
+    def __init__(self):
+        self.db = db
+
+    def _compute(self, user_ids: List[int], top_n: int) -> int:
+        """Replace the stored recommendations of user_ids (caller commits)"""
+        self.db.session.execute(
+            text("DELETE FROM FriendRecommendations WHERE user_id = ANY(:user_ids)"),
+            {"user_ids": user_ids}
+        )
+        result = self.db.session.execute(
+            text(COMPUTE_RECOMMENDATIONS_SQL),
+            {"user_ids": user_ids, "top_n": top_n}
+        )
+        return result.rowcount
+
+    def load_follow_graph(self) -> FollowGraph:
+        """Load accepted follows and per-user post counts into a CSR follow graph"""
+        edges = self.db.session.execute(text("""
+            SELECT follower_id, following_id FROM Follows
+            WHERE status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
+        """)).fetchall()
+        posts = self.db.session.execute(text("""
+            SELECT user_id, COUNT(*) AS post_count FROM Posts
+            WHERE user_id IS NOT NULL
+            GROUP BY user_id
+        """)).fetchall()
+        return FollowGraph.from_edges(
+            [row.follower_id for row in edges],
+            [row.following_id for row in edges],
+            [row.user_id for row in posts],
+            [row.post_count for row in posts]
+        )
+
+    def _store(self, batch: RecommendationBatch) -> int:
+        """Insert one batch computed by the NumPy engine (caller deletes old rows and commits)"""
+        query = text("""
+            INSERT INTO FriendRecommendations (
+                user_id, rank, suggested_user_id, mutual_count, post_count, follower_count, score, computed_at
+            )
+            SELECT user_id, rank, suggested_user_id, mutual_count, post_count, follower_count,
+                   score_tenths / 10.0, CURRENT_TIMESTAMP
+            FROM unnest(
+                CAST(:user_ids AS INT[]), CAST(:ranks AS SMALLINT[]), CAST(:suggested_user_ids AS INT[]),
+                CAST(:mutual_counts AS INT[]), CAST(:post_counts AS INT[]), CAST(:follower_counts AS INT[]),
+                CAST(:score_tenths AS BIGINT[])
+            ) AS r(user_id, rank, suggested_user_id, mutual_count, post_count, follower_count, score_tenths)
+        """)
+        result = self.db.session.execute(query, {
+            "user_ids": batch.user_id.tolist(),
+            "ranks": batch.rank.tolist(),
+            "suggested_user_ids": batch.suggested_user_id.tolist(),
+            "mutual_counts": batch.mutual_count.tolist(),
+            "post_counts": batch.post_count.tolist(),
+            "follower_counts": batch.follower_count.tolist(),
+            "score_tenths": batch.score_tenths.tolist()
+        })
+        return result.rowcount
+
+    def _compute_numpy(self, user_ids: Optional[List[int]], top_n: int, batch_size: int) -> int:
+        """Replace the stored recommendations of user_ids (everyone when None) using the NumPy engine (caller commits)"""
+        graph = self.load_follow_graph()
+        if user_ids is None:
+            self.db.session.execute(text("DELETE FROM FriendRecommendations"))
+        else:
+            self.db.session.execute(
+                text("DELETE FROM FriendRecommendations WHERE user_id = ANY(:user_ids)"),
+                {"user_ids": user_ids}
+            )
+        return sum(self._store(batch) for batch in graph.recommend(user_ids, top_n, batch_size))
+
+    def rebuild_all(self, top_n: int = 50, batch_size: int = 500, engine: str = "sql") -> int:
+        """Recompute recommendations for every user (SQL engine commits one batch of users at a time)"""
+        if engine not in RECOMMENDATION_ENGINES:
+            raise ValueError(f"Unknown recommendation engine: {engine}")
+        started_at = self.db.session.execute(text("SELECT CURRENT_TIMESTAMP")).scalar()
+
+        inserted = 0
+        if engine == "numpy":
+            inserted = self._compute_numpy(None, top_n, batch_size)
+        else:
+            user_ids = [row.user_id for row in self.db.session.execute(
+                text("SELECT user_id FROM Users ORDER BY user_id")
+            ).fetchall()]
+            for i in range(0, len(user_ids), batch_size):
+                inserted += self._compute(user_ids[i:i + batch_size], top_n)
+                self.db.session.commit()
+
+        # Everything marked before the rebuild started is now up to date
+        self.db.session.execute(
+            text("DELETE FROM FriendRecommendationsDirty WHERE marked_at <= :started_at"),
+            {"started_at": started_at}
+        )
+        self.db.session.commit()
+        return inserted
+
+    def refresh_dirty(self, top_n: int = 50, batch_size: int = 500, engine: str = "sql") -> int:
+        """Recompute recommendations for users whose follow set changed since the last run.
+
+        A follow change by user X changes X's own candidates and the friend-of-friend
+        candidates of everyone who follows X, so both are recomputed. Runs in one
+        transaction: marks made while it runs wait on the DELETE and survive for the next run.
+        """
+        if engine not in RECOMMENDATION_ENGINES:
+            raise ValueError(f"Unknown recommendation engine: {engine}")
+        dirty_ids = [row.user_id for row in self.db.session.execute(
+            text("DELETE FROM FriendRecommendationsDirty RETURNING user_id")
+        ).fetchall()]
+        if not dirty_ids:
+            self.db.session.commit()
+            return 0
+
+        query = text("""
+            SELECT DISTINCT follower_id AS user_id FROM Follows
+            WHERE following_id = ANY(:user_ids)
+              AND status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
+        """)
+        follower_ids = [row.user_id for row in self.db.session.execute(query, {"user_ids": dirty_ids}).fetchall()]
+        user_ids = sorted(set(dirty_ids) | set(follower_ids))
+
+        try:
+            if engine == "numpy":
+                self._compute_numpy(user_ids, top_n, batch_size)
+            else:
+                for i in range(0, len(user_ids), batch_size):
+                    self._compute(user_ids[i:i + batch_size], top_n)
+            self.db.session.commit()
+        except Exception:
+            self.db.session.rollback()
+            raise
+        return len(user_ids)
@@ -0,0 +1,66 @@
+from flask import has_request_context, request
+from typing import Any, Callable, Dict, Hashable
+
+# Marks a key that is not in the map (None is a valid cached result: "row does not exist")
+_MISSING = object()
+
+# WSGI environ key holding the map. The environ belongs to exactly one request, whereas
+# flask.g lives as long as the app context, which may span many requests (tests, scripts).
+_ENVIRON_KEY = "socialmedia.identity_map"
+
+
+def _state() -> Dict[str, Any]:
+    """Identity map of the current request, created on first use"""
+    state = request.environ.get(_ENVIRON_KEY)
+    if state is None:
+        state = {"rows": {}, "hits": 0, "queries": 0}
+        request.environ[_ENVIRON_KEY] = state
+    return state
+
+
+def get_or_load(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Return the row cached under key for this request, loading (and caching) it on a miss.
+
+    Outside a request (scripts, scheduler jobs) every call goes to the loader.
+    """
+    if not has_request_context():
+        return loader()
+    state = _state()
+    value = state["rows"].get(key, _MISSING)
+    if value is not _MISSING:
+        state["hits"] += 1
+        return value
+    state["queries"] += 1
+    value = loader()
+    state["rows"][key] = value
+    return value
+
+
+def store(key: Hashable, value: Any) -> None:
+    """Cache a row just written by this request (e.g. the RETURNING row of an UPDATE)"""
+    if has_request_context():
+        _state()["rows"][key] = value
+
+
+def invalidate(*keys: Hashable) -> None:
+    """Forget the given keys for the rest of this request"""
+    if has_request_context():
+        rows = _state()["rows"]
+        for key in keys:
+            rows.pop(key, None)
+
+
+def invalidate_where(predicate: Callable[[Hashable, Any], bool]) -> None:
+    """Forget every (key, row) pair matching predicate for the rest of this request"""
+    if has_request_context():
+        rows = _state()["rows"]
+        for key in [key for key, value in rows.items() if predicate(key, value)]:
+            del rows[key]
+
+
+def stats() -> Dict[str, int]:
+    """Identity map hits and database queries of the current request"""
+    if not has_request_context():
+        return {"hits": 0, "queries": 0}
+    state = _state()
+    return {"hits": state["hits"], "queries": state["queries"]}
@@ -0,0 +1,178 @@
+import atexit
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import text
+
+from api.config import Config
+from api.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# Apply a batch of like/unlike events in one statement. Likes of posts or users deleted
+# since the event was queued are skipped, and like_count/hot_score change once per post.
+FLUSH_SQL = """
+    WITH added AS (
+        INSERT INTO PostLikes (post_id, user_id)
+        SELECT l.post_id, l.user_id
+        FROM unnest(CAST(:like_post_ids AS INT[]), CAST(:like_user_ids AS INT[])) AS l(post_id, user_id)
+        WHERE EXISTS (SELECT 1 FROM Posts p WHERE p.post_id = l.post_id)
+          AND EXISTS (SELECT 1 FROM Users u WHERE u.user_id = l.user_id)
+        ON CONFLICT (post_id, user_id) DO NOTHING
+        RETURNING post_id, 1 AS delta
+    ),
+    removed AS (
+        DELETE FROM PostLikes pl
+        USING unnest(CAST(:unlike_post_ids AS INT[]), CAST(:unlike_user_ids AS INT[])) AS u(post_id, user_id)
+        WHERE pl.post_id = u.post_id AND pl.user_id = u.user_id
+        RETURNING pl.post_id, -1 AS delta
+    ),
+    deltas AS (
+        -- SUM is BIGINT; compute_hot_score and like_count take INT
+        SELECT post_id, CAST(SUM(delta) AS INT) AS delta
+        FROM (SELECT post_id, delta FROM added UNION ALL SELECT post_id, delta FROM removed) changes
+        GROUP BY post_id
+    )
+    UPDATE Posts p
+    SET like_count = GREATEST(p.like_count + d.delta, 0),
+        hot_score = compute_hot_score(GREATEST(p.like_count + d.delta, 0), p.comment_count, p.created_at)
+    FROM deltas d
+    WHERE p.post_id = d.post_id AND d.delta != 0
+"""
+
+
+class LikeWriteBuffer:
+    """In-process write-behind queue for like/unlike events, flushed in batches.
+
+    Events are flushed every flush_interval_ms by a daemon thread, as soon as max_events
+    are queued (in the caller's thread) and at interpreter exit, so a crash loses at most
+    max_events events or flush_interval_ms worth of likes from this process. A failed
+    flush puts its events back to be retried with the next one; only after max_retries
+    failures in a row (e.g. a database outage) are the queued events dropped.
+    """
+
+    def __init__(self, flush_interval_ms: int = 200, max_events: int = 1000, max_retries: int = 3):
+        self.flush_interval_ms = flush_interval_ms
+        self.max_events = max_events
+        self.max_retries = max_retries
+        self._failures = 0
+        # (post_id, user_id) -> True for like, False for unlike; only net changes are kept
+        self._pending: Dict[Tuple[int, int], bool] = {}
+        self._inflight: Dict[Tuple[int, int], bool] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app = None
+        self._exit_hook_registered = False
+
+    def enqueue(self, post_id: int, user_id: int, liked: bool) -> None:
+        """Queue a like (liked=True) or unlike; the caller has checked it changes the current state"""
+        self._ensure_started()
+        key = (post_id, user_id)
+        with self._lock:
+            if key in self._pending and self._pending[key] != liked:
+                # Like then unlike (or the reverse) before a flush cancels out
+                del self._pending[key]
+            else:
+                self._pending[key] = liked
+            full = len(self._pending) >= self.max_events
+        if full:
+            self.flush()
+
+    def pending_state(self, post_id: int, user_id: int) -> Optional[bool]:
+        """Queued (not yet committed) like state of a user for a post, or None if nothing is queued"""
+        key = (post_id, user_id)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            return self._inflight.get(key)
+
+    def pending_delta(self, post_id: int) -> int:
+        """Net like_count change for a post that is queued but not yet committed"""
+        with self._lock:
+            events = list(self._inflight.items()) + list(self._pending.items())
+        return sum(1 if liked else -1 for (event_post_id, _), liked in events if event_post_id == post_id)
+
+    def flush(self) -> int:
+        """Write all queued events in one transaction. Returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            if not batch:
+                return 0
+
+            likes = [key for key, liked in batch.items() if liked]
+            unlikes = [key for key, liked in batch.items() if not liked]
+            try:
+                with self._app.app_context():
+                    try:
+                        db.session.execute(text(FLUSH_SQL), {
+                            "like_post_ids": [post_id for post_id, _ in likes],
+                            "like_user_ids": [user_id for _, user_id in likes],
+                            "unlike_post_ids": [post_id for post_id, _ in unlikes],
+                            "unlike_user_ids": [user_id for _, user_id in unlikes]
+                        })
+                        db.session.commit()
+                    except Exception:
+                        db.session.rollback()
+                        raise
+            except Exception as e:
+                with self._lock:
+                    self._inflight = {}
+                    self._failures += 1
+                    if self._failures > self.max_retries:
+                        self._failures = 0
+                        logger.error("Like write-behind flush failed, dropped %d events: %s", len(batch), e)
+                    else:
+                        self._requeue(batch)
+                        logger.warning("Like write-behind flush failed, will retry %d events: %s", len(batch), e)
+                return 0
+            with self._lock:
+                self._inflight = {}
+                self._failures = 0
+            return len(batch)
+
+    def _requeue(self, batch: Dict[Tuple[int, int], bool]) -> None:
+        """Put a failed batch back in front of the events queued since (caller holds the lock)"""
+        for key, liked in batch.items():
+            if key not in self._pending:
+                self._pending[key] = liked
+            elif self._pending[key] != liked:
+                # A newer opposite event was queued against the failed one: together they cancel out
+                del self._pending[key]
+
+    def _ensure_started(self):
+        """Start the flush thread on first use, bound to the current Flask app"""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._flush_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._app = current_app._get_current_object()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="like-write-buffer", daemon=True)
+            self._thread.start()
+            if not self._exit_hook_registered:
+                atexit.register(self.stop)
+                self._exit_hook_registered = True
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval_ms / 1000):
+            self.flush()
+
+    def stop(self):
+        """Stop the flush thread and write out everything still queued"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._app is not None:
+            self.flush()
+
+
+like_write_buffer = LikeWriteBuffer(
+    Config.LIKE_WRITE_BEHIND_FLUSH_INTERVAL_MS, Config.LIKE_WRITE_BEHIND_MAX_EVENTS, Config.LIKE_WRITE_BEHIND_MAX_RETRIES
+)
@@ -0,0 +1,45 @@
+from sqlalchemy import text
+from api.extensions import db
+from api.cache import cache
+from datetime import datetime
+from typing import Optional
+
+# Materialized views that may be refreshed (names are interpolated into SQL, so keep this a whitelist)
+REFRESHABLE_VIEWS = ("popular_posts_view",)
+
+
+class MaterializedViewRepository:
+    """Repository for refreshing materialized views and tracking their freshness"""
+
+    def __init__(self):
+        self.db = db
+
+    def refresh(self, view_name: str, concurrently: bool = True) -> bool:
+        """Refresh a materialized view. Returns False if another process is already refreshing it."""
+        if view_name not in REFRESHABLE_VIEWS:
+            raise ValueError(f"Unknown materialized view: {view_name}")
+
+        # Transaction-scoped advisory lock: only one refresh per view across all app processes
+        locked = self.db.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:view_name))"),
+            {"view_name": view_name}
+        ).scalar()
+        if not locked:
+            self.db.session.rollback()
+            return False
+
+        mode = "CONCURRENTLY " if concurrently else ""
+        self.db.session.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{view_name}"))
+        self.db.session.execute(text("""
+            INSERT INTO MaterializedViewRefreshes (view_name, refreshed_at)
+            VALUES (:view_name, CURRENT_TIMESTAMP)
+            ON CONFLICT (view_name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at
+        """), {"view_name": view_name})
+        self.db.session.commit()
+        cache.invalidate_tags(f"view:{view_name}")
+        return True
+
+    def get_refreshed_at(self, view_name: str) -> Optional[datetime]:
+        """Get the time of the last successful refresh of a materialized view"""
+        query = text("SELECT refreshed_at FROM MaterializedViewRefreshes WHERE view_name = :view_name")
+        return self.db.session.execute(query, {"view_name": view_name}).scalar()
@@ -0,0 +1,153 @@
+import json
+import queue
+import select
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy import text
+
+from api.config import Config
+
+# Postgres NOTIFY channel for message events. Payload: {"type": ..., "user_ids": [...], ...}
+# where user_ids are the users whose streams should receive the event.
+MESSAGE_EVENTS_CHANNEL = "message_events"
+
+
+def notify_message_event(session, event: Dict[str, Any]) -> None:
+    """Queue a message event on the session's transaction; listeners get it only if the transaction commits"""
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": MESSAGE_EVENTS_CHANNEL, "payload": json.dumps(event, default=str)}
+    )
+
+
+class MessageEventHub:
+    """Fans message events out to the streams connected to this process.
+
+    One background thread per process holds a single LISTEN connection and routes each
+    notification to the in-memory queues of the receiving users' streams. A connected
+    stream therefore costs a queue, not a database connection or a polling query. After
+    the listener reconnects, every stream gets a "resync" event since notifications sent
+    while it was down are lost.
+    """
+
+    def __init__(self, queue_size: int = 100, max_streams: Optional[int] = None):
+        self.queue_size = queue_size
+        self.max_streams = max_streams
+        self._subscribers: Dict[int, Set[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._dsn: Optional[str] = None
+
+    def ensure_started(self, engine) -> None:
+        """Start the listener thread on first use, connecting to the same database as engine"""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            # libpq connection URI (no SQLAlchemy driver suffix)
+            self._dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="message-event-listener", daemon=True)
+            self._thread.start()
+
+    def subscribe(self, user_id: int) -> Optional[queue.Queue]:
+        """Register a stream for user_id; events for the user are put on the returned queue.
+        Returns None if the process already has max_streams open streams."""
+        events = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            if self.max_streams is not None and self._count_locked() >= self.max_streams:
+                return None
+            self._subscribers.setdefault(user_id, set()).add(events)
+        return events
+
+    def unsubscribe(self, user_id: int, events: queue.Queue) -> None:
+        with self._lock:
+            streams = self._subscribers.get(user_id)
+            if streams is not None:
+                streams.discard(events)
+                if not streams:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return self._count_locked()
+
+    def _count_locked(self) -> int:
+        return sum(len(streams) for streams in self._subscribers.values())
+
+    def dispatch(self, event: Dict[str, Any]) -> int:
+        """Deliver an event to the streams of its user_ids (all streams when user_ids is absent)"""
+        with self._lock:
+            if "user_ids" in event:
+                targets = [q for user_id in event["user_ids"] for q in self._subscribers.get(user_id, ())]
+            else:
+                targets = [q for streams in self._subscribers.values() for q in streams]
+        delivered = 0
+        for events in targets:
+            try:
+                events.put_nowait(event)
+                delivered += 1
+            except queue.Full:
+                # The stream is too far behind to catch up event by event: replace its
+                # backlog with one resync, so the client refetches instead of missing messages
+                _replace_with_resync(events)
+        return delivered
+
+    def _run(self):
+        backoff = 1
+        first_connection = True
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self._dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {MESSAGE_EVENTS_CHANNEL}")
+                if not first_connection:
+                    self.dispatch({"type": "resync"})
+                first_connection = False
+                backoff = 1
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        try:
+                            self.dispatch(json.loads(notification.payload))
+                        except ValueError:
+                            print(f"Ignoring malformed message event: {notification.payload!r}")
+            except Exception as e:
+                print(f"Message event listener error, reconnecting in {backoff}s: {e}")
+                first_connection = False
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+
+
+def _replace_with_resync(events: queue.Queue) -> None:
+    while True:
+        try:
+            events.get_nowait()
+        except queue.Empty:
+            break
+    try:
+        events.put_nowait({"type": "resync"})
+    except queue.Full:
+        pass
+
+
+message_event_hub = MessageEventHub(Config.MESSAGE_STREAM_QUEUE_SIZE, Config.MESSAGE_STREAM_MAX_CONNECTIONS)
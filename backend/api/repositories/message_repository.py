@@ -1,8 +1,45 @@
+import re
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from api.extensions import db
 from api.entities.entities import Message
-from typing import Optional, List
+from api.repositories.message_events import notify_message_event
+from api.repositories.visibility import ACCEPTED_STATUS_ID
+from api.utils.pagination import Cursor, keyset_params
+from datetime import date, datetime
+from typing import Optional, List, Tuple
+
+# Messages m from {messages} (a table or subquery) with is_read derived from the receiver's
+# read watermark on the pair's Conversations row
+MESSAGES_WITH_READ_STATE_FROM = """
+    SELECT
+        m.*,
+        COALESCE(
+            CASE m.receiver_id
+                WHEN c.user_a THEN (m.created_at, m.message_id) <= (c.last_read_at_a, c.last_read_message_id_a)
+                WHEN c.user_b THEN (m.created_at, m.message_id) <= (c.last_read_at_b, c.last_read_message_id_b)
+            END,
+            FALSE
+        ) AS is_read
+    FROM {messages} m
+    LEFT JOIN Conversations c
+      ON c.user_a = LEAST(m.sender_id, m.receiver_id) AND c.user_b = GREATEST(m.sender_id, m.receiver_id)
+"""
+
+MESSAGES_WITH_READ_STATE = MESSAGES_WITH_READ_STATE_FROM.format(messages="Messages")
+
+# Total unread messages of :user_id across their conversations
+UNREAD_COUNT = """
+    SELECT COALESCE(SUM(unread), 0) FROM (
+        SELECT unread_for_a AS unread FROM Conversations WHERE user_a = :user_id
+        UNION ALL
+        SELECT unread_for_b FROM Conversations WHERE user_b = :user_id
+    ) sides
+"""
+
+
+# Monthly Messages partitions are named messages_pYYYY_MM (see create_message_partitions)
+PARTITION_NAME = re.compile(r"^messages_p(\d{4})_(\d{2})$")
 
 
 class MessageRepository:
@@ -13,139 +50,452 @@ class MessageRepository:
         """Create a new message"""
         try:
             query = text("""
-                INSERT INTO Messages (sender_id, receiver_id, content, media_url, is_read)
-                VALUES (:sender_id, :receiver_id, :content, :media_url, :is_read)
-                RETURNING message_id, sender_id, receiver_id, content, media_url, is_read, created_at
+                INSERT INTO Messages (sender_id, receiver_id, content, media_url)
+                VALUES (:sender_id, :receiver_id, :content, :media_url)
+                RETURNING message_id, sender_id, receiver_id, content, media_url, FALSE AS is_read, created_at
             """)
             
             result = self.db.session.execute(query, {
                 "sender_id": message.sender_id,
                 "receiver_id": message.receiver_id,
                 "content": message.content,
-                "media_url": message.media_url,
-                "is_read": message.is_read
+                "media_url": message.media_url
+            })
+            created = Message.from_row(result.fetchone())
+            # Delivered to the receiver's open streams when the insert commits
+            notify_message_event(self.db.session, {
+                "type": "message",
+                "user_ids": [created.receiver_id],
+                "message_id": created.message_id,
+                "created_at": created.created_at
+            })
+            self.db.session.commit()
+            return created
+        except SQLAlchemyError:
+            self.db.session.rollback()
+            raise
+
+    def create_if_following(self, message: Message) -> Tuple[Optional[Message], bool]:
+        """Create a message only if its sender has an accepted follow of its receiver, in one statement.
+        Returns (the created message or None, whether the receiver exists)."""
+        try:
+            query = text(f"""
+                WITH inserted AS (
+                    INSERT INTO Messages (sender_id, receiver_id, content, media_url)
+                    SELECT :sender_id, :receiver_id, :content, :media_url
+                    WHERE EXISTS (
+                        SELECT 1 FROM Follows
+                        WHERE follower_id = :sender_id AND following_id = :receiver_id
+                          AND status_id = {ACCEPTED_STATUS_ID}
+                    )
+                    RETURNING message_id, sender_id, receiver_id, content, media_url, FALSE AS is_read, created_at
+                )
+                SELECT
+                    EXISTS (SELECT 1 FROM Users WHERE user_id = :receiver_id) AS receiver_exists,
+                    inserted.*
+                FROM (SELECT 1) one
+                LEFT JOIN inserted ON TRUE
+            """)
+            row = self.db.session.execute(query, {
+                "sender_id": message.sender_id,
+                "receiver_id": message.receiver_id,
+                "content": message.content,
+                "media_url": message.media_url
+            }).fetchone()
+            if row.message_id is None:
+                # Nothing was written: end the transaction rather than leave it idle until teardown
+                self.db.session.rollback()
+                return None, row.receiver_exists
+            created = Message.from_row(row)
+            notify_message_event(self.db.session, {
+                "type": "message",
+                "user_ids": [created.receiver_id],
+                "message_id": created.message_id,
+                "created_at": created.created_at
             })
             self.db.session.commit()
-            return Message.from_row(result.fetchone())
+            return created, True
         except SQLAlchemyError:
             self.db.session.rollback()
             raise
 
-    def get_by_id(self, message_id: int) -> Optional[Message]:
-        """Get message by ID"""
-        query = text("SELECT * FROM Messages WHERE message_id = :message_id")
-        result = self.db.session.execute(query, {"message_id": message_id})
+    def get_by_id(self, message_id: int, created_at: Optional[datetime] = None) -> Optional[Message]:
+        """Get message by ID (created_at, when known, limits the lookup to its monthly partition)"""
+        query = text(MESSAGES_WITH_READ_STATE + """
+            WHERE m.message_id = :message_id
+              AND (:created_at IS NULL OR m.created_at = :created_at)
+        """)
+        result = self.db.session.execute(query, {"message_id": message_id, "created_at": created_at})
         return Message.from_row(result.fetchone())
 
-    def get_conversation(self, user1_id: int, user2_id: int, limit: int = 50, offset: int = 0) -> List[Message]:
-        """Get conversation between two users"""
-        query = text("""
-            SELECT * FROM Messages 
-            WHERE (sender_id = :user1_id AND receiver_id = :user2_id)
-               OR (sender_id = :user2_id AND receiver_id = :user1_id)
-            ORDER BY created_at DESC
+    def get_conversation(self, user1_id: int, user2_id: int, limit: int = 50, offset: int = 0,
+                         before: Optional[Cursor] = None) -> List[Message]:
+        """Get conversation between two users, newest first (pages after the `before` cursor if given)"""
+        # Matches idx_messages_pair_recent: a single range scan for the pair, already in order.
+        # The plain created_at bound lets the planner skip monthly partitions newer than the cursor.
+        query = text(MESSAGES_WITH_READ_STATE + """
+            WHERE LEAST(m.sender_id, m.receiver_id) = :user_a
+              AND GREATEST(m.sender_id, m.receiver_id) = :user_b
+              AND (:cursor_created_at IS NULL OR (m.created_at, m.message_id) < (:cursor_created_at, :cursor_id))
+              AND (:cursor_created_at IS NULL OR m.created_at <= :cursor_created_at)
+            ORDER BY m.created_at DESC, m.message_id DESC
             LIMIT :limit OFFSET :offset
         """)
         result = self.db.session.execute(query, {
-            "user1_id": user1_id,
-            "user2_id": user2_id,
+            "user_a": min(user1_id, user2_id),
+            "user_b": max(user1_id, user2_id),
             "limit": limit,
-            "offset": offset
+            **keyset_params(before, offset)
         })
         return [Message.from_row(row) for row in result.fetchall()]
 
-    def get_user_conversations(self, user_id: int, limit: int = 50, offset: int = 0) -> List[dict]:
-        """Get all conversations for a user with last message"""
+    def get_user_conversations(self, user_id: int, limit: int = 50, offset: int = 0,
+                               cursor: Optional[Cursor] = None) -> List[dict]:
+        """Get all conversations for a user with last message and unread count (Conversations range scans)"""
+        # The user is user_a in some pairs and user_b in others: one index range scan per side,
+        # each stopping after enough rows for the page. Last messages are looked up by
+        # (message_id, created_at) so each probe touches one partition; one in an archived
+        # (detached) partition leaves content NULL.
         query = text("""
-            WITH ranked_messages AS (
-                SELECT 
-                    m.*,
-                    CASE 
-                        WHEN m.sender_id = :user_id THEN m.receiver_id 
-                        ELSE m.sender_id 
-                    END as other_user_id,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY CASE 
-                            WHEN m.sender_id = :user_id THEN m.receiver_id 
-                            ELSE m.sender_id 
-                        END 
-                        ORDER BY m.created_at DESC
-                    ) as rn
-                FROM Messages m
-                WHERE m.sender_id = :user_id OR m.receiver_id = :user_id
-            )
             SELECT 
-                rm.*,
+                c.last_message_id AS message_id,
+                c.last_message_at AS created_at,
+                m.sender_id,
+                m.content,
+                m.media_url,
+                c.other_user_id,
+                c.unread_count,
                 u.username,
                 u.profile_picture_url
-            FROM ranked_messages rm
-            JOIN Users u ON rm.other_user_id = u.user_id
-            WHERE rm.rn = 1
-            ORDER BY rm.created_at DESC
+            FROM (
+                (
+                    SELECT user_b AS other_user_id, unread_for_a AS unread_count, last_message_id, last_message_at
+                    FROM Conversations
+                    WHERE user_a = :user_id
+                      AND (:cursor_created_at IS NULL OR (last_message_at, last_message_id) < (:cursor_created_at, :cursor_id))
+                    ORDER BY last_message_at DESC, last_message_id DESC
+                    LIMIT :branch_limit
+                )
+                UNION ALL
+                (
+                    SELECT user_a AS other_user_id, unread_for_b AS unread_count, last_message_id, last_message_at
+                    FROM Conversations
+                    WHERE user_b = :user_id
+                      AND (:cursor_created_at IS NULL OR (last_message_at, last_message_id) < (:cursor_created_at, :cursor_id))
+                    ORDER BY last_message_at DESC, last_message_id DESC
+                    LIMIT :branch_limit
+                )
+            ) c
+            LEFT JOIN Messages m ON m.message_id = c.last_message_id AND m.created_at = c.last_message_at
+            JOIN Users u ON u.user_id = c.other_user_id
+            ORDER BY c.last_message_at DESC, c.last_message_id DESC
             LIMIT :limit OFFSET :offset
         """)
+        params = keyset_params(cursor, offset)
         result = self.db.session.execute(query, {
             "user_id": user_id,
             "limit": limit,
-            "offset": offset
+            "branch_limit": limit + params["offset"],
+            **params
         })
         return [dict(row._mapping) for row in result.fetchall()]
 
-    def mark_as_read(self, message_id: int) -> Optional[Message]:
-        """Mark a single message as read"""
+    def rebuild_conversations(self) -> int:
+        """Recompute every Conversations row from Messages (backfill/repair), keeping read watermarks.
+        Returns the number of conversations."""
+        self.db.session.execute(text("""
+            DELETE FROM Conversations c
+            WHERE NOT EXISTS (
+                SELECT 1 FROM Messages m
+                WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+                  AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+            )
+        """))
+        self.db.session.execute(text("""
+            INSERT INTO Conversations AS c (user_a, user_b, last_message_id, last_message_at)
+            SELECT
+                LEAST(sender_id, receiver_id),
+                GREATEST(sender_id, receiver_id),
+                (ARRAY_AGG(message_id ORDER BY created_at DESC, message_id DESC))[1],
+                MAX(created_at)
+            FROM Messages
+            WHERE sender_id IS NOT NULL AND receiver_id IS NOT NULL
+            GROUP BY LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id)
+            ON CONFLICT (user_a, user_b) DO UPDATE SET
+                last_message_id = EXCLUDED.last_message_id,
+                last_message_at = EXCLUDED.last_message_at
+        """))
+        self.db.session.execute(text("""
+            UPDATE Conversations c
+            SET unread_for_a = (
+                    SELECT COUNT(*) FROM Messages m
+                    WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+                      AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+                      AND m.receiver_id = c.user_a
+                      AND (c.last_read_message_id_a IS NULL
+                           OR (m.created_at, m.message_id) > (c.last_read_at_a, c.last_read_message_id_a))
+                ),
+                unread_for_b = (
+                    SELECT COUNT(*) FROM Messages m
+                    WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+                      AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+                      AND m.receiver_id = c.user_b
+                      AND (c.last_read_message_id_b IS NULL
+                           OR (m.created_at, m.message_id) > (c.last_read_at_b, c.last_read_message_id_b))
+                )
+        """))
+        count = self.db.session.execute(text("SELECT COUNT(*) FROM Conversations")).scalar()
+        self.db.session.commit()
+        return count
+
+    def _advance_read_watermark(self, reader_id: int, other_user_id: int,
+                                up_to: Optional[Cursor] = None) -> int:
+        """Move reader_id's read watermark in the conversation with other_user_id forward to the
+        (created_at, message_id) up_to (the conversation's last message if None). One UPDATE of
+        the Conversations row; messages are never rewritten. Returns how many messages it marked read."""
+        read_at, read_id = up_to if up_to else (None, None)
+        query = text("""
+            WITH target AS (
+                SELECT
+                    c.user_a, c.user_b,
+                    CASE WHEN c.user_a = :reader_id THEN c.unread_for_a ELSE c.unread_for_b END AS old_unread,
+                    CASE WHEN c.user_a = :reader_id THEN c.last_read_at_a ELSE c.last_read_at_b END AS old_read_at,
+                    CASE WHEN c.user_a = :reader_id THEN c.last_read_message_id_a ELSE c.last_read_message_id_b END AS old_read_id,
+                    COALESCE(:read_at, c.last_message_at) AS read_at,
+                    COALESCE(:read_id, c.last_message_id) AS read_id
+                FROM Conversations c
+                WHERE c.user_a = :user_a AND c.user_b = :user_b
+                FOR UPDATE OF c
+            ), moved AS (
+                SELECT
+                    t.*,
+                    -- Messages still unread: received after the new watermark (a range scan of
+                    -- idx_messages_pair_recent in the partitions from read_at on)
+                    (
+                        SELECT COUNT(*) FROM Messages m
+                        WHERE LEAST(m.sender_id, m.receiver_id) = t.user_a
+                          AND GREATEST(m.sender_id, m.receiver_id) = t.user_b
+                          AND m.created_at >= t.read_at
+                          AND (m.created_at, m.message_id) > (t.read_at, t.read_id)
+                          AND m.receiver_id = :reader_id
+                    ) AS new_unread
+                FROM target t
+                WHERE t.old_read_id IS NULL OR (t.read_at, t.read_id) > (t.old_read_at, t.old_read_id)
+            )
+            UPDATE Conversations c
+            SET last_read_message_id_a = CASE WHEN c.user_a = :reader_id THEN n.read_id ELSE c.last_read_message_id_a END,
+                last_read_at_a = CASE WHEN c.user_a = :reader_id THEN n.read_at ELSE c.last_read_at_a END,
+                unread_for_a = CASE WHEN c.user_a = :reader_id THEN n.new_unread ELSE c.unread_for_a END,
+                last_read_message_id_b = CASE WHEN c.user_b = :reader_id THEN n.read_id ELSE c.last_read_message_id_b END,
+                last_read_at_b = CASE WHEN c.user_b = :reader_id THEN n.read_at ELSE c.last_read_at_b END,
+                unread_for_b = CASE WHEN c.user_b = :reader_id THEN n.new_unread ELSE c.unread_for_b END
+            FROM moved n
+            WHERE c.user_a = n.user_a AND c.user_b = n.user_b
+            RETURNING n.old_unread - n.new_unread AS marked
+        """)
+        row = self.db.session.execute(query, {
+            "reader_id": reader_id,
+            "user_a": min(reader_id, other_user_id),
+            "user_b": max(reader_id, other_user_id),
+            "read_at": read_at,
+            "read_id": read_id
+        }).fetchone()
+        marked = max(row.marked, 0) if row else 0
+        if marked:
+            notify_message_event(self.db.session, {"type": "unread", "user_ids": [reader_id]})
+        return marked
+
+    def mark_as_read(self, message_id: int, created_at: Optional[datetime] = None) -> Optional[Message]:
+        """Mark a message, and everything its receiver got before it in the conversation, as read"""
         try:
-            query = text("""
-                UPDATE Messages 
-                SET is_read = TRUE
-                WHERE message_id = :message_id
-                RETURNING message_id, sender_id, receiver_id, content, media_url, is_read, created_at
-            """)
-            
-            result = self.db.session.execute(query, {"message_id": message_id})
+            message = self.get_by_id(message_id, created_at)
+            if message and message.sender_id is not None and message.receiver_id is not None:
+                self._advance_read_watermark(
+                    message.receiver_id, message.sender_id, (message.created_at, message.message_id)
+                )
+                message.is_read = True
             self.db.session.commit()
-            return Message.from_row(result.fetchone())
+            return message
         except SQLAlchemyError:
             self.db.session.rollback()
             raise
 
     def mark_conversation_as_read(self, receiver_id: int, sender_id: int) -> int:
-        """Mark all messages in a conversation as read"""
+        """Mark all messages in a conversation as read. Returns how many were unread."""
         try:
-            query = text("""
-                UPDATE Messages 
-                SET is_read = TRUE
-                WHERE receiver_id = :receiver_id AND sender_id = :sender_id AND is_read = FALSE
-                RETURNING message_id
-            """)
-            
-            result = self.db.session.execute(query, {
-                "receiver_id": receiver_id,
-                "sender_id": sender_id
-            })
+            marked = self._advance_read_watermark(receiver_id, sender_id)
             self.db.session.commit()
-            return len(result.fetchall())
+            return marked
         except SQLAlchemyError:
             self.db.session.rollback()
             raise
 
-    def delete(self, message_id: int) -> bool:
-        """Delete a message"""
+    def delete(self, message_id: int, created_at: Optional[datetime] = None) -> bool:
+        """Delete a message (created_at, when known, limits the delete to its monthly partition)"""
         query = text("""
             DELETE FROM Messages 
             WHERE message_id = :message_id
-            RETURNING message_id
+              AND (:created_at IS NULL OR created_at = :created_at)
+            RETURNING message_id, receiver_id, created_at
         """)
-        result = self.db.session.execute(query, {"message_id": message_id})
+        row = self.db.session.execute(query, {"message_id": message_id, "created_at": created_at}).fetchone()
+        if row and row.receiver_id is not None:
+            notify_message_event(self.db.session, {
+                "type": "deleted",
+                "user_ids": [row.receiver_id],
+                "message_id": row.message_id,
+                "created_at": row.created_at
+            })
         self.db.session.commit()
-        return result.fetchone() is not None
+        return row is not None
 
     def get_unread_count(self, user_id: int) -> int:
         """Get count of unread messages for a user"""
-        query = text("""
-            SELECT COUNT(*) as count 
-            FROM Messages 
-            WHERE receiver_id = :user_id AND is_read = FALSE
-        """)
-        result = self.db.session.execute(query, {"user_id": user_id})
-        row = result.fetchone()
-        return row.count if row else 0
+        return self.db.session.execute(text(UNREAD_COUNT), {"user_id": user_id}).scalar()
+
+    def get_stream_update(self, user_id: int, message_id: Optional[int] = None,
+                          created_at: Optional[datetime] = None) -> dict:
+        """Unread count of user_id (plus message_id if it was sent to them) for a message stream event.
+
+        Uses a short-lived connection rather than the session, so a long-lived stream
+        does not hold a pooled connection between events.
+        """
+        params = {"user_id": user_id, "message_id": message_id, "created_at": created_at}
+        with self.db.engine.connect() as conn:
+            unread_count = conn.execute(text(UNREAD_COUNT), params).scalar()
+            message = None
+            if message_id is not None:
+                message = Message.from_row(conn.execute(text(MESSAGES_WITH_READ_STATE + """
+                    WHERE m.message_id = :message_id
+                      AND (:created_at IS NULL OR m.created_at = :created_at)
+                      AND m.receiver_id = :user_id
+                """), params).fetchone())
+        return {"unread_count": unread_count, "message": message}
+
+    def get_sync_position(self) -> int:
+        """Change sequence below which every change is committed: the xmin of a fresh snapshot.
+        Transactions with a smaller id have all finished, so nothing older can still appear."""
+        position = self.db.session.execute(
+            text("SELECT CAST(pg_snapshot_xmin(pg_current_snapshot()) AS TEXT)")
+        ).scalar()
+        return int(position)
+
+    def get_changes(self, user_id: int, since_seq: int, since_id: int = 0, limit: int = 200) -> dict:
+        """Changes to user_id's messages after the sync position (since_seq, since_id).
+
+        Returns "messages" (sent or received, oldest change first, at most limit), the
+        "conversations" whose last message, unread count or read watermarks changed, the
+        "deleted" messages and "position" (see get_sync_position, taken before the reads).
+        Every list is read with per-user range scans of a (user, change_seq) index.
+        """
+        position = self.get_sync_position()
+        params = {"user_id": user_id, "since_seq": str(since_seq), "since_id": since_id, "limit": limit}
+
+        changed_messages = """(
+            (
+                SELECT * FROM Messages
+                WHERE receiver_id = :user_id
+                  AND (change_seq, message_id) > (CAST(:since_seq AS XID8), :since_id)
+                ORDER BY change_seq, message_id
+                LIMIT :limit
+            )
+            UNION ALL
+            (
+                SELECT * FROM Messages
+                WHERE sender_id = :user_id AND receiver_id IS DISTINCT FROM :user_id
+                  AND (change_seq, message_id) > (CAST(:since_seq AS XID8), :since_id)
+                ORDER BY change_seq, message_id
+                LIMIT :limit
+            )
+        )"""
+        rows = self.db.session.execute(text(
+            MESSAGES_WITH_READ_STATE_FROM.format(messages=changed_messages) + """
+            ORDER BY m.change_seq, m.message_id
+            LIMIT :limit
+        """), params).fetchall()
+
+        conversations = self.db.session.execute(text("""
+            SELECT
+                user_b AS other_user_id, last_message_id, last_message_at, unread_for_a AS unread_count,
+                last_read_message_id_a AS read_message_id, last_read_at_a AS read_at,
+                last_read_message_id_b AS other_read_message_id, last_read_at_b AS other_read_at
+            FROM Conversations
+            WHERE user_a = :user_id AND change_seq >= CAST(:since_seq AS XID8)
+            UNION ALL
+            SELECT
+                user_a, last_message_id, last_message_at, unread_for_b,
+                last_read_message_id_b, last_read_at_b,
+                last_read_message_id_a, last_read_at_a
+            FROM Conversations
+            WHERE user_b = :user_id AND change_seq >= CAST(:since_seq AS XID8)
+        """), params).fetchall()
+
+        deleted = self.db.session.execute(text("""
+            SELECT message_id, sender_id AS other_user_id
+            FROM MessageTombstones
+            WHERE receiver_id = :user_id AND change_seq >= CAST(:since_seq AS XID8)
+            UNION ALL
+            SELECT message_id, receiver_id
+            FROM MessageTombstones
+            WHERE sender_id = :user_id AND receiver_id IS DISTINCT FROM :user_id
+              AND change_seq >= CAST(:since_seq AS XID8)
+        """), params).fetchall()
+
+        return {
+            "position": position,
+            "messages": [Message.from_row(row) for row in rows],
+            "last_change": (int(rows[-1].change_seq), rows[-1].message_id) if rows else None,
+            "conversations": [dict(row._mapping) for row in conversations],
+            "deleted": [dict(row._mapping) for row in deleted]
+        }
+
+    def prune_tombstones(self, older_than_days: int) -> int:
+        """Delete tombstones of messages deleted more than older_than_days ago. Returns how many."""
+        try:
+            deleted = self.db.session.execute(text("""
+                DELETE FROM MessageTombstones
+                WHERE deleted_at < CURRENT_TIMESTAMP - make_interval(days => :days)
+            """), {"days": older_than_days}).rowcount
+            self.db.session.commit()
+            return deleted
+        except SQLAlchemyError:
+            self.db.session.rollback()
+            raise
+
+    def create_partitions(self, months_ahead: int, months_back: int = 0) -> int:
+        """Create the monthly Messages partitions up to months_ahead months from now. Returns how many were new."""
+        created = self.db.session.execute(
+            text("SELECT create_message_partitions(:months_ahead, :months_back)"),
+            {"months_ahead": months_ahead, "months_back": months_back}
+        ).scalar()
+        self.db.session.commit()
+        return created
+
+    def get_partitions(self) -> List[str]:
+        """Names of the monthly partitions attached to Messages, oldest first"""
+        rows = self.db.session.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE i.inhparent = 'messages'::regclass
+        """)).fetchall()
+        return sorted(row.relname for row in rows if PARTITION_NAME.match(row.relname))
+
+    def archive_partitions(self, before: date, drop: bool = False) -> List[str]:
+        """Detach every monthly partition that ends on or before `before`, renaming it to
+        messages_archive_YYYY_MM (or dropping it). Returns the partitions archived."""
+        archived = []
+        for name in self.get_partitions():
+            year, month = map(int, PARTITION_NAME.match(name).groups())
+            month_end = date(year + month // 12, month % 12 + 1, 1)
+            if month_end > before:
+                continue
+            # Names come from the catalog and match PARTITION_NAME, so they are safe to interpolate
+            self.db.session.execute(text(f"ALTER TABLE Messages DETACH PARTITION {name}"))
+            if drop:
+                self.db.session.execute(text(f"DROP TABLE {name}"))
+            else:
+                self.db.session.execute(text(f"ALTER TABLE {name} RENAME TO messages_archive_{year:04d}_{month:02d}"))
+            self.db.session.commit()
+            archived.append(name)
+        return archived
@@ -1,7 +1,17 @@
 from sqlalchemy import text
 from api.extensions import db
+from api.cache import cache, cached
+from api.config import Config
 from api.entities.entities import Post, PostLike
-from typing import Optional, List, Dict
+from api.utils.pagination import Cursor, RankedCursor, keyset_params
+from api.utils.hashtags import extract_hashtags
+from api.repositories.visibility import ACCEPTED_STATUS_ID, visible_to_viewer
+from datetime import timedelta
+from typing import Optional, List, Dict, Set
+
+
+# Posts (alias p) the :viewer_id user is allowed to see
+VISIBLE_POST = visible_to_viewer("p.user_id", "viewer_id")
 
 
 class PostRepository:
@@ -22,14 +32,17 @@ class PostRepository:
             "content": post.content,
             "media_url": post.media_url
         })
+        row = result.fetchone()
+        self._index_hashtags(row.post_id, row.content, row.created_at)
         self.db.session.commit()
+        if row.community_id is not None:
+            cache.invalidate_tags(f"community:{row.community_id}")
         
-        row = result.fetchone()
         return Post.from_row(row)
 
     def get_by_id(self, post_id: int) -> Optional[Post]:
         """Get post by ID"""
-        query = text("SELECT * FROM Posts WHERE post_id = :post_id")
+        query = text("SELECT post_id, user_id, community_id, content, media_url, like_count, comment_count, created_at, updated_at FROM Posts WHERE post_id = :post_id")
         result = self.db.session.execute(query, {"post_id": post_id})
         row = result.fetchone()
         return Post.from_row(row)
@@ -37,7 +50,7 @@ class PostRepository:
     def get_by_user_id(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Post]:
         """Get all posts by a specific user"""
         query = text("""
-            SELECT * FROM Posts 
+            SELECT post_id, user_id, community_id, content, media_url, like_count, comment_count, created_at, updated_at FROM Posts 
             WHERE user_id = :user_id 
             ORDER BY created_at DESC 
             LIMIT :limit OFFSET :offset
@@ -52,7 +65,7 @@ class PostRepository:
     def get_by_community_id(self, community_id: int, limit: int = 50, offset: int = 0) -> List[Post]:
         """Get all posts in a specific community"""
         query = text("""
-            SELECT * FROM Posts 
+            SELECT post_id, user_id, community_id, content, media_url, like_count, comment_count, created_at, updated_at FROM Posts 
             WHERE community_id = :community_id 
             ORDER BY created_at DESC 
             LIMIT :limit OFFSET :offset
@@ -67,12 +80,14 @@ class PostRepository:
     def update(self, post: Post) -> Optional[Post]:
         """Update an existing post"""
         query = text("""
-            UPDATE Posts 
+            UPDATE Posts p
             SET content = :content,
                 media_url = :media_url,
                 community_id = :community_id
-            WHERE post_id = :post_id
-            RETURNING post_id, user_id, community_id, content, media_url, created_at, updated_at
+            FROM (SELECT community_id FROM Posts WHERE post_id = :post_id FOR UPDATE) old
+            WHERE p.post_id = :post_id
+            RETURNING p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.created_at, p.updated_at,
+                old.community_id AS old_community_id
         """)
         
         result = self.db.session.execute(query, {
@@ -81,22 +96,32 @@ class PostRepository:
             "media_url": post.media_url,
             "community_id": post.community_id
         })
+        row = result.fetchone()
+        if row:
+            self.db.session.execute(text("DELETE FROM PostHashtags WHERE post_id = :post_id"), {"post_id": row.post_id})
+            self._index_hashtags(row.post_id, row.content, row.created_at)
         self.db.session.commit()
+        # A post moved between communities changes the stats of both
+        communities = {row.community_id, row.old_community_id} - {None} if row else set()
+        cache.invalidate_tags(f"post:{post.post_id}", *(f"community:{c}" for c in communities))
         
-        row = result.fetchone()
         return Post.from_row(row)
 
     def delete(self, post_id: int) -> bool:
         """Delete a post by ID"""
-        query = text("DELETE FROM Posts WHERE post_id = :post_id RETURNING post_id")
-        result = self.db.session.execute(query, {"post_id": post_id})
+        query = text("DELETE FROM Posts WHERE post_id = :post_id RETURNING post_id, community_id")
+        row = self.db.session.execute(query, {"post_id": post_id}).fetchone()
         self.db.session.commit()
-        return result.fetchone() is not None
+        tags = [f"post:{post_id}"]
+        if row and row.community_id is not None:
+            tags.append(f"community:{row.community_id}")
+        cache.invalidate_tags(*tags)
+        return row is not None
 
     def get_feed(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Post]:
         """Get posts from users that the given user follows (accepted follows only)"""
         query = text("""
-            SELECT DISTINCT p.* 
+            SELECT DISTINCT p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count, p.created_at, p.updated_at
             FROM Posts p
             INNER JOIN Follows f ON p.user_id = f.following_id
             WHERE f.follower_id = :user_id 
@@ -125,30 +150,114 @@ class PostRepository:
         
         return result.scalar()
 
-    def like_post(self, post_id: int, user_id: int) -> bool:
-        """Add a like to a post"""
-        try:
-            query = text("""
+    def add_like(self, post_id: int, user_id: int) -> Optional[Dict]:
+        """Like a post and bump its counters in one statement.
+
+        Returns None if the post does not exist, otherwise the post's counters after the
+        statement and whether a like was actually added (False for a duplicate like).
+        """
+        query = text("""
+            WITH post AS (
+                SELECT post_id, like_count, comment_count FROM Posts WHERE post_id = :post_id
+            ),
+            inserted AS (
                 INSERT INTO PostLikes (post_id, user_id)
-                VALUES (:post_id, :user_id)
-            """)
-            self.db.session.execute(query, {"post_id": post_id, "user_id": user_id})
+                SELECT post_id, :user_id FROM post
+                ON CONFLICT (post_id, user_id) DO NOTHING
+                RETURNING post_id
+            ),
+            updated AS (
+                UPDATE Posts
+                SET like_count = like_count + 1,
+                    hot_score = compute_hot_score(like_count + 1, comment_count, created_at)
+                WHERE post_id IN (SELECT post_id FROM inserted)
+                RETURNING like_count, comment_count
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM updated) AS changed,
+                COALESCE((SELECT like_count FROM updated), post.like_count) AS like_count,
+                COALESCE((SELECT comment_count FROM updated), post.comment_count) AS comment_count
+            FROM post
+        """)
+        return self._apply_like_change(query, post_id, user_id, liked=True)
+
+    def remove_like(self, post_id: int, user_id: int) -> Optional[Dict]:
+        """Unlike a post and decrement its counters in one statement (see add_like)"""
+        query = text("""
+            WITH post AS (
+                SELECT post_id, like_count, comment_count FROM Posts WHERE post_id = :post_id
+            ),
+            deleted AS (
+                DELETE FROM PostLikes
+                WHERE post_id IN (SELECT post_id FROM post) AND user_id = :user_id
+                RETURNING post_id
+            ),
+            updated AS (
+                UPDATE Posts
+                SET like_count = GREATEST(like_count - 1, 0),
+                    hot_score = compute_hot_score(GREATEST(like_count - 1, 0), comment_count, created_at)
+                WHERE post_id IN (SELECT post_id FROM deleted)
+                RETURNING like_count, comment_count
+            )
+            SELECT
+                EXISTS (SELECT 1 FROM updated) AS changed,
+                COALESCE((SELECT like_count FROM updated), post.like_count) AS like_count,
+                COALESCE((SELECT comment_count FROM updated), post.comment_count) AS comment_count
+            FROM post
+        """)
+        return self._apply_like_change(query, post_id, user_id, liked=False)
+
+    def _apply_like_change(self, query, post_id: int, user_id: int, liked: bool) -> Optional[Dict]:
+        """Run a like/unlike statement, commit and shape its single result row"""
+        try:
+            row = self.db.session.execute(query, {"post_id": post_id, "user_id": user_id}).fetchone()
             self.db.session.commit()
-            return True
         except Exception:
             self.db.session.rollback()
+            raise
+        if row is None:
+            return None
+        return {
+            "changed": row.changed,
+            "like_count": row.like_count,
+            "comment_count": row.comment_count,
+            # A no-op like means it was already liked; a no-op unlike means it was not
+            "liked_by_user": liked
+        }
+
+    def get_like_state(self, post_id: int, user_id: int) -> Optional[Dict]:
+        """Read a post's counters and whether user_id liked it (None if the post does not exist)"""
+        query = text("""
+            SELECT 
+                p.like_count,
+                p.comment_count,
+                EXISTS (
+                    SELECT 1 FROM PostLikes pl WHERE pl.post_id = p.post_id AND pl.user_id = :user_id
+                ) AS liked_by_user
+            FROM Posts p
+            WHERE p.post_id = :post_id
+        """)
+        row = self.db.session.execute(query, {"post_id": post_id, "user_id": user_id}).fetchone()
+        if row is None:
+            return None
+        return {
+            "like_count": row.like_count,
+            "comment_count": row.comment_count,
+            "liked_by_user": row.liked_by_user
+        }
+
+    def like_post(self, post_id: int, user_id: int) -> bool:
+        """Add a like to a post"""
+        try:
+            result = self.add_like(post_id, user_id)
+        except Exception:
             return False
+        return result is not None and result["changed"]
 
     def unlike_post(self, post_id: int, user_id: int) -> bool:
         """Remove a like from a post"""
-        query = text("""
-            DELETE FROM PostLikes 
-            WHERE post_id = :post_id AND user_id = :user_id
-            RETURNING post_id
-        """)
-        result = self.db.session.execute(query, {"post_id": post_id, "user_id": user_id})
-        self.db.session.commit()
-        return result.fetchone() is not None
+        result = self.remove_like(post_id, user_id)
+        return result is not None and result["changed"]
 
     def get_post_likes(self, post_id: int) -> List[PostLike]:
         """Get all users who liked a post"""
@@ -162,10 +271,31 @@ class PostRepository:
         return [PostLike.from_row(row) for row in result.fetchall()]
 
     def count_likes(self, post_id: int) -> int:
-        """Count the number of likes on a post"""
-        query = text("SELECT COUNT(*) FROM PostLikes WHERE post_id = :post_id")
+        """Count the number of likes on a post (denormalized counter)"""
+        query = text("SELECT like_count FROM Posts WHERE post_id = :post_id")
         result = self.db.session.execute(query, {"post_id": post_id})
-        return result.scalar()
+        return result.scalar() or 0
+
+    def repair_counters(self) -> int:
+        """Recompute like_count/comment_count from PostLikes and Comments, fixing any drift"""
+        query = text("""
+            UPDATE Posts p
+            SET like_count = actual.like_count,
+                comment_count = actual.comment_count,
+                hot_score = compute_hot_score(actual.like_count, actual.comment_count, p.created_at)
+            FROM (
+                SELECT 
+                    p2.post_id,
+                    (SELECT CAST(COUNT(*) AS INT) FROM PostLikes pl WHERE pl.post_id = p2.post_id) AS like_count,
+                    (SELECT CAST(COUNT(*) AS INT) FROM Comments c WHERE c.post_id = p2.post_id) AS comment_count
+                FROM Posts p2
+            ) actual
+            WHERE p.post_id = actual.post_id
+              AND (p.like_count <> actual.like_count OR p.comment_count <> actual.comment_count)
+        """)
+        result = self.db.session.execute(query)
+        self.db.session.commit()
+        return result.rowcount
 
     def has_user_liked(self, post_id: int, user_id: int) -> bool:
         """Check if a user has liked a post"""
@@ -176,31 +306,45 @@ class PostRepository:
         result = self.db.session.execute(query, {"post_id": post_id, "user_id": user_id})
         return result.fetchone() is not None
 
-    def get_with_stats(self, post_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
-        """Get post with engagement metrics (like count, comment count, and user's like status)"""
+    def get_liked_post_ids(self, post_ids: List[int], user_id: Optional[int]) -> Set[int]:
+        """Return the subset of post_ids liked by user_id (one query per page)"""
+        if not user_id or not post_ids:
+            return set()
         query = text("""
+            SELECT post_id FROM PostLikes 
+            WHERE user_id = :user_id AND post_id = ANY(:post_ids)
+        """)
+        result = self.db.session.execute(query, {"user_id": user_id, "post_ids": list(post_ids)})
+        return {row.post_id for row in result.fetchall()}
+
+    def attach_liked_by_user(self, posts: List[Dict], user_id: Optional[int]) -> List[Dict]:
+        """Set liked_by_user on each post dict using a single batched lookup"""
+        liked = self.get_liked_post_ids([post['post_id'] for post in posts], user_id)
+        for post in posts:
+            post['liked_by_user'] = post['post_id'] in liked
+        return posts
+
+    def get_with_stats(self, post_id: int, user_id: Optional[int] = None,
+                       visible_only: bool = False) -> Optional[Dict]:
+        """Get post with engagement metrics (like count, comment count, and user's like status) in one query
+
+        With visible_only, returns None if user_id may not see the post (see visibility.visible_to_viewer).
+        """
+        query = text(f"""
             SELECT 
-                p.*,
-                COALESCE(COUNT(DISTINCT pl.user_id), 0) as like_count,
-                COALESCE(COUNT(DISTINCT c.comment_id), 0) as comment_count,
-                CASE 
-                    WHEN :user_id IS NOT NULL THEN 
-                        EXISTS(
-                            SELECT 1 FROM PostLikes 
-                            WHERE post_id = p.post_id AND user_id = :user_id
-                        )
-                    ELSE FALSE 
-                END as liked_by_user
-            FROM Posts p
-            LEFT JOIN PostLikes pl ON p.post_id = pl.post_id
-            LEFT JOIN Comments c ON p.post_id = c.post_id
+                p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count, p.created_at, p.updated_at,
+                EXISTS (
+                    SELECT 1 FROM PostLikes pl WHERE pl.post_id = p.post_id AND pl.user_id = :viewer_id
+                ) AS liked_by_user
+            FROM Posts p 
             WHERE p.post_id = :post_id
-            GROUP BY p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.created_at
+              AND (:visible_only = FALSE OR {VISIBLE_POST})
         """)
         
         result = self.db.session.execute(query, {
             "post_id": post_id,
-            "user_id": user_id
+            "viewer_id": user_id,
+            "visible_only": visible_only
         })
         row = result.fetchone()
         
@@ -214,36 +358,31 @@ class PostRepository:
             }
         return None
 
+    def can_view_author(self, author_id: int, viewer_id: Optional[int]) -> bool:
+        """Check whether viewer_id may see content by author_id (one query)"""
+        query = text(f"SELECT {visible_to_viewer('CAST(:author_id AS INT)', 'viewer_id')}")
+        return bool(self.db.session.execute(query, {"author_id": author_id, "viewer_id": viewer_id}).scalar())
+
     def get_by_user_id_with_stats(self, user_id: int, current_user_id: Optional[int] = None, 
-                                   limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Get all posts by a specific user with engagement metrics"""
-        query = text("""
+                                   limit: int = 50, offset: int = 0,
+                                   cursor: Optional[Cursor] = None) -> List[Dict]:
+        """Get all posts by a specific user that current_user_id may see, with engagement metrics"""
+        query = text(f"""
             SELECT 
-                p.*,
-                COALESCE(COUNT(DISTINCT pl.user_id), 0) as like_count,
-                COALESCE(COUNT(DISTINCT c.comment_id), 0) as comment_count,
-                CASE 
-                    WHEN :current_user_id IS NOT NULL THEN 
-                        EXISTS(
-                            SELECT 1 FROM PostLikes 
-                            WHERE post_id = p.post_id AND user_id = :current_user_id
-                        )
-                    ELSE FALSE 
-                END as liked_by_user
+                p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count, p.created_at, p.updated_at
             FROM Posts p
-            LEFT JOIN PostLikes pl ON p.post_id = pl.post_id
-            LEFT JOIN Comments c ON p.post_id = c.post_id
             WHERE p.user_id = :user_id
-            GROUP BY p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.created_at
-            ORDER BY p.created_at DESC 
+              AND {VISIBLE_POST}
+              AND (:cursor_created_at IS NULL OR (p.created_at, p.post_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY p.created_at DESC, p.post_id DESC 
             LIMIT :limit OFFSET :offset
         """)
         
         result = self.db.session.execute(query, {
             "user_id": user_id,
-            "current_user_id": current_user_id,
+            "viewer_id": current_user_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         
         posts_with_stats = []
@@ -252,44 +391,33 @@ class PostRepository:
             posts_with_stats.append({
                 **post.to_dict(),
                 'like_count': row.like_count,
-                'comment_count': row.comment_count,
-                'liked_by_user': row.liked_by_user
+                'comment_count': row.comment_count
             })
-        return posts_with_stats
+        return self.attach_liked_by_user(posts_with_stats, current_user_id)
 
     def get_by_community_id_with_stats(self, community_id: int, current_user_id: Optional[int] = None,
-                                       limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Get all posts in a specific community with engagement metrics"""
-        query = text("""
+                                       limit: int = 50, offset: int = 0,
+                                       cursor: Optional[Cursor] = None) -> List[Dict]:
+        """Get the posts in a specific community that current_user_id may see, with engagement metrics"""
+        query = text(f"""
             SELECT 
-                p.*,
+                p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count, p.created_at, p.updated_at,
                 u.username,
-                u.profile_picture_url as user_profile_picture,
-                COALESCE(COUNT(DISTINCT pl.user_id), 0) as like_count,
-                COALESCE(COUNT(DISTINCT c.comment_id), 0) as comment_count,
-                CASE 
-                    WHEN :current_user_id IS NOT NULL THEN 
-                        EXISTS(
-                            SELECT 1 FROM PostLikes 
-                            WHERE post_id = p.post_id AND user_id = :current_user_id
-                        )
-                    ELSE FALSE 
-                END as liked_by_user
+                u.profile_picture_url as user_profile_picture
             FROM Posts p
             JOIN Users u ON p.user_id = u.user_id
-            LEFT JOIN PostLikes pl ON p.post_id = pl.post_id
-            LEFT JOIN Comments c ON p.post_id = c.post_id
             WHERE p.community_id = :community_id
-            GROUP BY p.post_id, u.username, u.profile_picture_url
-            ORDER BY p.created_at DESC 
+              AND {VISIBLE_POST}
+              AND (:cursor_created_at IS NULL OR (p.created_at, p.post_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY p.created_at DESC, p.post_id DESC 
             LIMIT :limit OFFSET :offset
         """)
         
         result = self.db.session.execute(query, {
             "community_id": community_id,
-            "current_user_id": current_user_id,
+            "viewer_id": current_user_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         
         posts_with_stats = []
@@ -300,66 +428,68 @@ class PostRepository:
                 'username': row.username,
                 'user_profile_picture': row.user_profile_picture,
                 'like_count': row.like_count,
-                'comment_count': row.comment_count,
-                'liked_by_user': row.liked_by_user
+                'comment_count': row.comment_count
             })
-        return posts_with_stats
+        return self.attach_liked_by_user(posts_with_stats, current_user_id)
 
-    def get_feed_with_stats(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Get feed posts with engagement metrics (accepted follows only)"""
-        query = text("""
+    def get_many_with_stats(self, post_ids: List[int], user_id: Optional[int] = None,
+                            visible_only: bool = False) -> List[Dict]:
+        """Hydrate a list of post IDs with author info and engagement metrics, preserving the given order
+
+        With visible_only, posts user_id may not see are dropped (see visibility.visible_to_viewer).
+        """
+        if not post_ids:
+            return []
+
+        query = text(f"""
             SELECT 
                 p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.created_at, p.updated_at,
                 u.username AS author_username, u.profile_picture_url AS author_profile_picture,
-                COALESCE(COUNT(DISTINCT pl.user_id), 0) AS like_count,
-                COALESCE(COUNT(DISTINCT c.comment_id), 0) AS comment_count,
-                EXISTS(SELECT 1 FROM PostLikes pl2 WHERE pl2.post_id = p.post_id AND pl2.user_id = :user_id) as liked_by_user
+                p.like_count,
+                p.comment_count
             FROM Posts p
             JOIN Users u ON p.user_id = u.user_id
-            INNER JOIN Follows f ON p.user_id = f.following_id
-            LEFT JOIN PostLikes pl ON p.post_id = pl.post_id
-            LEFT JOIN Comments c ON p.post_id = c.post_id
-            WHERE f.follower_id = :user_id 
-              AND f.status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
-            GROUP BY p.post_id, u.username, u.profile_picture_url
-            ORDER BY p.created_at DESC 
-            LIMIT :limit OFFSET :offset
+            WHERE p.post_id = ANY(:post_ids)
+              AND (:visible_only = FALSE OR {VISIBLE_POST})
         """)
         
         result = self.db.session.execute(query, {
-            "user_id": user_id,
-            "limit": limit,
-            "offset": offset
+            "post_ids": list(post_ids),
+            "viewer_id": user_id,
+            "visible_only": visible_only
         })
         
-        posts_with_stats = []
+        posts_by_id = {}
         for row in result.fetchall():
             post = Post.from_row(row)
-            posts_with_stats.append({
+            posts_by_id[row.post_id] = {
                 **post.to_dict(),
                 'username': row.author_username,
                 'user_profile_picture': row.author_profile_picture,
                 'like_count': row.like_count,
-                'comment_count': row.comment_count,
-                'liked_by_user': row.liked_by_user
-            })
-        return posts_with_stats
+                'comment_count': row.comment_count
+            }
+        posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+        return self.attach_liked_by_user(posts, user_id)
 
-    def get_popular(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Get popular posts from the view with liked_by_user status"""
-        query = text("""
+    def _hot_posts(self, where: str, params: Dict) -> List[Dict]:
+        """Posts matching where, ranked by time-decayed hot score (top-K scan of idx_posts_hot_score)"""
+        query = text(f"""
             SELECT 
-                p.*,
-                EXISTS(SELECT 1 FROM PostLikes pl WHERE pl.post_id = p.post_id AND pl.user_id = :user_id) as liked_by_user
-            FROM popular_posts_view p
+                p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count,
+                p.hot_score, p.created_at, p.updated_at,
+                u.username,
+                u.profile_picture_url,
+                c.name AS community_name
+            FROM Posts p
+            JOIN Users u ON p.user_id = u.user_id
+            LEFT JOIN Communities c ON p.community_id = c.community_id
+            WHERE {where}
+            ORDER BY p.hot_score DESC, p.post_id DESC
             LIMIT :limit OFFSET :offset
         """)
         
-        result = self.db.session.execute(query, {
-            "user_id": user_id,
-            "limit": limit,
-            "offset": offset
-        })
+        result = self.db.session.execute(query, {"offset": 0, **params})
         
         posts = []
         for row in result.fetchall():
@@ -376,62 +506,185 @@ class PostRepository:
                 'updated_at': row.updated_at.isoformat() if row.updated_at else None,
                 'like_count': row.like_count,
                 'comment_count': row.comment_count,
-                'engagement_score': row.engagement_score,
-                'liked_by_user': row.liked_by_user
+                'engagement_score': row.like_count + row.comment_count * 2,
+                'hot_score': row.hot_score
             }
             posts.append(post_dict)
             
         return posts
 
-    def get_trending_hashtags(self, limit: int = 5) -> List[Dict]:
-        """Get trending hashtags from recent posts"""
+    def get_hot(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """Get posts visible to user_id ranked by time-decayed hot score"""
+        posts = self._hot_posts(VISIBLE_POST, {"viewer_id": user_id, "limit": limit, "offset": offset})
+        return self.attach_liked_by_user(posts, user_id)
 
-        query = text("SELECT content FROM Posts ORDER BY created_at DESC LIMIT 1000")
-        result = self.db.session.execute(query)
+    @cached("posts.hot_public", ttl=Config.CACHE_SWR_HARD_TTL, soft_ttl=Config.CACHE_SWR_SOFT_TTL,
+            tags=lambda posts, *args, **kwargs: [
+                *{f"user:{post['user_id']}" for post in posts},
+                *(f"post:{post['post_id']}" for post in posts)
+            ])
+    def get_hot_public(self, limit: int = 50) -> List[Dict]:
+        """Top hot posts by public authors: the part of the discover feed shared by every viewer (no liked_by_user)"""
+        return self._hot_posts("u.is_private IS NOT TRUE", {"limit": limit})
+
+    def get_hot_private_visible(self, user_id: int, limit: int = 50) -> List[Dict]:
+        """Top hot posts by private authors user_id may see (themselves or accepted follows; no liked_by_user)"""
+        return self._hot_posts(f"""u.is_private IS TRUE AND (
+                p.user_id = :viewer_id
+                OR EXISTS (
+                    SELECT 1 FROM Follows f
+                    WHERE f.follower_id = :viewer_id AND f.following_id = p.user_id AND f.status_id = {ACCEPTED_STATUS_ID}
+                )
+            )""", {"viewer_id": user_id, "limit": limit})
+
+    def recompute_hot_scores(self, window_hours: int = 168) -> int:
+        """Recompute hot scores of recent posts so they decay with age; posts that left the window are zeroed (periodic job)"""
+        query = text("""
+            UPDATE Posts
+            SET hot_score = CASE
+                WHEN created_at > NOW() - make_interval(hours => :window_hours)
+                    THEN compute_hot_score(like_count, comment_count, created_at)
+                ELSE 0
+            END
+            WHERE (created_at > NOW() - make_interval(hours => :window_hours) AND like_count + comment_count > 0)
+               OR (created_at <= NOW() - make_interval(hours => :window_hours) AND hot_score > 0)
+        """)
+        result = self.db.session.execute(query, {"window_hours": window_hours})
+        self.db.session.commit()
+        return result.rowcount
+
+    def _index_hashtags(self, post_id: int, content: Optional[str], created_at) -> None:
+        """Store the hashtags of a post in PostHashtags (caller commits)"""
+        tags = extract_hashtags(content)
+        if not tags:
+            return
+        query = text("""
+            INSERT INTO PostHashtags (post_id, tag, created_at)
+            SELECT :post_id, tag, :created_at
+            FROM unnest(CAST(:tags AS VARCHAR[])) AS tag
+            ON CONFLICT DO NOTHING
+        """)
+        self.db.session.execute(query, {
+            "post_id": post_id,
+            "tags": tags,
+            "created_at": created_at
+        })
+
+    def reindex_hashtags(self, batch_size: int = 1000) -> int:
+        """Rebuild PostHashtags from the content of every post (used for backfill/repair)"""
+        self.db.session.execute(text("TRUNCATE TABLE PostHashtags"))
+        select_query = text("""
+            SELECT post_id, content, created_at FROM Posts
+            WHERE post_id > :last_id
+            ORDER BY post_id
+            LIMIT :limit
+        """)
+        insert_query = text("""
+            INSERT INTO PostHashtags (post_id, tag, created_at)
+            VALUES (:post_id, :tag, :created_at)
+            ON CONFLICT DO NOTHING
+        """)
+        indexed = 0
+        last_id = 0
+        while True:
+            rows = self.db.session.execute(select_query, {"last_id": last_id, "limit": batch_size}).fetchall()
+            if not rows:
+                break
+            entries = [
+                {"post_id": row.post_id, "tag": tag, "created_at": row.created_at}
+                for row in rows
+                for tag in extract_hashtags(row.content)
+            ]
+            if entries:
+                self.db.session.execute(insert_query, entries)
+                indexed += len(entries)
+            last_id = rows[-1].post_id
+        self.db.session.commit()
+        cache.invalidate_tags("hashtags")
+        return indexed
+
+    @cached("posts.trending_hashtags", ttl=Config.CACHE_SWR_HARD_TTL, soft_ttl=Config.CACHE_SWR_SOFT_TTL,
+            tags=["hashtags"])
+    def get_trending_hashtags(self, limit: int = 5, window: timedelta = timedelta(hours=24)) -> List[Dict]:
+        """Get the most used hashtags among posts created within the given time window"""
+        query = text("""
+            SELECT tag, COUNT(*) AS count
+            FROM PostHashtags
+            WHERE created_at >= NOW() - :window
+            GROUP BY tag
+            ORDER BY count DESC, tag ASC
+            LIMIT :limit
+        """)
+        result = self.db.session.execute(query, {"window": window, "limit": limit})
+        return [{"hashtag": row.tag, "count": row.count} for row in result.fetchall()]
+
+    def search_posts(self, query_str: str, limit: int = 50, offset: int = 0,
+                     user_id: Optional[int] = None,
+                     cursor: Optional[RankedCursor] = None) -> List[Dict]:
+        """Full-text search over post content, ranked by relevance then recency"""
+        query = text(f"""
+            SELECT 
+                p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count, p.created_at, p.updated_at,
+                u.username,
+                u.profile_picture_url as user_profile_picture,
+                ts_rank(p.search_vector, q.query) as rank
+            FROM Posts p
+            CROSS JOIN websearch_to_tsquery('simple', :search) AS q(query)
+            JOIN Users u ON p.user_id = u.user_id
+            WHERE p.search_vector @@ q.query
+              AND {VISIBLE_POST}
+              AND (:cursor_rank IS NULL OR (ts_rank(p.search_vector, q.query), p.created_at, p.post_id) 
+                   < (CAST(:cursor_rank AS REAL), :cursor_created_at, :cursor_id))
+            ORDER BY rank DESC, p.created_at DESC, p.post_id DESC 
+            LIMIT :limit OFFSET :offset
+        """)
+        
+        rank, created_at, row_id = cursor if cursor else (None, None, None)
+        result = self.db.session.execute(query, {
+            "search": query_str,
+            "viewer_id": user_id,
+            "cursor_rank": rank,
+            "limit": limit,
+            **keyset_params((created_at, row_id) if cursor else None, offset)
+        })
         
-        hashtag_counts = {}
+        posts = []
         for row in result.fetchall():
-            content = row.content
-            if not content:
-                continue
+            post = Post.from_row(row)
+            posts.append({
+                **post.to_dict(),
+                'username': row.username,
+                'user_profile_picture': row.user_profile_picture,
+                'like_count': row.like_count,
+                'comment_count': row.comment_count,
+                'rank': row.rank
+            })
             
-            words = content.split()
-            for word in words:
-                if word.startswith('#') and len(word) > 1:
-                    tag = word[1:].lower() 
-
-                    tag = "".join(c for c in tag if c.isalnum() or c == '_')
-                    if tag:
-                        hashtag_counts[tag] = hashtag_counts.get(tag, 0) + 1
-        
-        sorted_tags = sorted(hashtag_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
-        
-        return [{"hashtag": tag, "count": count} for tag, count in sorted_tags]
+        return self.attach_liked_by_user(posts, user_id)
 
-    def search_posts(self, query_str: str, limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Search posts by content"""
-        query = text("""
+    def search_posts_substring(self, query_str: str, limit: int = 50, offset: int = 0,
+                               user_id: Optional[int] = None,
+                               cursor: Optional[Cursor] = None) -> List[Dict]:
+        """Search posts by substring match (fallback for queries too short for full-text search)"""
+        query = text(f"""
             SELECT 
-                p.*,
+                p.post_id, p.user_id, p.community_id, p.content, p.media_url, p.like_count, p.comment_count, p.created_at, p.updated_at,
                 u.username,
-                u.profile_picture_url as user_profile_picture,
-                COALESCE(COUNT(DISTINCT pl.user_id), 0) as like_count,
-                COALESCE(COUNT(DISTINCT c.comment_id), 0) as comment_count,
-                FALSE as liked_by_user
+                u.profile_picture_url as user_profile_picture
             FROM Posts p
             JOIN Users u ON p.user_id = u.user_id
-            LEFT JOIN PostLikes pl ON p.post_id = pl.post_id
-            LEFT JOIN Comments c ON p.post_id = c.post_id
             WHERE p.content ILIKE :search
-            GROUP BY p.post_id, u.username, u.profile_picture_url
-            ORDER BY p.created_at DESC 
+              AND {VISIBLE_POST}
+              AND (:cursor_created_at IS NULL OR (p.created_at, p.post_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY p.created_at DESC, p.post_id DESC 
             LIMIT :limit OFFSET :offset
         """)
         
         result = self.db.session.execute(query, {
             "search": f"%{query_str}%",
+            "viewer_id": user_id,
             "limit": limit,
-            "offset": offset
+            **keyset_params(cursor, offset)
         })
         
         posts = []
@@ -442,8 +695,7 @@ class PostRepository:
                 'username': row.username,
                 'user_profile_picture': row.user_profile_picture,
                 'like_count': row.like_count,
-                'comment_count': row.comment_count,
-                'liked_by_user': row.liked_by_user
+                'comment_count': row.comment_count
             })
             
-        return posts
+        return self.attach_liked_by_user(posts, user_id)
@@ -0,0 +1,100 @@
+from sqlalchemy import text
+from api.extensions import db
+from api.entities.entities import Post
+from api.utils.pagination import Cursor, keyset_params
+from typing import Optional, List, Dict
+
+
+class TimelineRepository:
+    """Repository for the precomputed HomeTimeline (fan-out-on-write feed)"""
+
+    def __init__(self):
+        self.db = db
+
+    def fan_out_post(self, post: Post) -> int:
+        """Push a new post into the timelines of all accepted followers of its author"""
+        query = text("""
+            INSERT INTO HomeTimeline (user_id, post_id, author_id, created_at)
+            SELECT f.follower_id, :post_id, :author_id, :created_at
+            FROM Follows f
+            WHERE f.following_id = :author_id AND f.status_id = 2
+            ON CONFLICT DO NOTHING
+        """)
+        result = self.db.session.execute(query, {
+            "post_id": post.post_id,
+            "author_id": post.user_id,
+            "created_at": post.created_at
+        })
+        self.db.session.commit()
+        return result.rowcount
+
+    def add_follow(self, follower_id: int, following_id: int, backfill_limit: int = 200) -> int:
+        """Copy the most recent posts of a newly followed user into the follower's timeline"""
+        query = text("""
+            INSERT INTO HomeTimeline (user_id, post_id, author_id, created_at)
+            SELECT :follower_id, p.post_id, p.user_id, p.created_at
+            FROM Posts p
+            WHERE p.user_id = :following_id
+            ORDER BY p.created_at DESC
+            LIMIT :limit
+            ON CONFLICT DO NOTHING
+        """)
+        result = self.db.session.execute(query, {
+            "follower_id": follower_id,
+            "following_id": following_id,
+            "limit": backfill_limit
+        })
+        self.db.session.commit()
+        return result.rowcount
+
+    def remove_follow(self, follower_id: int, following_id: int) -> int:
+        """Remove an unfollowed user's posts from the follower's timeline"""
+        query = text("""
+            DELETE FROM HomeTimeline
+            WHERE user_id = :follower_id AND author_id = :following_id
+        """)
+        result = self.db.session.execute(query, {
+            "follower_id": follower_id,
+            "following_id": following_id
+        })
+        self.db.session.commit()
+        return result.rowcount
+
+    def get_page(self, user_id: int, limit: int = 50, offset: int = 0,
+                 cursor: Optional[Cursor] = None) -> List[Dict]:
+        """Get a page of (post_id, created_at) entries from a user's home timeline, newest first"""
+        query = text("""
+            SELECT post_id, created_at
+            FROM HomeTimeline
+            WHERE user_id = :user_id
+              AND (:cursor_created_at IS NULL OR (created_at, post_id) < (:cursor_created_at, :cursor_id))
+            ORDER BY created_at DESC, post_id DESC
+            LIMIT :limit OFFSET :offset
+        """)
+        result = self.db.session.execute(query, {
+            "user_id": user_id,
+            "limit": limit,
+            **keyset_params(cursor, offset)
+        })
+        return [dict(row._mapping) for row in result.fetchall()]
+
+    def rebuild_all(self, backfill_limit: int = 200) -> int:
+        """Rebuild every timeline from the accepted follow graph (used for backfill/repair)"""
+        self.db.session.execute(text("TRUNCATE TABLE HomeTimeline"))
+        query = text("""
+            INSERT INTO HomeTimeline (user_id, post_id, author_id, created_at)
+            SELECT f.follower_id, recent.post_id, recent.user_id, recent.created_at
+            FROM Follows f
+            CROSS JOIN LATERAL (
+                SELECT p.post_id, p.user_id, p.created_at
+                FROM Posts p
+                WHERE p.user_id = f.following_id
+                ORDER BY p.created_at DESC
+                LIMIT :limit
+            ) recent
+            WHERE f.status_id = 2
+            ON CONFLICT DO NOTHING
+        """)
+        result = self.db.session.execute(query, {"limit": backfill_limit})
+        self.db.session.commit()
+        return result.rowcount
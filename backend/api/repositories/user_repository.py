@@ -1,7 +1,10 @@
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from api.extensions import db
+from api.cache import cache
 from api.entities.entities import User
+from api.repositories import identity_map
+from api.utils.search import search_patterns
 from typing import Optional, List
 
 
@@ -27,7 +30,10 @@ class UserRepository:
                 "is_private": user.is_private
             })
             self.db.session.commit()
-            return User.from_row(result.fetchone())
+            saved = User.from_row(result.fetchone())
+            if saved:
+                self._forget(saved.user_id)
+            return saved
         except IntegrityError:
             self.db.session.rollback()
             raise ValueError("Username or email already exists")
@@ -36,7 +42,10 @@ class UserRepository:
             raise
 
     def get_by_id(self, user_id: int) -> Optional[User]:
-        """Get user by ID"""
+        """Get user by ID (cached for the rest of the request)"""
+        return identity_map.get_or_load(("user", user_id), lambda: self._fetch_by_id(user_id))
+
+    def _fetch_by_id(self, user_id: int) -> Optional[User]:
         query = text("SELECT * FROM Users WHERE user_id = :user_id")
         result = self.db.session.execute(query, {"user_id": user_id})
         return User.from_row(result.fetchone())
@@ -48,13 +57,28 @@ class UserRepository:
         return User.from_row(result.fetchone())
 
     def get_by_username(self, username: str) -> Optional[User]:
-        """Get user by username"""
+        """Get user by username (cached for the rest of the request)"""
+        user = identity_map.get_or_load(("username", username), lambda: self._fetch_by_username(username))
+        if user:
+            identity_map.store(("user", user.user_id), user)
+        return user
+
+    def _fetch_by_username(self, username: str) -> Optional[User]:
         query = text("SELECT * FROM Users WHERE username = :username")
         result = self.db.session.execute(query, {"username": username})
         return User.from_row(result.fetchone())
 
+    def _forget(self, user_id: int) -> None:
+        """Drop a user's cached rows after a write (including lookups by an old username)"""
+        identity_map.invalidate_where(
+            lambda key, value: key == ("user", user_id)
+            or (key[0] == "username" and (value is None or value.user_id == user_id))
+        )
+
     def update(self, user: User) -> Optional[User]:
         """Update an existing user"""
+        # The caller may have modified the cached entity, so drop it even if the update fails
+        self._forget(user.user_id)
         try:
             query = text("""
                 UPDATE Users 
@@ -78,6 +102,7 @@ class UserRepository:
                 "is_private": user.is_private
             })
             self.db.session.commit()
+            cache.invalidate_tags(f"user:{user.user_id}")
             return User.from_row(result.fetchone())
         except IntegrityError:
             self.db.session.rollback()
@@ -91,6 +116,10 @@ class UserRepository:
         query = text("DELETE FROM Users WHERE user_id = :user_id RETURNING user_id")
         result = self.db.session.execute(query, {"user_id": user_id})
         self.db.session.commit()
+        # Follow rows of the user are gone too (ON DELETE CASCADE)
+        identity_map.invalidate_where(lambda key, value: key[0] == "follow" and user_id in key[1:])
+        self._forget(user_id)
+        cache.invalidate_tags(f"user:{user_id}")
         return result.fetchone() is not None
 
     def get_all(self, limit: int = 100, offset: int = 0) -> List[User]:
@@ -103,35 +132,44 @@ class UserRepository:
         result = self.db.session.execute(query, {"limit": limit, "offset": offset})
         return [User.from_row(row) for row in result.fetchall()]
 
-    def search(self, query_str: str, limit: int = 20, only_following_for_user_id: Optional[int] = None) -> List[User]:
-        """Search users by username using ILIKE for better partial matching"""
-        # Using ILIKE for username prefix search which is more intuitive for autocomplete
-        if only_following_for_user_id:
+    def search(self, query_str: str, limit: int = 20, only_following_for_user_id: Optional[int] = None,
+               mode: str = "contains") -> List[User]:
+        """Search users by username/bio, ranked by trigram similarity (or by username prefix for autocomplete)"""
+        contains_pattern, prefix_pattern = search_patterns(query_str)
+        if mode == "prefix":
+            # Served by idx_users_username_prefix (LOWER(username) text_pattern_ops)
             query = text("""
                 SELECT u.* FROM Users u
-                JOIN Follows f ON f.following_id = u.user_id
-                WHERE f.follower_id = :current_user_id AND f.status_id = 2
-                AND (u.username ILIKE :search OR u.bio ILIKE :search)
-                ORDER BY u.username ASC
+                WHERE LOWER(u.username) LIKE :prefix
+                AND (:current_user_id IS NULL OR EXISTS(
+                    SELECT 1 FROM Follows f
+                    WHERE f.follower_id = :current_user_id AND f.following_id = u.user_id AND f.status_id = 2
+                ))
+                ORDER BY LOWER(u.username) ASC
                 LIMIT :limit
             """)
-            search_pattern = f"%{query_str}%"
-            result = self.db.session.execute(query, {
-                "search": search_pattern, 
-                "limit": limit,
-                "current_user_id": only_following_for_user_id
-            })
-            return [User.from_row(row) for row in result.fetchall()]
         else:
+            # Served by the username/bio trigram GIN indexes
             query = text("""
-                SELECT * FROM Users 
-                WHERE username ILIKE :search OR bio ILIKE :search
-                ORDER BY username ASC
+                SELECT u.*,
+                    GREATEST(similarity(u.username, :term), word_similarity(:term, COALESCE(u.bio, ''))) AS score
+                FROM Users u
+                WHERE (u.username ILIKE :search OR u.bio ILIKE :search OR u.username % :term)
+                AND (:current_user_id IS NULL OR EXISTS(
+                    SELECT 1 FROM Follows f
+                    WHERE f.follower_id = :current_user_id AND f.following_id = u.user_id AND f.status_id = 2
+                ))
+                ORDER BY score DESC, u.username ASC
                 LIMIT :limit
             """)
-            search_pattern = f"%{query_str}%"
-            result = self.db.session.execute(query, {"search": search_pattern, "limit": limit})
-            return [User.from_row(row) for row in result.fetchall()]
+        result = self.db.session.execute(query, {
+            "term": query_str.strip(),
+            "search": contains_pattern,
+            "prefix": prefix_pattern,
+            "limit": limit,
+            "current_user_id": only_following_for_user_id
+        })
+        return [User.from_row(row) for row in result.fetchall()]
 
     def count(self) -> int:
         """Get total user count"""
@@ -149,10 +187,20 @@ class UserRepository:
         return self.db.session.execute(query, {"username": username}).scalar()
 
     def get_recommendations(self, user_id: int, limit: int = 10) -> List[dict]:
-        """Get friend recommendations for a user"""
+        """Get precomputed friend recommendations for a user"""
         query = text("""
-            SELECT * FROM advanced_friend_recommendations 
-            WHERE user_id = :user_id 
+            SELECT 
+                fr.user_id,
+                fr.suggested_user_id,
+                u.username AS suggested_username,
+                fr.mutual_count,
+                fr.post_count,
+                fr.follower_count,
+                fr.score AS recommendation_score
+            FROM FriendRecommendations fr
+            JOIN Users u ON u.user_id = fr.suggested_user_id
+            WHERE fr.user_id = :user_id 
+            ORDER BY fr.rank
             LIMIT :limit
         """)
         
@@ -0,0 +1,25 @@
+# Accepted follow status (FollowStatus: 1 pending, 2 accepted, 3 rejected)
+ACCEPTED_STATUS_ID = 2
+
+
+def visible_to_viewer(author_column: str = "p.user_id", viewer_param: str = "viewer_id") -> str:
+    """SQL predicate: content by author_column is visible to the :viewer_param user.
+
+    True when the viewer is the author, the author is public, or the viewer is an accepted
+    follower of the author. Self-contained (no Users join needed), so any post-returning
+    query can AND it into its WHERE clause and bind the viewer's ID. A NULL viewer only
+    sees public authors.
+    """
+    return f"""(
+        {author_column} = :{viewer_param}
+        OR EXISTS (
+            SELECT 1 FROM Users vis_u
+            WHERE vis_u.user_id = {author_column} AND vis_u.is_private IS NOT TRUE
+        )
+        OR EXISTS (
+            SELECT 1 FROM Follows vis_f
+            WHERE vis_f.follower_id = :{viewer_param}
+              AND vis_f.following_id = {author_column}
+              AND vis_f.status_id = {ACCEPTED_STATUS_ID}
+        )
+    )"""
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from api.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """Minimal in-process scheduler running periodic jobs on a daemon thread inside the app context"""
+
+    def __init__(self):
+        self.jobs: Dict[str, dict] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(self, name: str, interval_seconds: int, func: Callable[[], None]):
+        """Register a job to run every interval_seconds (the first run happens after one interval)"""
+        self.jobs[name] = {
+            "func": func,
+            "interval": interval_seconds,
+            "next_run": time.monotonic() + interval_seconds
+        }
+
+    def run_pending(self, app):
+        """Run every job that is due (one pass)"""
+        now = time.monotonic()
+        for name, job in self.jobs.items():
+            if job["next_run"] > now:
+                continue
+            job["next_run"] = now + job["interval"]
+            with app.app_context():
+                try:
+                    job["func"]()
+                except Exception:
+                    logger.exception("Scheduled job '%s' failed", name)
+
+    def start(self, app):
+        """Start the scheduler thread (no-op if it is already running or has no jobs)"""
+        if not self.jobs or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                self.run_pending(app)
+                next_due = min(job["next_run"] for job in self.jobs.values())
+                self._stop.wait(max(0.0, next_due - time.monotonic()))
+
+        self._thread = threading.Thread(target=loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+scheduler = Scheduler()
+
+
+def init_scheduler(app) -> Scheduler:
+    """Register the periodic maintenance jobs and start the scheduler if enabled"""
+    from api.repositories.materialized_view_repository import MaterializedViewRepository
+    from api.repositories.post_repository import PostRepository
+    from api.repositories.friend_recommendation_repository import FriendRecommendationRepository
+    from api.repositories.message_repository import MessageRepository
+
+    if Config.POPULAR_POSTS_REFRESH_INTERVAL > 0:
+        scheduler.add_job(
+            "refresh_popular_posts_view",
+            Config.POPULAR_POSTS_REFRESH_INTERVAL,
+            lambda: MaterializedViewRepository().refresh("popular_posts_view")
+        )
+
+    if Config.HOT_SCORE_REFRESH_INTERVAL > 0:
+        scheduler.add_job(
+            "recompute_hot_scores",
+            Config.HOT_SCORE_REFRESH_INTERVAL,
+            lambda: PostRepository().recompute_hot_scores(Config.HOT_SCORE_WINDOW_HOURS)
+        )
+
+    if Config.FRIEND_RECOMMENDATIONS_REFRESH_INTERVAL > 0:
+        scheduler.add_job(
+            "refresh_dirty_friend_recommendations",
+            Config.FRIEND_RECOMMENDATIONS_REFRESH_INTERVAL,
+            lambda: FriendRecommendationRepository().refresh_dirty(
+                Config.FRIEND_RECOMMENDATIONS_TOP_N, Config.FRIEND_RECOMMENDATIONS_BATCH_SIZE,
+                Config.FRIEND_RECOMMENDATIONS_ENGINE
+            )
+        )
+
+    if Config.FRIEND_RECOMMENDATIONS_REBUILD_INTERVAL > 0:
+        scheduler.add_job(
+            "rebuild_friend_recommendations",
+            Config.FRIEND_RECOMMENDATIONS_REBUILD_INTERVAL,
+            lambda: FriendRecommendationRepository().rebuild_all(
+                Config.FRIEND_RECOMMENDATIONS_TOP_N, Config.FRIEND_RECOMMENDATIONS_BATCH_SIZE,
+                Config.FRIEND_RECOMMENDATIONS_ENGINE
+            )
+        )
+
+    if Config.MESSAGE_PARTITIONS_INTERVAL > 0:
+        scheduler.add_job(
+            "create_message_partitions",
+            Config.MESSAGE_PARTITIONS_INTERVAL,
+            lambda: MessageRepository().create_partitions(Config.MESSAGE_PARTITIONS_AHEAD)
+        )
+
+    if Config.MESSAGE_TOMBSTONE_PRUNE_INTERVAL > 0:
+        scheduler.add_job(
+            "prune_message_tombstones",
+            Config.MESSAGE_TOMBSTONE_PRUNE_INTERVAL,
+            lambda: MessageRepository().prune_tombstones(Config.MESSAGE_SYNC_RETENTION_DAYS)
+        )
+
+    if Config.SCHEDULER_ENABLED:
+        scheduler.start(app)
+    return scheduler
@@ -1,5 +1,6 @@
 from api.repositories.comment_repository import CommentRepository
 from api.entities.entities import Comment
+from api.utils.pagination import Cursor, next_cursor
 from typing import Optional, Dict, Any, List
 
 
@@ -46,9 +47,10 @@ class CommentService:
             return comment.to_dict()
         return None
 
-    def get_post_comments(self, post_id: int, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+    def get_post_comments(self, post_id: int, limit: int = 100, offset: int = 0,
+                          cursor: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get all top-level comments for a specific post with reply counts"""
-        comments = self.comment_repository.get_by_post_id(post_id, limit, offset)
+        comments = self.comment_repository.get_by_post_id(post_id, limit, offset, cursor)
         total = self.comment_repository.count_by_post_id(post_id)
         
         # Add reply count to each comment
@@ -62,7 +64,8 @@ class CommentService:
             "comments": comments_with_replies,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor(comments_with_replies, limit, id_key="comment_id")
         }
 
     def get_user_comments(self, user_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
@@ -145,14 +148,15 @@ class CommentService:
             parent_comment_id=comment_id
         )
 
-    def get_comment_replies(self, comment_id: int, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+    def get_comment_replies(self, comment_id: int, limit: int = 100, offset: int = 0,
+                            cursor: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get all replies to a specific comment"""
         # Validate comment exists
         comment = self.comment_repository.get_by_id(comment_id)
         if not comment:
             return {"success": False, "error": "Comment not found"}
         
-        replies = self.comment_repository.get_replies(comment_id, limit, offset)
+        replies = self.comment_repository.get_replies(comment_id, limit, offset, cursor)
         total = self.comment_repository.count_replies(comment_id)
         
         # Add reply count to each reply (for nested replies)
@@ -167,7 +171,8 @@ class CommentService:
             "replies": replies_with_counts,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor(replies_with_counts, limit, id_key="comment_id")
         }
 
     def get_comment_with_replies(self, comment_id: int) -> Dict[str, Any]:
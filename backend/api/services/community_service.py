@@ -1,6 +1,8 @@
 from api.repositories.community_repository import CommunityRepository
 from api.entities.entities import Community
 from api.permissions.permissions import has_community_permission
+from api.utils.pagination import Cursor
+from api.utils.search import SEARCH_MODES
 from typing import Optional, List, Dict, Any
 
 
@@ -205,21 +207,26 @@ class CommunityService:
         updated_member = self.community_repository.update_member_role(community_id, target_user_id, new_role_id)
         return updated_member.to_dict() if updated_member else None
     
-    def get_members(self, community_id: int, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_members(self, community_id: int, limit: int = 50, offset: int = 0,
+                    cursor: Optional[Cursor] = None) -> List[Dict[str, Any]]:
         """Get all members of a community"""
         # Check if community exists
         community = self.community_repository.get_by_id(community_id)
         if not community:
             raise ValueError("Community not found")
         
-        return self.community_repository.get_members(community_id, limit, offset)
+        return self.community_repository.get_members(community_id, limit, offset, cursor)
     
-    def search_communities(self, search_term: str, limit: int = 50, offset: int = 0, user_id: int = None) -> List[Community]:
+    def search_communities(self, search_term: str, limit: int = 50, offset: int = 0, user_id: int = None,
+                           mode: str = "contains") -> List[Community]:
         """Search communities by name or description"""
         if not search_term or len(search_term.strip()) == 0:
             raise ValueError("Search term is required")
         
-        return self.community_repository.search(search_term, limit, offset, user_id)
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Mode must be one of: {', '.join(SEARCH_MODES)}")
+        
+        return self.community_repository.search(search_term, limit, offset, user_id, mode)
     
     def get_all_communities(self, limit: int = 50, offset: int = 0, user_id: int = None) -> List[Community]:
         """Get all communities with pagination"""
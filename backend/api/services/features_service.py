@@ -1,4 +1,5 @@
 from api.repositories.features_repository import FeaturesRepository
+from api.repositories.materialized_view_repository import MaterializedViewRepository
 from typing import Optional, Dict, Any, List
 
 
@@ -7,6 +8,7 @@ class FeaturesService:
     
     def __init__(self):
         self.features_repository = FeaturesRepository()
+        self.materialized_view_repository = MaterializedViewRepository()
 
     def get_popular_posts(self, limit: int = 20) -> Dict[str, Any]:
         """Get popular posts with business logic"""
@@ -17,11 +19,13 @@ class FeaturesService:
             limit = 100
         
         posts = self.features_repository.get_popular_posts(limit)
+        refreshed_at = self.materialized_view_repository.get_refreshed_at("popular_posts_view")
         
         return {
             "success": True,
             "posts": posts,
-            "count": len(posts)
+            "count": len(posts),
+            "refreshed_at": refreshed_at.isoformat() if refreshed_at else None
         }
 
     def get_active_users(self, limit: int = 20) -> Dict[str, Any]:
@@ -1,13 +1,17 @@
 from api.repositories.follow_repository import FollowRepository
 from api.repositories.user_repository import UserRepository
+from api.repositories.timeline_repository import TimelineRepository
+from api.config import Config
 from api.entities.entities import Follow
-from typing import Dict, Any, List
+from api.utils.pagination import Cursor
+from typing import Optional, Dict, Any, List
 
 
 class FollowService:
     def __init__(self):
         self.follow_repository = FollowRepository()
         self.user_repository = UserRepository()
+        self.timeline_repository = TimelineRepository()
     
     def follow_user(self, follower_id: int, following_id: int) -> Dict[str, Any]:
         """Follow a user - auto accept if public, pending if private"""
@@ -64,11 +68,13 @@ class FollowService:
         
         # Delete the primary follow relationship
         deleted = self.follow_repository.delete(follower_id, following_id)
+        self.timeline_repository.remove_follow(follower_id, following_id)
         
         # Also delete the reverse follow relationship (mutual unfollow)
         reverse_existing = self.follow_repository.get_by_ids(following_id, follower_id)
         if reverse_existing:
             self.follow_repository.delete(following_id, follower_id)
+            self.timeline_repository.remove_follow(following_id, follower_id)
         
         if deleted:
             return {"success": True, "message": "Unfollowed successfully"}
@@ -89,6 +95,8 @@ class FollowService:
         
         # Update status to accepted (2)
         updated = self.follow_repository.update_status(follower_id, following_id, 2)
+        backfill_limit = Config.HOME_TIMELINE_BACKFILL_LIMIT
+        self.timeline_repository.add_follow(follower_id, following_id, backfill_limit)
         
         # Create mutual follow (LinkedIn-style connection)
         # The person accepting now also follows the requester
@@ -100,9 +108,11 @@ class FollowService:
                 status_id=2  # Auto-accept the reverse
             )
             self.follow_repository.create(reverse_follow)
+            self.timeline_repository.add_follow(following_id, follower_id, backfill_limit)
         elif reverse_existing.status_id != 2:
             # If reverse exists but not accepted, update it to accepted
             self.follow_repository.update_status(following_id, follower_id, 2)
+            self.timeline_repository.add_follow(following_id, follower_id, backfill_limit)
         
         return {
             "success": True,
@@ -129,14 +139,16 @@ class FollowService:
             "follow": updated.to_dict()
         }
 
-    def get_followers(self, user_id: int, current_user_id: int = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_followers(self, user_id: int, current_user_id: int = None, limit: int = 100, offset: int = 0,
+                      cursor: Optional[Cursor] = None) -> List[Dict[str, Any]]:
         """Get all followers of a user"""
-        followers = self.follow_repository.get_followers(user_id, current_user_id, limit, offset)
+        followers = self.follow_repository.get_followers(user_id, current_user_id, limit, offset, cursor)
         return followers
 
-    def get_following(self, user_id: int, current_user_id: int = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    def get_following(self, user_id: int, current_user_id: int = None, limit: int = 100, offset: int = 0,
+                      cursor: Optional[Cursor] = None) -> List[Dict[str, Any]]:
         """Get all users that a user is following"""
-        following = self.follow_repository.get_following(user_id, current_user_id, limit, offset)
+        following = self.follow_repository.get_following(user_id, current_user_id, limit, offset, cursor)
         return following
 
     def get_pending_requests(self, user_id: int, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
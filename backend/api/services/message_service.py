@@ -1,8 +1,15 @@
+import json
+import queue
+from api.extensions import db
 from api.repositories.message_repository import MessageRepository
+from api.repositories.message_events import message_event_hub
 from api.repositories.user_repository import UserRepository
 from api.repositories.follow_repository import FollowRepository
 from api.entities.entities import Message
-from typing import Dict, Any, List
+from api.utils.pagination import Cursor, SyncToken, encode_sync_token, next_cursor
+from api.config import Config
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Iterator
 
 
 class MessageService:
@@ -17,15 +24,6 @@ class MessageService:
         if sender_id == receiver_id:
             return {"success": False, "error": "Cannot send message to yourself"}
         
-        # Check if receiver exists
-        receiver = self.user_repository.get_by_id(receiver_id)
-        if not receiver:
-            return {"success": False, "error": "Receiver not found"}
-
-        # Check if sender follows receiver
-        if not self.follow_repository.is_following(sender_id, receiver_id):
-            return {"success": False, "error": "You must follow this user to send them a message"}
-        
         # Create message entity
         message = Message(
             sender_id=sender_id,
@@ -40,27 +38,34 @@ class MessageService:
         if errors:
             return {"success": False, "error": errors[0]}
         
-        # Create message
-        created_message = self.message_repository.create(message)
+        # Follow check and insert in one statement
+        created_message, receiver_exists = self.message_repository.create_if_following(message)
+        if not created_message:
+            if not receiver_exists:
+                return {"success": False, "error": "Receiver not found"}
+            return {"success": False, "error": "You must follow this user to send them a message"}
         
         return {
             "success": True,
             "message": created_message.to_dict()
         }
 
-    def get_conversation(self, user_id: int, other_user_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    def get_conversation(self, user_id: int, other_user_id: int, limit: int = 50, offset: int = 0,
+                         before: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get conversation between current user and another user"""
         # Check if other user exists
         other_user = self.user_repository.get_by_id(other_user_id)
         if not other_user:
             return {"success": False, "error": "User not found"}
         
-        messages = self.message_repository.get_conversation(user_id, other_user_id, limit, offset)
+        messages = self.message_repository.get_conversation(user_id, other_user_id, limit, offset, before)
+        message_dicts = [msg.to_dict() for msg in messages]
         
         return {
             "success": True,
-            "messages": [msg.to_dict() for msg in messages],
+            "messages": message_dicts,
             "count": len(messages),
+            "next_before": next_cursor(message_dicts, limit, id_key="message_id"),
             "other_user": {
                 "user_id": other_user.user_id,
                 "username": other_user.username,
@@ -68,9 +73,10 @@ class MessageService:
             }
         }
 
-    def get_conversations(self, user_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    def get_conversations(self, user_id: int, limit: int = 50, offset: int = 0,
+                          cursor: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get all conversations for a user"""
-        raw_conversations = self.message_repository.get_user_conversations(user_id, limit, offset)
+        raw_conversations = self.message_repository.get_user_conversations(user_id, limit, offset, cursor)
         
         conversations = []
         for conv in raw_conversations:
@@ -84,12 +90,13 @@ class MessageService:
                     "content": conv["content"],
                     "created_at": conv["created_at"].isoformat() if conv["created_at"] else None
                 },
-                "unread_count": 0 # TODO: Implement unread count per conversation
+                "unread_count": conv["unread_count"]
             })
             
         return {
             "conversations": conversations,
-            "count": len(conversations)
+            "count": len(conversations),
+            "next_cursor": next_cursor(raw_conversations, limit, id_key="message_id")
         }
 
     def mark_as_read(self, message_id: int, user_id: int) -> Dict[str, Any]:
@@ -106,7 +113,7 @@ class MessageService:
         if message.is_read:
             return {"success": False, "error": "Message already marked as read"}
         
-        updated_message = self.message_repository.mark_as_read(message_id)
+        updated_message = self.message_repository.mark_as_read(message_id, message.created_at)
         
         return {
             "success": True,
@@ -124,7 +131,7 @@ class MessageService:
         if message.sender_id != user_id:
             return {"success": False, "error": "Only sender can delete message"}
         
-        deleted = self.message_repository.delete(message_id)
+        deleted = self.message_repository.delete(message_id, message.created_at)
         
         if deleted:
             return {"success": True, "message": "Message deleted successfully"}
@@ -138,3 +145,123 @@ class MessageService:
             "user_id": user_id,
             "unread_count": count
         }
+
+    def sync(self, user_id: int, since: Optional[SyncToken] = None, limit: int = 200) -> Dict[str, Any]:
+        """Messages created, conversations read or updated and messages deleted since a sync token.
+
+        Without a token (or with one older than the deletion retention, "reset": true) nothing
+        is returned but a token for the current position: the client loads its conversations
+        in full, then syncs from there. Changes can be sent twice, so clients apply them by id.
+        """
+        now = datetime.now(timezone.utc)
+        reset = since is not None and since[2] < now - timedelta(days=Config.MESSAGE_SYNC_RETENTION_DAYS)
+        if since is None or reset:
+            position = self.message_repository.get_sync_position()
+            return {
+                "success": True,
+                "reset": reset,
+                "messages": [],
+                "conversations": [],
+                "deleted_messages": [],
+                "has_more": False,
+                "next_token": encode_sync_token(position, 0, now)
+            }
+
+        changes = self.message_repository.get_changes(user_id, since[0], since[1], limit)
+        has_more = bool(changes["messages"]) and len(changes["messages"]) == limit
+        last_change = changes["last_change"]
+        if has_more and last_change[0] < changes["position"]:
+            # Resume after the last message sent; deletions are still covered from `since`
+            next_token = encode_sync_token(last_change[0], last_change[1], since[2])
+        else:
+            # Everything before position has committed and been read; later changes may still
+            # be in flight, so the next sync starts at position itself
+            next_token = encode_sync_token(changes["position"], 0, now)
+
+        conversations = [
+            {
+                "other_user_id": conv["other_user_id"],
+                "last_message_id": conv["last_message_id"],
+                "last_message_at": _isoformat(conv["last_message_at"]),
+                "unread_count": conv["unread_count"],
+                "read_up_to": {
+                    "message_id": conv["read_message_id"],
+                    "created_at": _isoformat(conv["read_at"])
+                },
+                "other_read_up_to": {
+                    "message_id": conv["other_read_message_id"],
+                    "created_at": _isoformat(conv["other_read_at"])
+                }
+            }
+            for conv in changes["conversations"]
+        ]
+        return {
+            "success": True,
+            "reset": False,
+            "messages": [msg.to_dict() for msg in changes["messages"]],
+            "conversations": conversations,
+            "deleted_messages": changes["deleted"],
+            "has_more": has_more,
+            "next_token": next_token
+        }
+
+    def stream_events(self, user_id: int, heartbeat_seconds: Optional[int] = None) -> Optional[Iterator[str]]:
+        """Server-Sent Events for user_id: new messages and unread count changes as they happen.
+
+        Waits on the process-wide event hub instead of polling; the database is only read
+        when an event for this user arrives. Idle streams get a keep-alive comment every
+        heartbeat_seconds, which is also when a closed client is noticed. Returns None when
+        the process already serves MESSAGE_STREAM_MAX_CONNECTIONS streams.
+        """
+        heartbeat_seconds = heartbeat_seconds or Config.MESSAGE_STREAM_HEARTBEAT_SECONDS
+        message_event_hub.ensure_started(db.engine)
+        events = message_event_hub.subscribe(user_id)
+        if events is None:
+            return None
+        stream = self._stream_events(user_id, events, heartbeat_seconds)
+        # Start the stream now: once started, its subscription is released when it is closed
+        # or garbage collected, even if the response is never iterated
+        first = next(stream)
+        return _prepend(first, stream)
+
+    def _stream_events(self, user_id: int, events: queue.Queue, heartbeat_seconds: int) -> Iterator[str]:
+        try:
+            update = self.message_repository.get_stream_update(user_id)
+            yield _sse("unread_count", {"unread_count": update["unread_count"]})
+            while True:
+                try:
+                    event = events.get(timeout=heartbeat_seconds)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                update = self.message_repository.get_stream_update(
+                    user_id, event.get("message_id"), event.get("created_at")
+                )
+                if event["type"] == "message" and update["message"]:
+                    yield _sse("message", update["message"].to_dict())
+                elif event["type"] == "deleted":
+                    yield _sse("message_deleted", {"message_id": event["message_id"]})
+                elif event["type"] == "resync":
+                    # Events may have been missed: clients should refetch their conversations
+                    yield _sse("resync", {})
+                yield _sse("unread_count", {"unread_count": update["unread_count"]})
+        finally:
+            message_event_hub.unsubscribe(user_id, events)
+
+
+def _prepend(first: str, stream: Iterator[str]) -> Iterator[str]:
+    try:
+        yield first
+        yield from stream
+    finally:
+        stream.close()
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -1,15 +1,25 @@
+import heapq
 from api.repositories.post_repository import PostRepository
-from api.repositories.user_repository import UserRepository
-from api.repositories.follow_repository import FollowRepository
+from api.repositories.timeline_repository import TimelineRepository
+from api.repositories.like_write_buffer import like_write_buffer
 from api.entities.entities import Post
+from api.utils.pagination import (
+    Cursor, next_cursor, decode_cursor, encode_ranked_cursor, decode_ranked_cursor
+)
+from api.utils.hashtags import TRENDING_WINDOWS
+from api.config import Config
 from typing import Optional, Dict, Any, List
 
+# Discover feed: the shared public hot list is cached in multiples of this many posts,
+# up to DISCOVER_CACHE_MAX_POSTS; deeper pages are queried live
+DISCOVER_CACHE_PAGE = 50
+DISCOVER_CACHE_MAX_POSTS = 4 * DISCOVER_CACHE_PAGE
+
 
 class PostService:
     def __init__(self):
         self.post_repository = PostRepository()
-        self.user_repository = UserRepository()
-        self.follow_repository = FollowRepository()
+        self.timeline_repository = TimelineRepository()
 
     def create_post(self, user_id: int, content: str = None, 
                     media_url: str = None, community_id: int = None) -> Dict[str, Any]:
@@ -30,6 +40,9 @@ class PostService:
         # Save to database
         created_post = self.post_repository.create(post)
         
+        # Fan out to followers' home timelines
+        self.timeline_repository.fan_out_post(created_post)
+        
         # Get post with engagement metrics (will be 0 for new posts)
         post_with_stats = self.post_repository.get_with_stats(created_post.post_id, user_id)
         
@@ -40,58 +53,66 @@ class PostService:
 
     def get_post(self, post_id: int, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Get post by ID with engagement metrics and user's interaction status (with privacy check)"""
-        # Use the new get_with_stats method
-        post_dict = self.post_repository.get_with_stats(post_id, user_id)
-        
-        if post_dict:
-            # Get the basic post to check privacy
-            post = self.post_repository.get_by_id(post_id)
-            
-            # Check if user can view this post
-            if user_id and not self.can_view_post(post, user_id):
-                return None
-            
-            return post_dict
-        return None
+        # Stats, like status and visibility are resolved in a single query
+        return self.post_repository.get_with_stats(post_id, user_id, visible_only=user_id is not None)
 
-    def get_user_posts(self, user_id: int, current_user_id: int = None, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    def get_posts_batch(self, post_ids: List[int], user_id: int) -> Dict[str, Any]:
+        """Hydrate many posts at once in request order, skipping missing posts and posts the user cannot view"""
+        # Drop duplicates but keep the requested order
+        post_ids = list(dict.fromkeys(post_ids))
+        if not post_ids:
+            return {"success": False, "error": "At least one post ID is required"}
+        if len(post_ids) > Config.POST_BATCH_MAX_IDS:
+            return {"success": False, "error": f"At most {Config.POST_BATCH_MAX_IDS} post IDs can be requested at once"}
+        
+        posts = self.post_repository.get_many_with_stats(post_ids, user_id, visible_only=True)
+        found = {post['post_id'] for post in posts}
+        
+        return {
+            "success": True,
+            "posts": posts,
+            "missing": [post_id for post_id in post_ids if post_id not in found]
+        }
+
+    def get_user_posts(self, user_id: int, current_user_id: int = None, limit: int = 50, offset: int = 0,
+                       cursor: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get all posts by a specific user with engagement metrics (filtered by privacy)"""
         # Check if current user can view this user's posts
         if current_user_id and current_user_id != user_id:
-            post_author = self.user_repository.get_by_id(user_id)
-            if post_author and post_author.is_private:
-                # Check if current user is an accepted follower
-                follow = self.follow_repository.get_by_ids(current_user_id, user_id)
-                if not follow or follow.status_id != 2:
-                    return {
-                        "posts": [],
-                        "total": 0,
-                        "limit": limit,
-                        "offset": offset,
-                        "message": "This account is private"
-                    }
+            if not self.post_repository.can_view_author(user_id, current_user_id):
+                return {
+                    "posts": [],
+                    "total": 0,
+                    "limit": limit,
+                    "offset": offset,
+                    "next_cursor": None,
+                    "message": "This account is private"
+                }
         
         # Use the new method with stats
-        posts = self.post_repository.get_by_user_id_with_stats(user_id, current_user_id, limit, offset)
+        posts = self.post_repository.get_by_user_id_with_stats(user_id, current_user_id, limit, offset, cursor)
         total = self.post_repository.count(user_id=user_id)
         
         return {
             "posts": posts,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor(posts, limit, id_key="post_id")
         }
 
-    def get_community_posts(self, community_id: int, current_user_id: int = None, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    def get_community_posts(self, community_id: int, current_user_id: int = None, limit: int = 50, offset: int = 0,
+                            cursor: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get all posts in a specific community with engagement metrics"""
-        posts = self.post_repository.get_by_community_id_with_stats(community_id, current_user_id, limit, offset)
+        posts = self.post_repository.get_by_community_id_with_stats(community_id, current_user_id, limit, offset, cursor)
         total = self.post_repository.count(community_id=community_id)
         
         return {
             "posts": posts,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor(posts, limit, id_key="post_id")
         }
 
     def update_post(self, post_id: int, user_id: int, updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -147,37 +168,54 @@ class PostService:
             return {"success": True, "message": "Post deleted successfully"}
         return {"success": False, "error": "Failed to delete post"}
 
-    def get_feed(self, user_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    def get_feed(self, user_id: int, limit: int = 50, offset: int = 0,
+                 cursor: Optional[Cursor] = None) -> Dict[str, Any]:
         """Get authenticated user's feed with engagement metrics (posts from accepted follows only)
         
-        OPTIMIZED: No N+1 queries
-        - User info fetched in single query with JOIN
-        - Privacy filtering done in single pass (no additional queries)
+        OPTIMIZED: Reads from the precomputed HomeTimeline
+        - A page of post IDs is read from the user's timeline (filled on post creation)
+        - Only those posts are hydrated with author info and stats
         """
-        # Use the optimized feed method - includes user info in single query
-        posts = self.post_repository.get_feed_with_stats(user_id, limit, offset)
-        
-        # Filter posts based on privacy (already have user info, no extra queries)
-        filtered_posts = []
-        for post_dict in posts:
-            # User info already fetched with JOIN - no additional query
-            is_private = post_dict.get('is_private', False)
-            post_user_id = post_dict['user_id']
-            
-            # Include if: own post, public user, or accepted follow (already verified in query)
-            if post_user_id == user_id or not is_private:
-                # Accepted follow already verified by query JOIN condition
-                filtered_posts.append(post_dict)
+        page = self.timeline_repository.get_page(user_id, limit, offset, cursor)
+        # Privacy is re-checked in the hydration query, so no per-post lookups are needed
+        posts = self.post_repository.get_many_with_stats(
+            [entry['post_id'] for entry in page], user_id, visible_only=True
+        )
         
         return {
-            "posts": filtered_posts,
+            "posts": posts,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor(page, limit, id_key="post_id")
         }
     
     def get_discover_feed(self, user_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """Get popular posts for discovery"""
-        posts = self.post_repository.get_popular(user_id, limit, offset)
+        """Get posts for discovery ranked by time-decayed hot score.
+
+        Posts by public authors come from one cached list shared by every viewer (rounded up
+        to whole DISCOVER_CACHE_PAGE pages so nearby page sizes share an entry); the viewer's
+        own and followed private authors' posts are merged in live. Pages past
+        DISCOVER_CACHE_MAX_POSTS are rare and read live, so cached lists stay short.
+        """
+        wanted = offset + limit
+        if wanted > DISCOVER_CACHE_MAX_POSTS:
+            return {
+                "posts": self.post_repository.get_hot(user_id, limit, offset),
+                "limit": limit,
+                "offset": offset
+            }
+        
+        public = self.post_repository.get_hot_public(-(-wanted // DISCOVER_CACHE_PAGE) * DISCOVER_CACHE_PAGE)
+        private = self.post_repository.get_hot_private_visible(user_id, wanted)
+        
+        seen = set()
+        ranked = []
+        for post in heapq.merge(public, private, key=lambda p: (-p['hot_score'], -p['post_id'])):
+            # An author who just went private can briefly be in both lists
+            if post['post_id'] not in seen:
+                seen.add(post['post_id'])
+                ranked.append(post)
+        posts = self.post_repository.attach_liked_by_user(ranked[offset:wanted], user_id)
         
         return {
             "posts": posts,
@@ -185,72 +223,112 @@ class PostService:
             "offset": offset
         }
 
-    def get_trending_hashtags(self, limit: int = 5) -> Dict[str, Any]:
-        """Get trending hashtags"""
-        hashtags = self.post_repository.get_trending_hashtags(limit)
-        return {"success": True, "hashtags": hashtags}
+    def get_trending_hashtags(self, limit: int = 5, window: Optional[str] = None) -> Dict[str, Any]:
+        """Get trending hashtags within a time window (1h, 24h or 7d)"""
+        window = window or Config.TRENDING_DEFAULT_WINDOW
+        if window not in TRENDING_WINDOWS:
+            return {"success": False, "error": f"Window must be one of: {', '.join(TRENDING_WINDOWS)}"}
+        
+        hashtags = self.post_repository.get_trending_hashtags(limit, TRENDING_WINDOWS[window])
+        return {"success": True, "hashtags": hashtags, "window": window}
 
-    def search_posts(self, query: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
-        """Search posts"""
-        posts = self.post_repository.search_posts(query, limit, offset)
+    def search_posts(self, query: str, limit: int = 50, offset: int = 0,
+                     user_id: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Search posts (full-text ranked search, substring match for very short queries)"""
+        query = query.strip()
+        try:
+            if len(query) < Config.SEARCH_MIN_FULLTEXT_LENGTH:
+                mode = "substring"
+                posts = self.post_repository.search_posts_substring(
+                    query, limit, offset, user_id, decode_cursor(cursor)
+                )
+                new_cursor = next_cursor(posts, limit, id_key="post_id")
+            else:
+                mode = "fulltext"
+                posts = self.post_repository.search_posts(
+                    query, limit, offset, user_id, decode_ranked_cursor(cursor)
+                )
+                new_cursor = None
+                if posts and len(posts) >= limit:
+                    last = posts[-1]
+                    new_cursor = encode_ranked_cursor(last['rank'], last['created_at'], last['post_id'])
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        
         return {
             "success": True,
             "posts": posts,
+            "mode": mode,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": new_cursor
         }
 
     def like_post(self, post_id: int, user_id: int) -> Dict[str, Any]:
-        """Like a post with validation"""
-        # Get post
-        post = self.post_repository.get_by_id(post_id)
-        if not post:
+        """Like a post with validation (one database round trip)"""
+        if Config.LIKE_WRITE_BEHIND_ENABLED:
+            return self._queue_like_change(post_id, user_id, liked=True)
+        try:
+            result = self.post_repository.add_like(post_id, user_id)
+        except Exception:
+            return {"success": False, "error": "Failed to like post"}
+        
+        if result is None:
             return {"success": False, "error": "Post not found"}
-        
-        # Check if already liked
-        if self.post_repository.has_user_liked(post_id, user_id):
+        if not result["changed"]:
             return {"success": False, "error": "You have already liked this post"}
         
-        # Add like
-        success = self.post_repository.like_post(post_id, user_id)
-        
-        if success:
-            # Get updated stats
-            post_with_stats = self.post_repository.get_with_stats(post_id, user_id)
-            return {
-                "success": True,
-                "message": "Post liked successfully",
-                "like_count": post_with_stats['like_count'],
-                "comment_count": post_with_stats['comment_count'],
-                "liked_by_user": post_with_stats['liked_by_user']
-            }
-        return {"success": False, "error": "Failed to like post"}
+        return {
+            "success": True,
+            "message": "Post liked successfully",
+            "like_count": result['like_count'],
+            "comment_count": result['comment_count'],
+            "liked_by_user": result['liked_by_user']
+        }
 
     def unlike_post(self, post_id: int, user_id: int) -> Dict[str, Any]:
-        """Unlike a post"""
-        # Get post
-        post = self.post_repository.get_by_id(post_id)
-        if not post:
+        """Unlike a post (one database round trip)"""
+        if Config.LIKE_WRITE_BEHIND_ENABLED:
+            return self._queue_like_change(post_id, user_id, liked=False)
+        try:
+            result = self.post_repository.remove_like(post_id, user_id)
+        except Exception:
+            return {"success": False, "error": "Failed to unlike post"}
+        
+        if result is None:
             return {"success": False, "error": "Post not found"}
-        
-        # Check if liked
-        if not self.post_repository.has_user_liked(post_id, user_id):
+        if not result["changed"]:
             return {"success": False, "error": "You have not liked this post"}
         
-        # Remove like
-        success = self.post_repository.unlike_post(post_id, user_id)
+        return {
+            "success": True,
+            "message": "Post unliked successfully",
+            "like_count": result['like_count'],
+            "comment_count": result['comment_count'],
+            "liked_by_user": result['liked_by_user']
+        }
+
+    def _queue_like_change(self, post_id: int, user_id: int, liked: bool) -> Dict[str, Any]:
+        """Write-behind like/unlike: validate against committed plus queued state, then queue the event"""
+        state = self.post_repository.get_like_state(post_id, user_id)
+        if state is None:
+            return {"success": False, "error": "Post not found"}
+        
+        pending = like_write_buffer.pending_state(post_id, user_id)
+        currently_liked = state['liked_by_user'] if pending is None else pending
+        if currently_liked == liked:
+            error = "You have already liked this post" if liked else "You have not liked this post"
+            return {"success": False, "error": error}
         
-        if success:
-            # Get updated stats
-            post_with_stats = self.post_repository.get_with_stats(post_id, user_id)
-            return {
-                "success": True,
-                "message": "Post unliked successfully",
-                "like_count": post_with_stats['like_count'],
-                "comment_count": post_with_stats['comment_count'],
-                "liked_by_user": post_with_stats['liked_by_user']
-            }
-        return {"success": False, "error": "Failed to unlike post"}
+        like_write_buffer.enqueue(post_id, user_id, liked)
+        return {
+            "success": True,
+            "message": "Post liked successfully" if liked else "Post unliked successfully",
+            # Committed count plus queued changes; exact once the buffer is flushed
+            "like_count": max(state['like_count'] + like_write_buffer.pending_delta(post_id), 0),
+            "comment_count": state['comment_count'],
+            "liked_by_user": liked
+        }
 
     def get_like_count(self, post_id: int) -> Dict[str, Any]:
         """Get like count for a post"""
@@ -277,24 +355,7 @@ class PostService:
         }
 
     def can_view_post(self, post: Post, current_user_id: int) -> bool:
-        """Check if current user can view a post based on privacy settings"""
-        # User can always view their own posts
+        """Check if current user can view a post based on privacy settings (one query)"""
         if post.user_id == current_user_id:
             return True
-        
-        # Get post author
-        post_author = self.user_repository.get_by_id(post.user_id)
-        if not post_author:
-            return False
-        
-        # If author is public, everyone can view
-        if not post_author.is_private:
-            return True
-        
-        # If author is private, check if current user is an accepted follower
-        return self._is_accepted_follower(current_user_id, post.user_id)
-
-    def _is_accepted_follower(self, follower_id: int, following_id: int) -> bool:
-        """Helper method to check if user is an accepted follower"""
-        follow = self.follow_repository.get_by_ids(follower_id, following_id)
-        return follow is not None and follow.status_id == 2
+        return self.post_repository.can_view_author(post.user_id, current_user_id)
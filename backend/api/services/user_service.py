@@ -1,6 +1,7 @@
 from api.repositories.user_repository import UserRepository
 from api.repositories.follow_repository import FollowRepository
 from api.entities.entities import User
+from api.utils.search import SEARCH_MODES
 from werkzeug.security import generate_password_hash, check_password_hash
 from typing import Optional, Dict, Any, List
 
@@ -115,9 +116,12 @@ class UserService:
             return {"success": True, "message": "Account deleted successfully"}
         return {"success": False, "error": "Failed to delete account"}
 
-    def search_users(self, query: str, limit: int = 20, only_following_for_user_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Search users by username"""
-        users = self.user_repository.search(query, limit, only_following_for_user_id)
+    def search_users(self, query: str, limit: int = 20, only_following_for_user_id: Optional[int] = None,
+                     mode: str = "contains") -> List[Dict[str, Any]]:
+        """Search users by username ("contains" ranks by similarity, "prefix" is for autocomplete)"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Mode must be one of: {', '.join(SEARCH_MODES)}")
+        users = self.user_repository.search(query, limit, only_following_for_user_id, mode)
         return [user.to_dict() for user in users]
 
     def get_all_users(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
@@ -0,0 +1,126 @@
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+class RecommendationBatch(NamedTuple):
+    """Top-N recommendations for a chunk of users, one array element per recommendation"""
+    user_id: np.ndarray
+    rank: np.ndarray
+    suggested_user_id: np.ndarray
+    mutual_count: np.ndarray
+    post_count: np.ndarray
+    follower_count: np.ndarray
+    # Score in tenths so it stays an exact integer: mutual * 100 + posts * 5 + followers
+    score_tenths: np.ndarray
+
+
+class FollowGraph:
+    """Accepted follows as a CSR adjacency matrix (row = follower, column = followed user).
+
+    Friend-of-friend mutual counts are the entries of A·A restricted to cells that are
+    neither the diagonal nor already set in A, i.e. the same candidates and scoring as
+    the get_friend_of_friend_recommendations SQL function.
+    """
+
+    def __init__(self, user_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray, post_counts: np.ndarray):
+        self.user_ids = user_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.post_counts = post_counts
+        self.out_degree = np.diff(indptr)
+        self.follower_counts = np.bincount(indices, minlength=len(user_ids))
+
+    @classmethod
+    def from_edges(cls, follower_ids: Sequence[int], following_ids: Sequence[int],
+                   post_user_ids: Sequence[int] = (), post_counts: Sequence[int] = ()) -> 'FollowGraph':
+        """Build the graph from accepted follow edges and per-user post counts (users without posts may be omitted)"""
+        follower_ids = np.asarray(follower_ids, dtype=np.int64)
+        following_ids = np.asarray(following_ids, dtype=np.int64)
+
+        # Dense node numbering over every user that appears in an edge
+        user_ids, inverse = np.unique(np.concatenate([follower_ids, following_ids]), return_inverse=True)
+        rows = inverse[:len(follower_ids)]
+        cols = inverse[len(follower_ids):]
+
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(user_ids)), out=indptr[1:])
+        indices = cols[order]
+
+        node_posts = np.zeros(len(user_ids), dtype=np.int64)
+        post_user_ids = np.asarray(post_user_ids, dtype=np.int64)
+        if len(post_user_ids) and len(user_ids):
+            positions = np.searchsorted(user_ids, post_user_ids)
+            positions = np.minimum(positions, len(user_ids) - 1)
+            known = user_ids[positions] == post_user_ids
+            node_posts[positions[known]] = np.asarray(post_counts, dtype=np.int64)[known]
+
+        return cls(user_ids, indptr, indices, node_posts)
+
+    def recommend(self, user_ids: Optional[Sequence[int]] = None, top_n: int = 50,
+                  chunk_size: int = 1000) -> Iterator[RecommendationBatch]:
+        """Yield top_n recommendations per user for user_ids (all users when None), chunk_size users at a time"""
+        if user_ids is None:
+            nodes = np.arange(len(self.user_ids), dtype=np.int64)
+        else:
+            requested = np.unique(np.asarray(user_ids, dtype=np.int64))
+            positions = np.minimum(np.searchsorted(self.user_ids, requested), max(len(self.user_ids) - 1, 0))
+            nodes = positions[self.user_ids[positions] == requested] if len(self.user_ids) else positions[:0]
+
+        for start in range(0, len(nodes), chunk_size):
+            batch = self._recommend_nodes(nodes[start:start + chunk_size], top_n)
+            if len(batch.user_id):
+                yield batch
+
+    def _recommend_nodes(self, nodes: np.ndarray, top_n: int) -> RecommendationBatch:
+        """Sparse A·A for the given rows followed by exclusion, scoring and per-row top-N selection"""
+        n = len(self.user_ids)
+
+        # First hop: (owner, friend) for every follow of the chunk's users
+        degree = self.out_degree[nodes]
+        owners = np.repeat(nodes, degree)
+        friends = self.indices[_expand_ranges(self.indptr[nodes], degree)]
+
+        # Second hop: (owner, friend of friend) through every friend
+        friend_degree = self.out_degree[friends]
+        fof_owners = np.repeat(owners, friend_degree)
+        fof = self.indices[_expand_ranges(self.indptr[friends], friend_degree)]
+
+        # Each (owner, candidate) pair appears once per distinct mutual friend
+        keys = fof_owners * n + fof
+        keys = keys[(fof != fof_owners) & ~np.isin(keys, owners * n + friends)]
+        keys, mutual = np.unique(keys, return_counts=True)
+        owner_nodes = keys // n
+        candidates = keys % n
+
+        post_count = self.post_counts[candidates]
+        follower_count = self.follower_counts[candidates]
+        score_tenths = mutual * 100 + post_count * 5 + follower_count
+
+        # Per owner: score DESC, mutual DESC, then user id for a deterministic order
+        order = np.lexsort((self.user_ids[candidates], -mutual, -score_tenths, owner_nodes))
+        owner_nodes = owner_nodes[order]
+        group_start = np.r_[0, np.flatnonzero(np.diff(owner_nodes)) + 1]
+        rank = np.arange(len(order)) - np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+        top = rank < top_n
+        keep = order[top]
+
+        return RecommendationBatch(
+            user_id=self.user_ids[owner_nodes[top]],
+            rank=rank[top] + 1,
+            suggested_user_id=self.user_ids[candidates[keep]],
+            mutual_count=mutual[keep],
+            post_count=post_count[keep],
+            follower_count=follower_count[keep],
+            score_tenths=score_tenths[keep]
+        )
+
+
+def _expand_ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenate arange(start, start + length) for every (start, length) pair without a Python loop"""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(total, dtype=np.int64) - np.repeat(offsets - starts, lengths)
@@ -0,0 +1,26 @@
+from datetime import timedelta
+from typing import List, Optional
+
+# Supported trending windows (query parameter value -> lookback)
+TRENDING_WINDOWS = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+
+MAX_TAG_LENGTH = 100
+
+
+def extract_hashtags(content: Optional[str]) -> List[str]:
+    """Extract unique, lowercased hashtags from post content (in order of appearance)"""
+    if not content:
+        return []
+
+    tags = []
+    for word in content.split():
+        if word.startswith('#') and len(word) > 1:
+            tag = "".join(c for c in word[1:].lower() if c.isalnum() or c == '_')
+            tag = tag[:MAX_TAG_LENGTH]
+            if tag and tag not in tags:
+                tags.append(tag)
+    return tags
@@ -0,0 +1,100 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Optional, Tuple, Union, Dict, Any, Sequence
+
+# A decoded keyset cursor: (created_at, id) of the last row on the previous page
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: Union[datetime, str], row_id: int) -> str:
+    """Encode the (created_at, id) sort key of a row as an opaque cursor string"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = f"{created_at}|{int(row_id)}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_params(cursor: Optional[Cursor], offset: int = 0) -> Dict[str, Any]:
+    """Query parameters for keyset pagination (offset is ignored when a cursor is given)"""
+    created_at, row_id = cursor if cursor else (None, None)
+    return {
+        "cursor_created_at": created_at,
+        "cursor_id": row_id,
+        "offset": 0 if cursor else offset
+    }
+
+
+def next_cursor(items: Sequence[Dict[str, Any]], limit: int,
+                created_key: str = "created_at", id_key: str = "id") -> Optional[str]:
+    """Build the cursor for the page after `items`, or None if this was the last page"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last[created_key], last[id_key])
+
+
+# A decoded ranked cursor: (rank, created_at, id) of the last row on the previous page
+RankedCursor = Tuple[float, datetime, int]
+
+
+def encode_ranked_cursor(rank: float, created_at: Union[datetime, str], row_id: int) -> str:
+    """Encode the (rank, created_at, id) sort key of a ranked search result"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = f"{float(rank)!r}|{created_at}|{int(row_id)}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_ranked_cursor(cursor: Optional[str]) -> Optional[RankedCursor]:
+    """Decode a cursor produced by encode_ranked_cursor. Raises ValueError if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        rank, created_at, row_id = raw.split("|", 2)
+        return float(rank), datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+
+# A decoded message sync token: (change_seq, message_id, issued_at). Changes with a greater
+# (change_seq, message_id) are still to be sent; issued_at tells whether deletions since then
+# have already been pruned.
+SyncToken = Tuple[int, int, datetime]
+
+
+def encode_sync_token(change_seq: int, message_id: int, issued_at: datetime) -> str:
+    """Encode a message sync position as an opaque token string"""
+    raw = f"{int(change_seq)}|{int(message_id)}|{issued_at.isoformat()}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: Optional[str]) -> Optional[SyncToken]:
+    """Decode a token produced by encode_sync_token. Raises ValueError if it is malformed."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        change_seq, message_id, issued_at = raw.split("|", 2)
+        change_seq, message_id, issued_at = int(change_seq), int(message_id), datetime.fromisoformat(issued_at)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid sync token")
+    if issued_at.tzinfo is None:
+        issued_at = issued_at.replace(tzinfo=timezone.utc)
+    return change_seq, message_id, issued_at
@@ -0,0 +1,15 @@
+from typing import Tuple
+
+# Search modes accepted by the user/community search endpoints
+SEARCH_MODES = ("contains", "prefix")
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE/ILIKE wildcards so user input is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_patterns(term: str) -> Tuple[str, str]:
+    """Build the (contains, prefix) LIKE patterns for a search term"""
+    escaped = escape_like(term.strip())
+    return f"%{escaped}%", f"{escaped.lower()}%"
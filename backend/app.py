@@ -1,8 +1,13 @@
+import os
 from flask import Flask
 from flask_cors import CORS
 from api import create_app
+from api.scheduler import init_scheduler
 
 app = create_app()
 
 if __name__ == '__main__':
+    # The debug reloader runs this file twice; only start background jobs in the serving process
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        init_scheduler(app)
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,37 @@
+import os
+import sys
+from datetime import date
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.config import Config
+from api.repositories.message_repository import MessageRepository
+
+
+def archive_messages(keep_months: int = Config.MESSAGE_RETENTION_MONTHS, drop: bool = False):
+    today = date.today()
+    # First day of the oldest month to keep
+    months = today.year * 12 + today.month - 1 - keep_months
+    cutoff = date(months // 12, months % 12 + 1, 1)
+    action = "Dropping" if drop else "Detaching"
+    print(f"{action} message partitions older than {cutoff.isoformat()}...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            archived = MessageRepository().archive_partitions(cutoff, drop)
+            for name in archived:
+                print(f"  {name}")
+            print(f"Message archival complete ({len(archived)} partitions)")
+        except Exception as e:
+            print(f"Error archiving messages: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    keep = next((int(arg.split("=", 1)[1]) for arg in args if arg.startswith("--keep-months=")),
+                Config.MESSAGE_RETENTION_MONTHS)
+    archive_messages(keep, drop="--drop" in args)
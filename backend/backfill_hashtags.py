@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.repositories.post_repository import PostRepository
+
+
+def backfill_hashtags():
+    print("Rebuilding hashtag index from post content...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            indexed = PostRepository().reindex_hashtags()
+            print(f"Hashtag index rebuilt ({indexed} entries)")
+        except Exception as e:
+            print(f"Error rebuilding hashtag index: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    backfill_hashtags()
@@ -0,0 +1,121 @@
+"""
+Benchmark: friend recommendations on a synthetic follow graph (default 100k users).
+
+Inserts synthetic users, accepted follows and posts inside a transaction that is
+rolled back at the end, then times:
+  - function: SELECT * FROM get_friend_of_friend_recommendations(uid), per user (sampled)
+  - sql:      the batch job's set-based query for one batch of users (sampled)
+  - numpy:    loading the CSR follow graph and computing every user's top-N in memory
+
+Per-user timings are extrapolated to the whole graph. The numpy results of the
+sampled users are checked against the SQL function.
+
+Usage (from the backend directory, against a running database):
+    python benchmarks/friend_recommendations.py [--users 100000] [--follows 20] [--sample 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+from api import create_app
+from api.extensions import db
+from api.repositories.friend_recommendation_repository import COMPUTE_RECOMMENDATIONS_SQL, FriendRecommendationRepository
+
+TOP_N = 50
+
+
+def build_graph(users: int, follows: int):
+    print(f"Generating {users:,} synthetic users with ~{follows} follows each...")
+    # The dirty-tracking trigger is irrelevant here and would dominate the load time
+    db.session.execute(text("ALTER TABLE Follows DISABLE TRIGGER mark_friend_recommendations_dirty_trigger"))
+    user_ids = sorted(row.user_id for row in db.session.execute(text("""
+        INSERT INTO Users (username, email, password_hash)
+        SELECT 'bench_' || i, 'bench_' || i || '@bench.example.com', 'x'
+        FROM generate_series(1, :users) AS i
+        RETURNING user_id
+    """), {"users": users}).fetchall())
+    first_id = user_ids[0]
+    # Skewed graph: a few popular accounts attract most follows
+    db.session.execute(text("""
+        INSERT INTO Follows (follower_id, following_id, status_id)
+        SELECT DISTINCT ON (follower_id, following_id) follower_id, following_id,
+            (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
+        FROM (
+            SELECT
+                :first_id + i AS follower_id,
+                :first_id + FLOOR(POWER(random(), 2) * :users)::INT AS following_id
+            FROM generate_series(0, :users - 1) AS i, generate_series(1, :follows)
+        ) edges
+        WHERE follower_id != following_id
+    """), {"first_id": first_id, "users": users, "follows": follows})
+    db.session.execute(text("""
+        INSERT INTO Posts (user_id, content)
+        SELECT :first_id + FLOOR(random() * :users)::INT, 'Benchmark post'
+        FROM generate_series(1, :users * 2)
+    """), {"first_id": first_id, "users": users})
+    db.session.execute(text("ANALYZE Users"))
+    db.session.execute(text("ANALYZE Follows"))
+    db.session.execute(text("ANALYZE Posts"))
+    return user_ids
+
+
+def run_benchmark(users: int, follows: int, sample: int):
+    app = create_app()
+    with app.app_context():
+        user_ids = build_graph(users, follows)
+        sampled = random.Random(42).sample(user_ids, min(sample, len(user_ids)))
+
+        start = time.perf_counter()
+        expected = {}
+        for user_id in sampled:
+            rows = db.session.execute(
+                text("SELECT * FROM get_friend_of_friend_recommendations(:uid)"), {"uid": user_id}
+            ).fetchall()
+            expected[user_id] = {(r.recommended_user, r.mutual_friends, int(r.connection_strength * 10)) for r in rows}
+        function_seconds = (time.perf_counter() - start) / len(sampled) * users
+
+        start = time.perf_counter()
+        db.session.execute(text(COMPUTE_RECOMMENDATIONS_SQL), {"user_ids": sampled, "top_n": TOP_N})
+        sql_seconds = (time.perf_counter() - start) / len(sampled) * users
+
+        start = time.perf_counter()
+        graph = FriendRecommendationRepository().load_follow_graph()
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = {}
+        for batch in graph.recommend(top_n=TOP_N):
+            for i in range(len(batch.user_id)):
+                if batch.user_id[i] in expected:
+                    actual.setdefault(int(batch.user_id[i]), set()).add(
+                        (int(batch.suggested_user_id[i]), int(batch.mutual_count[i]), int(batch.score_tenths[i]))
+                    )
+        numpy_seconds = time.perf_counter() - start
+
+        # The SQL function breaks ties arbitrarily, so only compare users whose top 50 is unambiguous
+        mismatches = [
+            user_id for user_id in sampled
+            if len(expected[user_id]) < TOP_N and actual.get(user_id, set()) != expected[user_id]
+        ]
+
+        print(f"\n{'engine':<10} {'all users (s)':>15}")
+        print(f"{'function':<10} {function_seconds:>15.1f}  (extrapolated from {len(sampled)} users)")
+        print(f"{'sql':<10} {sql_seconds:>15.1f}  (extrapolated from {len(sampled)} users)")
+        print(f"{'numpy':<10} {load_seconds + numpy_seconds:>15.1f}  (load {load_seconds:.1f}s + compute {numpy_seconds:.1f}s)")
+        print(f"\nnumpy vs function mismatches: {len(mismatches)}")
+
+        db.session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark friend recommendation engines")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--follows", type=int, default=20)
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.users, args.follows, args.sample)
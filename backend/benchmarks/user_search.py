@@ -0,0 +1,109 @@
+"""
+Benchmark: user search latency at scale (default 1M users).
+
+Builds a temporary copy of the Users search columns filled with synthetic
+rows, creates the same search indexes as init.sql and times:
+  - legacy:   ILIKE '%term%' with index scans disabled (the old sequential scan)
+  - contains: ILIKE + similarity ranking served by the trigram GIN indexes
+  - prefix:   LOWER(username) LIKE 'term%' served by the text_pattern_ops index
+
+Usage (from the backend directory, against a running database):
+    python benchmarks/user_search.py [--users 1000000] [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from sqlalchemy import text
+from api import create_app
+from api.extensions import db
+
+TERMS = ["ali", "mehmet", "dev", "zeynep42", "xq"]
+
+QUERIES = {
+    "legacy": """
+        SELECT user_id, username FROM bench_users
+        WHERE username ILIKE :search OR bio ILIKE :search
+        ORDER BY username ASC
+        LIMIT 20
+    """,
+    "contains": """
+        SELECT user_id, username,
+            GREATEST(similarity(username, :term), word_similarity(:term, COALESCE(bio, ''))) AS score
+        FROM bench_users
+        WHERE username ILIKE :search OR bio ILIKE :search OR username % :term
+        ORDER BY score DESC, username ASC
+        LIMIT 20
+    """,
+    "prefix": """
+        SELECT user_id, username FROM bench_users
+        WHERE LOWER(username) LIKE :prefix
+        ORDER BY LOWER(username) ASC
+        LIMIT 20
+    """,
+}
+
+
+def build_table(conn, users: int):
+    print(f"Generating {users:,} synthetic users...")
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text("""
+        CREATE TEMP TABLE bench_users AS
+        SELECT
+            i AS user_id,
+            (ARRAY['ali', 'ayse', 'mehmet', 'zeynep', 'can', 'elif', 'dev', 'emre'])[1 + i % 8]
+                || '_' || substr(md5(i::text), 1, 8) || i AS username,
+            'I like ' || (ARRAY['music', 'coding', 'travel', 'football', 'coffee', 'books'])[1 + i % 6]
+                || ' and ' || substr(md5((i * 7)::text), 1, 6) AS bio
+        FROM generate_series(1, :users) AS i
+    """), {"users": users})
+    print("Creating indexes...")
+    conn.execute(text("CREATE INDEX ON bench_users USING GIN (username gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX ON bench_users USING GIN (bio gin_trgm_ops)"))
+    conn.execute(text("CREATE INDEX ON bench_users (LOWER(username) text_pattern_ops)"))
+    conn.execute(text("ANALYZE bench_users"))
+
+
+def time_query(conn, sql: str, runs: int) -> list:
+    timings = []
+    for term in TERMS:
+        params = {"term": term, "search": f"%{term}%", "prefix": f"{term}%"}
+        for _ in range(runs):
+            start = time.perf_counter()
+            conn.execute(text(sql), params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_benchmark(users: int, runs: int):
+    app = create_app()
+    with app.app_context():
+        with db.engine.connect() as conn:
+            build_table(conn, users)
+
+            print(f"\n{'mode':<10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+            for mode, sql in QUERIES.items():
+                if mode == "legacy":
+                    conn.execute(text("SET enable_bitmapscan = off"))
+                    conn.execute(text("SET enable_indexscan = off"))
+                timings = sorted(time_query(conn, sql, runs))
+                conn.execute(text("RESET enable_bitmapscan"))
+                conn.execute(text("RESET enable_indexscan"))
+
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                print(f"{mode:<10} {statistics.median(timings):>10.2f} {p95:>10.2f} {timings[-1]:>10.2f}")
+
+            conn.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark user search at scale")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    run_benchmark(args.users, args.runs)
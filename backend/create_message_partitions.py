@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.config import Config
+from api.repositories.message_repository import MessageRepository
+
+
+def create_message_partitions(months_ahead: int = Config.MESSAGE_PARTITIONS_AHEAD):
+    print(f"Creating monthly message partitions up to {months_ahead} months ahead...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            created = MessageRepository().create_partitions(months_ahead)
+            print(f"Message partitions ready ({created} created)")
+        except Exception as e:
+            print(f"Error creating message partitions: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    ahead = next((int(arg.split("=", 1)[1]) for arg in args if arg.startswith("--ahead=")),
+                 Config.MESSAGE_PARTITIONS_AHEAD)
+    create_message_partitions(ahead)
@@ -6,7 +6,20 @@
 DROP VIEW IF EXISTS advanced_friend_recommendations CASCADE;
 DROP VIEW IF EXISTS community_statistics_view CASCADE;
 DROP VIEW IF EXISTS active_users_view CASCADE;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'popular_posts_view') THEN
+        DROP MATERIALIZED VIEW popular_posts_view CASCADE;
+    END IF;
+END $$;
 DROP VIEW IF EXISTS popular_posts_view CASCADE;
+DROP TABLE IF EXISTS MaterializedViewRefreshes CASCADE;
+DROP TABLE IF EXISTS FriendRecommendationsDirty CASCADE;
+DROP TABLE IF EXISTS FriendRecommendations CASCADE;
+DROP TABLE IF EXISTS HomeTimeline CASCADE;
+DROP TABLE IF EXISTS PostHashtags CASCADE;
+DROP TABLE IF EXISTS MessageTombstones CASCADE;
+DROP TABLE IF EXISTS Conversations CASCADE;
 DROP TABLE IF EXISTS Messages CASCADE;
 DROP TABLE IF EXISTS Comments CASCADE;
 DROP TABLE IF EXISTS PostLikes CASCADE;
@@ -19,6 +32,9 @@ DROP TABLE IF EXISTS FollowStatus CASCADE;
 DROP TABLE IF EXISTS PrivacyTypes CASCADE;
 DROP TABLE IF EXISTS Roles CASCADE;
 
+-- Trigram matching for user/community search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ============================================
 -- 2. CREATE LOOKUP/REFERENCE TABLES
 -- ============================================
@@ -95,6 +111,10 @@ CREATE TABLE Posts (
     community_id INT REFERENCES Communities(community_id) ON DELETE CASCADE ON UPDATE CASCADE,
     content TEXT,
     media_url TEXT,
+    like_count INT NOT NULL DEFAULT 0,
+    comment_count INT NOT NULL DEFAULT 0,
+    hot_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(content, ''))) STORED,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT chk_posts_content_or_media CHECK ((content IS NOT NULL AND content != '') OR (media_url IS NOT NULL AND media_url != ''))
@@ -118,17 +138,101 @@ CREATE TABLE PostLikes (
     PRIMARY KEY (post_id, user_id)
 );
 
+-- Precomputed home feed (fan-out-on-write)
+-- Used by: GET /api/posts/feed
+CREATE TABLE HomeTimeline (
+    user_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    post_id INT REFERENCES Posts(post_id) ON DELETE CASCADE,
+    author_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, post_id)
+);
+
+-- Hashtags extracted from post content on create/update
+-- Used by: GET /api/posts/trending
+CREATE TABLE PostHashtags (
+    post_id INT REFERENCES Posts(post_id) ON DELETE CASCADE,
+    tag VARCHAR(100) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (post_id, tag)
+);
+
+-- Last successful refresh of each materialized view
+-- Used by: freshness timestamps in popular posts responses
+CREATE TABLE MaterializedViewRefreshes (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMPTZ NOT NULL
+);
+
+-- Precomputed top-N friend-of-friend recommendations per user (rebuilt by a batch job)
+-- Used by: GET /api/features/users/advanced-recommendations, GET /api/auth/users/recommendations
+CREATE TABLE FriendRecommendations (
+    user_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    rank SMALLINT NOT NULL,
+    suggested_user_id INT NOT NULL REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    mutual_count INT NOT NULL,
+    post_count INT NOT NULL,
+    follower_count INT NOT NULL,
+    score NUMERIC(12, 1) NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, rank)
+);
+
+-- Users whose follow set changed since their recommendations were computed
+-- (no foreign key: rows are written by the Follows trigger, also while a user is being deleted)
+CREATE TABLE FriendRecommendationsDirty (
+    user_id INT PRIMARY KEY,
+    marked_at TIMESTAMPTZ NOT NULL
+);
+
+-- Range partitioned by month on created_at (messages_pYYYY_MM, see create_message_partitions);
+-- rows outside every monthly partition land in Messages_default
 CREATE TABLE Messages (
-    message_id SERIAL PRIMARY KEY,
+    message_id SERIAL,
     sender_id INT REFERENCES Users(user_id) ON DELETE SET NULL ON UPDATE CASCADE,
     receiver_id INT REFERENCES Users(user_id) ON DELETE SET NULL ON UPDATE CASCADE,
     content TEXT,
     media_url TEXT,
-    is_read BOOLEAN DEFAULT FALSE,
     sender_deleted BOOLEAN DEFAULT FALSE,
     receiver_deleted BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Id of the inserting transaction, for GET /api/messages/sync
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    PRIMARY KEY (message_id, created_at),
     CONSTRAINT chk_messages_different_users CHECK (sender_id != receiver_id)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE Messages_default PARTITION OF Messages DEFAULT;
+
+-- One row per pair of users who have exchanged messages (user_a < user_b), maintained by triggers on Messages
+-- Each side has a read watermark: the (created_at, message_id) of the last message it has read;
+-- everything it received up to there is read, anything after is unread
+-- Used by: GET /api/messages/conversations, PUT /api/messages/<id>/read
+CREATE TABLE Conversations (
+    user_a INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    user_b INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    last_message_id INT,
+    last_message_at TIMESTAMPTZ,
+    unread_for_a INT NOT NULL DEFAULT 0,
+    unread_for_b INT NOT NULL DEFAULT 0,
+    last_read_message_id_a INT,
+    last_read_at_a TIMESTAMPTZ,
+    last_read_message_id_b INT,
+    last_read_at_b TIMESTAMPTZ,
+    -- Id of the last transaction that changed the row (set by trigger), for GET /api/messages/sync
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    PRIMARY KEY (user_a, user_b),
+    CONSTRAINT chk_conversations_ordered_users CHECK (user_a < user_b)
+);
+
+-- One row per deleted message, so syncing clients learn about deletions (kept MESSAGE_SYNC_RETENTION_DAYS)
+-- Used by: GET /api/messages/sync
+CREATE TABLE MessageTombstones (
+    message_id INT NOT NULL,
+    sender_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    receiver_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
 -- ============================================
@@ -165,6 +269,158 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Hot Score Function
+-- Time-decayed ranking (Hacker News style): engagement / (age_hours + 2) ^ 1.8
+-- Used by: post counter triggers, periodic hot score recomputation, GET /api/posts/discover
+CREATE OR REPLACE FUNCTION compute_hot_score(likes INT, comments INT, posted_at TIMESTAMPTZ)
+RETURNS DOUBLE PRECISION AS $$
+BEGIN
+    RETURN (likes + comments * 2)::DOUBLE PRECISION
+        / POWER(GREATEST(EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - posted_at)) / 3600.0, 0) + 2, 1.8);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Post Counter Update Trigger Functions
+-- Keep Posts.like_count / Posts.comment_count in sync with PostLikes and Comments
+-- Used by: user deletion (cascaded likes), POST/DELETE comments
+-- Likes and unlikes update like_count in the same statement (PostRepository.add_like/remove_like);
+-- this only covers likes removed by cascades, e.g. when the liking user is deleted
+CREATE OR REPLACE FUNCTION update_post_like_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE Posts
+    SET like_count = GREATEST(like_count - 1, 0),
+        hot_score = compute_hot_score(GREATEST(like_count - 1, 0), comment_count, created_at)
+    WHERE post_id = OLD.post_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        UPDATE Posts
+        SET comment_count = comment_count + 1,
+            hot_score = compute_hot_score(like_count, comment_count + 1, created_at)
+        WHERE post_id = NEW.post_id;
+        RETURN NEW;
+    ELSIF (TG_OP = 'DELETE') THEN
+        UPDATE Posts
+        SET comment_count = GREATEST(comment_count - 1, 0),
+            hot_score = compute_hot_score(like_count, GREATEST(comment_count - 1, 0), created_at)
+        WHERE post_id = OLD.post_id;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Friend Recommendations Dirty Tracking Function
+-- Used by: POST/DELETE /api/users/<id>/follow, POST /api/me/follow-requests/<id>/accept
+CREATE OR REPLACE FUNCTION mark_friend_recommendations_dirty()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_user_id INT;
+BEGIN
+    IF (TG_OP = 'DELETE') THEN
+        changed_user_id := OLD.follower_id;
+    ELSE
+        changed_user_id := NEW.follower_id;
+    END IF;
+
+    INSERT INTO FriendRecommendationsDirty (user_id, marked_at)
+    VALUES (changed_user_id, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Conversation Summary Trigger Functions
+-- Keep Conversations (last message + unread counts per side) in sync with Messages
+-- Statement-level: each function handles every row of one INSERT/DELETE at once
+-- Reads move the watermarks on Conversations directly (MessageRepository), so Messages rows never change on read
+-- Used by: POST /api/messages, DELETE /api/messages/<id>
+CREATE OR REPLACE FUNCTION conversations_after_message_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO Conversations AS c (user_a, user_b, last_message_id, last_message_at, unread_for_a, unread_for_b)
+    SELECT
+        LEAST(sender_id, receiver_id),
+        GREATEST(sender_id, receiver_id),
+        (ARRAY_AGG(message_id ORDER BY created_at DESC, message_id DESC))[1],
+        MAX(created_at),
+        COUNT(*) FILTER (WHERE receiver_id < sender_id),
+        COUNT(*) FILTER (WHERE receiver_id > sender_id)
+    FROM new_messages
+    WHERE sender_id IS NOT NULL AND receiver_id IS NOT NULL
+    GROUP BY LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id)
+    ON CONFLICT (user_a, user_b) DO UPDATE SET
+        last_message_id = CASE
+            WHEN c.last_message_id IS NULL
+              OR (EXCLUDED.last_message_at, EXCLUDED.last_message_id) > (c.last_message_at, c.last_message_id)
+            THEN EXCLUDED.last_message_id ELSE c.last_message_id END,
+        last_message_at = CASE
+            WHEN c.last_message_id IS NULL
+              OR (EXCLUDED.last_message_at, EXCLUDED.last_message_id) > (c.last_message_at, c.last_message_id)
+            THEN EXCLUDED.last_message_at ELSE c.last_message_at END,
+        unread_for_a = c.unread_for_a + EXCLUDED.unread_for_a,
+        unread_for_b = c.unread_for_b + EXCLUDED.unread_for_b;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION conversations_after_message_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Deleted messages past the receiver's watermark were unread
+    UPDATE Conversations c
+    SET unread_for_a = GREATEST(c.unread_for_a - d.unread_a, 0),
+        unread_for_b = GREATEST(c.unread_for_b - d.unread_b, 0)
+    FROM (
+        SELECT
+            c2.user_a,
+            c2.user_b,
+            COUNT(*) FILTER (WHERE o.receiver_id = c2.user_a AND (c2.last_read_message_id_a IS NULL
+                OR (o.created_at, o.message_id) > (c2.last_read_at_a, c2.last_read_message_id_a))) AS unread_a,
+            COUNT(*) FILTER (WHERE o.receiver_id = c2.user_b AND (c2.last_read_message_id_b IS NULL
+                OR (o.created_at, o.message_id) > (c2.last_read_at_b, c2.last_read_message_id_b))) AS unread_b
+        FROM old_messages o
+        JOIN Conversations c2
+          ON c2.user_a = LEAST(o.sender_id, o.receiver_id) AND c2.user_b = GREATEST(o.sender_id, o.receiver_id)
+        GROUP BY c2.user_a, c2.user_b
+    ) d
+    WHERE c.user_a = d.user_a AND c.user_b = d.user_b;
+
+    -- Conversations whose last message was deleted point at the newest remaining one ...
+    -- (found by primary key from the deleted messages' pairs, never by scanning Conversations)
+    UPDATE Conversations c
+    SET (last_message_id, last_message_at) = (
+        SELECT m.message_id, m.created_at
+        FROM Messages m
+        WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+          AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+        ORDER BY m.created_at DESC, m.message_id DESC
+        LIMIT 1
+    )
+    FROM old_messages o
+    WHERE c.user_a = LEAST(o.sender_id, o.receiver_id)
+      AND c.user_b = GREATEST(o.sender_id, o.receiver_id)
+      AND c.last_message_id = o.message_id
+      AND c.last_message_at = o.created_at;
+
+    -- ... or disappear when none is left
+    DELETE FROM Conversations c
+    USING (
+        SELECT DISTINCT LEAST(sender_id, receiver_id) AS user_a, GREATEST(sender_id, receiver_id) AS user_b
+        FROM old_messages
+    ) o
+    WHERE c.user_a = o.user_a AND c.user_b = o.user_b
+      AND c.last_message_id IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Function: Get friend-of-friend recommendations
 -- Used by: GET /api/features/users/advanced-recommendations (Alternative)
 CREATE OR REPLACE FUNCTION get_friend_of_friend_recommendations(target_user_id INTEGER)
@@ -217,13 +473,14 @@ BEGIN
         FROM mutual_counts mc
         INNER JOIN Users u ON u.user_id = mc.potential_friend
     )
+    -- Qualified columns: the RETURNS TABLE names (username, ...) are variables in this scope
     SELECT 
-        potential_friend,
-        username,
-        mutual_count,
-        ROUND(strength, 2) AS connection_strength
-    FROM scored_recommendations
-    ORDER BY strength DESC, mutual_count DESC
+        sr.potential_friend,
+        sr.username,
+        CAST(sr.mutual_count AS INTEGER),
+        ROUND(sr.strength, 2) AS connection_strength
+    FROM scored_recommendations sr
+    ORDER BY sr.strength DESC, sr.mutual_count DESC
     LIMIT 50;
 END;
 $$ LANGUAGE plpgsql;
@@ -249,18 +506,84 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Monthly Messages Partitions
+-- Create the partitions for the months_back months before the current one, the current month and
+-- the months_ahead months after it; existing partitions are skipped. Rows of a new month that
+-- already landed in Messages_default are moved into its partition before it is attached.
+-- Used by: init.sql, the create_message_partitions scheduler job, migrate.py partition_messages
+CREATE OR REPLACE FUNCTION create_message_partitions(months_ahead INT, months_back INT DEFAULT 0)
+RETURNS INT AS $$
+DECLARE
+    month_start TIMESTAMPTZ;
+    month_end TIMESTAMPTZ;
+    partition_name TEXT;
+    created INT := 0;
+BEGIN
+    FOR i IN -months_back..months_ahead LOOP
+        month_start := date_trunc('month', CURRENT_TIMESTAMP) + make_interval(months => i);
+        month_end := month_start + INTERVAL '1 month';
+        partition_name := 'messages_p' || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format('CREATE TABLE %I (LIKE Messages INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM Messages_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+             INSERT INTO %I SELECT * FROM moved',
+            month_start, month_end, partition_name
+        );
+        EXECUTE format(
+            'ALTER TABLE Messages ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, month_end
+        );
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Message Sync Trigger Functions
+-- Every change a syncing client must replay carries change_seq: the id of the transaction that
+-- made it (pg_current_xact_id()), which only grows
+-- Used by: GET /api/messages/sync, DELETE /api/messages/<id>
+CREATE OR REPLACE FUNCTION conversations_touch_change_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.change_seq := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION messages_after_delete_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO MessageTombstones (message_id, sender_id, receiver_id)
+    SELECT message_id, sender_id, receiver_id
+    FROM old_messages
+    WHERE sender_id IS NOT NULL OR receiver_id IS NOT NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================
 -- 7. TRIGGERS
 -- ============================================
 
 -- Updated At Triggers
 CREATE TRIGGER update_users_modtime BEFORE UPDATE ON Users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-CREATE TRIGGER update_posts_modtime BEFORE UPDATE ON Posts FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_posts_modtime BEFORE UPDATE OF content, media_url, community_id ON Posts FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_comments_modtime BEFORE UPDATE ON Comments FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 -- Community Member Count Trigger
 CREATE TRIGGER update_member_count AFTER INSERT OR DELETE ON CommunityMembers FOR EACH ROW EXECUTE FUNCTION update_community_member_count();
 
+-- Post Counter Triggers
+-- pg_trigger_depth() > 0: only deletes issued by foreign key cascades, not by remove_like
+CREATE TRIGGER update_post_like_count_trigger AFTER DELETE ON PostLikes FOR EACH ROW WHEN (pg_trigger_depth() > 0) EXECUTE FUNCTION update_post_like_count();
+CREATE TRIGGER update_post_comment_count_trigger AFTER INSERT OR DELETE ON Comments FOR EACH ROW EXECUTE FUNCTION update_post_comment_count();
+
+-- Friend recommendation dirty tracking
+CREATE TRIGGER mark_friend_recommendations_dirty_trigger AFTER INSERT OR DELETE OR UPDATE OF status_id ON Follows FOR EACH ROW EXECUTE FUNCTION mark_friend_recommendations_dirty();
+
 -- Message Soft Delete Triggers
 -- Used by: DELETE /api/messages/<id> (Note: Requires repository to perform UPDATE instead of DELETE)
 CREATE TRIGGER messages_sender_soft_delete_trigger
@@ -275,27 +598,61 @@ FOR EACH ROW
 WHEN (NEW.receiver_id IS NULL AND OLD.receiver_id IS NOT NULL)
 EXECUTE FUNCTION messages_receiver_soft_delete();
 
+-- Conversation summary triggers
+-- Keep Conversations up to date on send and delete (one run per statement)
+
+CREATE TRIGGER conversations_after_message_insert_trigger
+    AFTER INSERT ON Messages
+    REFERENCING NEW TABLE AS new_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION conversations_after_message_insert();
+
+CREATE TRIGGER conversations_after_message_delete_trigger
+    AFTER DELETE ON Messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION conversations_after_message_delete();
+
+-- Message sync triggers
+-- Stamp conversation changes (new message, read watermark, unread count) and record deletions
+
+CREATE TRIGGER conversations_touch_change_seq_trigger
+    BEFORE INSERT OR UPDATE ON Conversations
+    FOR EACH ROW
+    EXECUTE FUNCTION conversations_touch_change_seq();
+
+CREATE TRIGGER messages_after_delete_tombstone_trigger
+    AFTER DELETE ON Messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION messages_after_delete_tombstone();
+
 -- ============================================
 -- 8. VIEWS
 -- ============================================
 
--- Popular Posts View
--- Used by: GET /api/features/posts/popular
-CREATE OR REPLACE VIEW popular_posts_view AS
+-- Popular Posts View (materialized, refreshed CONCURRENTLY by the scheduler or refresh_views.py)
+-- Used by: GET /api/features/posts/popular, GET /api/posts/discover
+CREATE MATERIALIZED VIEW popular_posts_view AS
 SELECT 
     p.post_id, p.user_id, u.username, u.profile_picture_url,
     p.content, p.media_url, p.community_id, c.name AS community_name,
     p.created_at, p.updated_at,
-    COALESCE(like_counts.like_count, 0) AS like_count,
-    COALESCE(comment_counts.comment_count, 0) AS comment_count,
-    (COALESCE(like_counts.like_count, 0) + (COALESCE(comment_counts.comment_count, 0) * 2)) AS engagement_score,
+    p.like_count,
+    p.comment_count,
+    (p.like_count + (p.comment_count * 2)) AS engagement_score,
     (p.created_at > NOW() - INTERVAL '7 days') AS is_recent
 FROM Posts p
 JOIN Users u ON p.user_id = u.user_id
 LEFT JOIN Communities c ON p.community_id = c.community_id
-LEFT JOIN (SELECT post_id, COUNT(*) AS like_count FROM PostLikes GROUP BY post_id) like_counts ON p.post_id = like_counts.post_id
-LEFT JOIN (SELECT post_id, COUNT(*) AS comment_count FROM Comments GROUP BY post_id) comment_counts ON p.post_id = comment_counts.post_id
-ORDER BY engagement_score DESC, p.created_at DESC;
+ORDER BY engagement_score DESC, p.created_at DESC
+WITH DATA;
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX idx_popular_posts_view_post_id ON popular_posts_view(post_id);
+CREATE INDEX idx_popular_posts_view_ranking ON popular_posts_view(engagement_score DESC, created_at DESC, post_id DESC);
+
+INSERT INTO MaterializedViewRefreshes (view_name, refreshed_at) VALUES ('popular_posts_view', CURRENT_TIMESTAMP);
 
 -- Active Users View
 -- Used by: GET /api/features/users/active
@@ -332,49 +689,9 @@ FROM Communities c
 JOIN Users creator ON c.creator_id = creator.user_id
 LEFT JOIN (SELECT cm.community_id, COUNT(*) AS total_members, COUNT(*) FILTER (WHERE r.role_name = 'admin') AS admin_count, COUNT(*) FILTER (WHERE r.role_name = 'moderator') AS moderator_count, COUNT(*) FILTER (WHERE r.role_name = 'member') AS regular_member_count FROM CommunityMembers cm LEFT JOIN Roles r ON cm.role_id = r.role_id GROUP BY cm.community_id) member_counts ON c.community_id = member_counts.community_id
 LEFT JOIN (SELECT community_id, COUNT(*) AS total_posts, COUNT(*) FILTER (WHERE created_at > NOW() - INTERVAL '7 days') AS posts_last_7_days FROM Posts GROUP BY community_id) post_counts ON c.community_id = post_counts.community_id
-LEFT JOIN (SELECT p.community_id, COUNT(pl.*) AS total_likes, COUNT(DISTINCT co.comment_id) AS total_comments FROM Posts p LEFT JOIN PostLikes pl ON p.post_id = pl.post_id LEFT JOIN Comments co ON p.post_id = co.post_id WHERE p.community_id IS NOT NULL GROUP BY p.community_id) engagement ON c.community_id = engagement.community_id
+LEFT JOIN (SELECT community_id, SUM(like_count) AS total_likes, SUM(comment_count) AS total_comments FROM Posts WHERE community_id IS NOT NULL GROUP BY community_id) engagement ON c.community_id = engagement.community_id
 ORDER BY total_members DESC;
 
--- View: Advanced friend recommendations
--- Used by: GET /api/features/users/advanced-recommendations
-CREATE OR REPLACE VIEW advanced_friend_recommendations AS
-WITH user_friends AS (
-    SELECT 
-        f.follower_id AS user_id,
-        f.following_id AS friend_id
-    FROM Follows f
-    WHERE f.status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')
-),
-friend_suggestions AS (
-    SELECT DISTINCT
-        uf1.user_id,
-        uf2.friend_id AS suggested_friend,
-        COUNT(DISTINCT uf1.friend_id) AS mutual_count
-    FROM user_friends uf1
-    INNER JOIN user_friends uf2 ON uf1.friend_id = uf2.user_id
-    WHERE uf2.friend_id != uf1.user_id
-      AND NOT EXISTS (
-          SELECT 1 FROM user_friends uf3
-          WHERE uf3.user_id = uf1.user_id
-            AND uf3.friend_id = uf2.friend_id
-      )
-    GROUP BY uf1.user_id, uf2.friend_id
-)
-SELECT 
-    fs.user_id,
-    u.username AS suggested_username,
-    fs.mutual_count,
-    COALESCE((SELECT COUNT(*) FROM Posts WHERE user_id = fs.suggested_friend), 0) AS post_count,
-    COALESCE((SELECT COUNT(*) FROM Follows WHERE following_id = fs.suggested_friend AND status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')), 0) AS follower_count,
-    (
-        fs.mutual_count * 10.0 +
-        COALESCE((SELECT COUNT(*) FROM Posts WHERE user_id = fs.suggested_friend), 0) * 0.5 +
-        COALESCE((SELECT COUNT(*) FROM Follows WHERE following_id = fs.suggested_friend AND status_id = (SELECT status_id FROM FollowStatus WHERE status_name = 'accepted')), 0) * 0.1
-    ) AS recommendation_score
-FROM friend_suggestions fs
-INNER JOIN Users u ON u.user_id = fs.suggested_friend
-ORDER BY fs.user_id, recommendation_score DESC;
-
 -- ============================================
 -- 9. INDEXES
 -- ============================================
@@ -394,12 +711,44 @@ CREATE INDEX IF NOT EXISTS idx_follows_follower_status ON Follows(follower_id, s
 CREATE INDEX IF NOT EXISTS idx_follows_following_status ON Follows(following_id, status_id);
 CREATE INDEX idx_messages_sender_id ON Messages(sender_id);
 CREATE INDEX idx_messages_receiver_id ON Messages(receiver_id);
-CREATE INDEX idx_messages_unread ON Messages(receiver_id) WHERE is_read = FALSE;
 CREATE INDEX IF NOT EXISTS idx_posts_user_created ON Posts(user_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_postlikes_user_id ON PostLikes(user_id);
 CREATE INDEX IF NOT EXISTS idx_comments_parent_post ON Comments(parent_comment_id, post_id);
 CREATE INDEX IF NOT EXISTS idx_follows_status ON Follows(status_id, following_id);
+CREATE INDEX IF NOT EXISTS idx_home_timeline_user_created ON HomeTimeline(user_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_post_hashtags_created_tag ON PostHashtags(created_at, tag);
+CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON Posts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_posts_hot_score ON Posts(hot_score DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_a_recent ON Conversations(user_a, last_message_at DESC, last_message_id DESC);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_b_recent ON Conversations(user_b, last_message_at DESC, last_message_id DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_pair_recent ON Messages(LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id), created_at DESC, message_id DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_receiver_change ON Messages(receiver_id, change_seq, message_id);
+CREATE INDEX IF NOT EXISTS idx_messages_sender_change ON Messages(sender_id, change_seq, message_id);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_a_change ON Conversations(user_a, change_seq);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_b_change ON Conversations(user_b, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_receiver_change ON MessageTombstones(receiver_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_sender_change ON MessageTombstones(sender_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_deleted_at ON MessageTombstones(deleted_at);
+
+-- Search indexes: trigram (substring + similarity) and lowercase prefix (autocomplete)
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON Users USING GIN (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_bio_trgm ON Users USING GIN (bio gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_username_prefix ON Users (LOWER(username) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_communities_name_trgm ON Communities USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_communities_description_trgm ON Communities USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_communities_name_prefix ON Communities (LOWER(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_posts_user_keyset ON Posts(user_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_community_keyset ON Posts(community_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_comments_post_keyset ON Comments(post_id, created_at, comment_id) WHERE parent_comment_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_comments_parent_keyset ON Comments(parent_comment_id, created_at, comment_id);
+CREATE INDEX IF NOT EXISTS idx_follows_following_keyset ON Follows(following_id, created_at DESC, follower_id DESC) WHERE status_id = 2;
+CREATE INDEX IF NOT EXISTS idx_follows_follower_keyset ON Follows(follower_id, created_at DESC, following_id DESC) WHERE status_id = 2;
+CREATE INDEX IF NOT EXISTS idx_community_members_keyset ON CommunityMembers(community_id, joined_at DESC, user_id DESC);
 
 -- Soft delete indexes (Merged from migrations)
 CREATE INDEX IF NOT EXISTS idx_messages_sender_deleted ON Messages(sender_id) WHERE sender_deleted = FALSE;
 CREATE INDEX IF NOT EXISTS idx_messages_receiver_deleted ON Messages(receiver_id) WHERE receiver_deleted = FALSE;
+
+-- Monthly Messages partitions: the past year through three months ahead (later months are
+-- created by the create_message_partitions scheduler job)
+SELECT create_message_partitions(3, 12);
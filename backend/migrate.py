@@ -0,0 +1,63 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.extensions import db
+
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database')
+
+# Schema migrations for existing databases: the SQL files of each, applied in order in one transaction
+MIGRATIONS = {
+    'read_watermarks': [
+        '06_Migrations/01_message_read_watermarks.sql',
+        '04_Functions/08_update_conversations.sql',
+    ],
+    'partition_messages': [
+        '04_Functions/09_create_message_partitions.sql',
+        '06_Migrations/02_partition_messages.sql',
+    ],
+    'message_sync': [
+        '04_Functions/10_message_sync.sql',
+        '06_Migrations/03_message_sync.sql',
+    ],
+    'friend_of_friend_function': [
+        '04_Functions/01_get_friend_of_friend_recommendations.sql',
+    ],
+}
+
+
+def migrate(name: str):
+    if name not in MIGRATIONS:
+        print(f"Unknown migration '{name}'. Available: {', '.join(MIGRATIONS)}")
+        sys.exit(1)
+    print(f"Running migration {name}...")
+
+    app = create_app()
+    with app.app_context():
+        # Raw connection (as in reset_db.py) so the SQL files run as-is
+        raw_conn = db.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            for path in MIGRATIONS[name]:
+                print(f"Applying {path}...")
+                with open(os.path.join(DATABASE_DIR, path), 'r') as f:
+                    cursor.execute(f.read())
+            raw_conn.commit()
+            cursor.close()
+            print(f"Migration {name} complete")
+        except Exception as e:
+            raw_conn.rollback()
+            print(f"Error running migration {name}: {e}")
+            sys.exit(1)
+        finally:
+            raw_conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: python migrate.py <{'|'.join(MIGRATIONS)}>")
+        sys.exit(1)
+    migrate(sys.argv[1])
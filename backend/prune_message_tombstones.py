@@ -0,0 +1,29 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.config import Config
+from api.repositories.message_repository import MessageRepository
+
+
+def prune_message_tombstones(older_than_days: int = Config.MESSAGE_SYNC_RETENTION_DAYS):
+    print(f"Pruning message tombstones older than {older_than_days} days...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            deleted = MessageRepository().prune_tombstones(older_than_days)
+            print(f"Message tombstones pruned ({deleted} deleted)")
+        except Exception as e:
+            print(f"Error pruning message tombstones: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    days = next((int(arg.split("=", 1)[1]) for arg in args if arg.startswith("--days=")),
+                Config.MESSAGE_SYNC_RETENTION_DAYS)
+    prune_message_tombstones(days)
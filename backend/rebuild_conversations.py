@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.repositories.message_repository import MessageRepository
+
+
+def rebuild_conversations():
+    print("Rebuilding conversation summaries from messages...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            rebuilt = MessageRepository().rebuild_conversations()
+            print(f"Conversations rebuilt ({rebuilt} conversations)")
+        except Exception as e:
+            print(f"Error rebuilding conversations: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    rebuild_conversations()
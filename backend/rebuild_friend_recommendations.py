@@ -0,0 +1,37 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.config import Config
+from api.repositories.friend_recommendation_repository import FriendRecommendationRepository
+
+
+def rebuild_friend_recommendations(dirty_only: bool = False):
+    app = create_app()
+    with app.app_context():
+        try:
+            repository = FriendRecommendationRepository()
+            if dirty_only:
+                print("Recomputing friend recommendations for users whose follows changed...")
+                users = repository.refresh_dirty(
+                    Config.FRIEND_RECOMMENDATIONS_TOP_N, Config.FRIEND_RECOMMENDATIONS_BATCH_SIZE,
+                    Config.FRIEND_RECOMMENDATIONS_ENGINE
+                )
+                print(f"Friend recommendations recomputed for {users} users")
+            else:
+                print("Rebuilding friend recommendations for all users...")
+                inserted = repository.rebuild_all(
+                    Config.FRIEND_RECOMMENDATIONS_TOP_N, Config.FRIEND_RECOMMENDATIONS_BATCH_SIZE,
+                    Config.FRIEND_RECOMMENDATIONS_ENGINE
+                )
+                print(f"Friend recommendations rebuilt ({inserted} entries)")
+        except Exception as e:
+            print(f"Error rebuilding friend recommendations: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    rebuild_friend_recommendations(dirty_only="--dirty" in sys.argv[1:])
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.config import Config
+from api.repositories.timeline_repository import TimelineRepository
+
+
+def rebuild_timelines():
+    print("Rebuilding home timelines from accepted follows...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            inserted = TimelineRepository().rebuild_all(Config.HOME_TIMELINE_BACKFILL_LIMIT)
+            print(f"Home timelines rebuilt ({inserted} entries)")
+        except Exception as e:
+            print(f"Error rebuilding timelines: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    rebuild_timelines()
@@ -0,0 +1,26 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.config import Config
+from api.repositories.post_repository import PostRepository
+
+
+def recompute_hot_scores():
+    print("Recomputing hot scores for the discover feed...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            updated = PostRepository().recompute_hot_scores(Config.HOT_SCORE_WINDOW_HOURS)
+            print(f"Hot scores recomputed ({updated} posts updated)")
+        except Exception as e:
+            print(f"Error recomputing hot scores: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    recompute_hot_scores()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.repositories.materialized_view_repository import MaterializedViewRepository, REFRESHABLE_VIEWS
+
+
+def refresh_views():
+    app = create_app()
+    with app.app_context():
+        repository = MaterializedViewRepository()
+        for view_name in REFRESHABLE_VIEWS:
+            print(f"Refreshing {view_name}...")
+            try:
+                if repository.refresh(view_name):
+                    print(f"{view_name} refreshed at {repository.get_refreshed_at(view_name)}")
+                else:
+                    print(f"{view_name} is already being refreshed by another process, skipped")
+            except Exception as e:
+                print(f"Error refreshing {view_name}: {e}")
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    refresh_views()
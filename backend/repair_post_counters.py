@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Add current directory to path so we can import api
+sys.path.append(os.getcwd())
+
+from api import create_app
+from api.repositories.post_repository import PostRepository
+
+
+def repair_post_counters():
+    print("Recomputing post like/comment counters...")
+
+    app = create_app()
+    with app.app_context():
+        try:
+            repaired = PostRepository().repair_counters()
+            print(f"Post counters repaired ({repaired} posts updated)")
+        except Exception as e:
+            print(f"Error repairing post counters: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    repair_post_counters()
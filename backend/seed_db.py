@@ -6,6 +6,9 @@ from sqlalchemy import create_engine
 sys.path.append(os.getcwd())
 
 from api.config import Config
+from backfill_hashtags import backfill_hashtags
+from repair_post_counters import repair_post_counters
+from rebuild_friend_recommendations import rebuild_friend_recommendations
 
 def seed_db():
     print("Seeding database...")
@@ -67,5 +70,12 @@ def seed_db():
         print(f"Connection error: {e}")
         sys.exit(1)
 
+    # Seed posts are inserted with raw SQL, so index their hashtags afterwards
+    backfill_hashtags()
+    # Seed likes are raw INSERTs into PostLikes, which do not touch Posts.like_count
+    repair_post_counters()
+    # Friend recommendations are precomputed, so build them for the seeded follow graph
+    rebuild_friend_recommendations()
+
 if __name__ == "__main__":
     seed_db()
@@ -2,6 +2,7 @@ import unittest
 from api.extensions import db
 from sqlalchemy import text
 from app import app
+from api.cache import cache
 
 class BaseTest(unittest.TestCase):
     @classmethod
@@ -44,7 +45,11 @@ class BaseTest(unittest.TestCase):
             # Construct single truncate command
             table_str = ", ".join(tables)
             conn.execute(text(f"TRUNCATE TABLE {table_str} RESTART IDENTITY CASCADE"))
+            # Materialized views are not emptied by TRUNCATE
+            conn.execute(text("REFRESH MATERIALIZED VIEW popular_posts_view"))
             conn.commit()
+        # Cached query results refer to the rows just deleted
+        cache.clear()
 
     def tearDown(self):
         """Run after each test"""
@@ -0,0 +1,328 @@
+"""Test file for the query result cache (memory and Redis-protocol backends)"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fnmatch
+import socketserver
+import threading
+import time
+import pytest
+from api.cache import MISS, Cache, MemoryBackend, RedisBackend, RespConnection, cache_key, cached
+from api.cache.redis_backend import RedisUnavailable
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Stand-in Redis server: the handful of RESP commands the cache backend uses"""
+
+    def handle(self):
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            self.wfile.write(self.server.execute(command))
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    @staticmethod
+    def _bulk(value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def _array(self, values):
+        return b"*%d\r\n" % len(values) + b"".join(self._bulk(value) for value in values)
+
+    def execute(self, args):
+        name, args = args[0].upper().decode(), args[1:]
+        with self.lock:
+            if name == "GET":
+                return self._bulk(self.data[args[0]] if self._alive(args[0]) else None)
+            if name == "SET":
+                if b"NX" in args[2:] and self._alive(args[0]):
+                    return self._bulk(None)
+                self.data[args[0]] = args[1]
+                self.expires[args[0]] = time.monotonic() + int(args[3]) / 1000
+                return b"+OK\r\n"
+            if name == "SADD":
+                if not self._alive(args[0]):
+                    self.data[args[0]] = set()
+                members = self.data[args[0]]
+                added = len(set(args[1:]) - members)
+                members.update(args[1:])
+                return b":%d\r\n" % added
+            if name == "SMEMBERS":
+                return self._array(sorted(self.data[args[0]]) if self._alive(args[0]) else [])
+            if name == "PTTL":
+                if not self._alive(args[0]):
+                    return b":-2\r\n"
+                if args[0] not in self.expires:
+                    return b":-1\r\n"
+                return b":%d\r\n" % int((self.expires[args[0]] - time.monotonic()) * 1000)
+            if name == "PEXPIRE":
+                self.expires[args[0]] = time.monotonic() + int(args[1]) / 1000
+                return b":1\r\n"
+            if name == "DEL":
+                removed = sum(1 for key in args if self.data.pop(key, None) is not None)
+                for key in args:
+                    self.expires.pop(key, None)
+                return b":%d\r\n" % removed
+            if name == "SCAN":
+                pattern = args[2].decode()
+                keys = [key for key in list(self.data) if self._alive(key) and fnmatch.fnmatchcase(key.decode(), pattern)]
+                return b"*2\r\n" + self._bulk(b"0") + self._array(keys)
+            return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def redis_backend():
+    server = FakeRedisServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield RedisBackend(RespConnection(host, port), prefix="test:")
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryBackend(max_entries=100)
+    return request.getfixturevalue("redis_backend")
+
+
+def test_set_get_and_ttl(backend):
+    assert backend.get("missing") is MISS
+    backend.set("a", {"rows": [1, 2]}, ttl=60)
+    backend.set("none", None, ttl=60)
+    assert backend.get("a") == {"rows": [1, 2]}
+    # None is a cacheable value, distinct from a miss
+    assert backend.get("none") is None
+
+    backend.set("short", "x", ttl=0.05)
+    time.sleep(0.1)
+    assert backend.get("short") is MISS
+
+
+def test_tag_invalidation(backend):
+    backend.set("popular", ["p1"], ttl=60, tags=["user:1", "user:2"])
+    backend.set("active", ["u2"], ttl=60, tags=["user:2"])
+    backend.set("stats", {"c": 1}, ttl=60, tags=["community:1"])
+
+    assert backend.invalidate_tags("user:1") == 1
+    assert backend.get("popular") is MISS
+    assert backend.get("active") == ["u2"]
+
+    assert backend.invalidate_tags("user:2", "community:1") == 2
+    assert backend.get("active") is MISS
+    assert backend.get("stats") is MISS
+
+
+def test_clear(backend):
+    backend.set("a", 1, ttl=60, tags=["t"])
+    backend.clear()
+    assert backend.get("a") is MISS
+    assert backend.invalidate_tags("t") == 0
+
+
+def test_add_only_when_absent(backend):
+    assert backend.add("lock", True, ttl=60) is True
+    assert backend.add("lock", True, ttl=60) is False
+    backend.delete("lock")
+    assert backend.add("lock", True, ttl=0.05) is True
+    time.sleep(0.1)
+    assert backend.add("lock", True, ttl=60) is True
+
+
+def test_memory_lru_eviction():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")  # "b" is now least recently used
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is MISS
+    assert backend.get("a") == 1 and backend.get("c") == 3
+    assert backend.stats()["evictions"] == 1
+
+
+def test_memory_returns_copies():
+    backend = MemoryBackend()
+    backend.set("a", [{"post_id": 1}], ttl=60)
+    backend.get("a")[0]["post_id"] = 2
+    assert backend.get("a") == [{"post_id": 1}]
+
+
+def test_cached_decorator_and_metrics():
+    cache = Cache(MemoryBackend())
+
+    class Repo:
+        calls = 0
+
+        @cached("repo.popular", ttl=60, cache=cache,
+                tags=lambda rows, limit: [f"user:{row['user_id']}" for row in rows])
+        def get_popular(self, limit: int = 20):
+            Repo.calls += 1
+            return [{"user_id": 42, "limit": limit}]
+
+    repo = Repo()
+    assert repo.get_popular(10) == repo.get_popular(10)
+    assert Repo.calls == 1
+    repo.get_popular(5)
+    assert Repo.calls == 2
+
+    assert cache.invalidate_tags("user:42") == 2
+    repo.get_popular(10)
+    assert Repo.calls == 3
+
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["sets"], metrics["invalidations"]) == (1, 3, 3, 2)
+    assert metrics["backend"] == "memory"
+    assert metrics["evictions"] == 0
+
+
+def test_backend_errors_count_as_misses():
+    # Nothing listens on this port: every operation fails, but callers still get results
+    cache = Cache(RedisBackend(RespConnection("127.0.0.1", 1, timeout=0.1)))
+    assert cache.get("a") is MISS
+    cache.set("a", 1)
+    assert cache.invalidate_tags("t") == 0
+    metrics = cache.metrics()
+    assert metrics["errors"] == 3
+    assert metrics["misses"] == 1
+
+
+def test_unavailable_server_is_skipped_until_retry():
+    # Nothing listens on this port
+    connection = RespConnection("127.0.0.1", 1, timeout=0.1, retry_after=0.2)
+    with pytest.raises(ConnectionRefusedError):
+        connection.execute("GET", "a")
+    # The breaker is open: fail at once without trying to connect
+    with pytest.raises(RedisUnavailable):
+        connection.execute("GET", "a")
+    time.sleep(0.25)
+    with pytest.raises(ConnectionRefusedError):
+        connection.execute("GET", "a")
+
+
+def test_concurrent_commands_use_separate_connections(redis_backend):
+    connection = redis_backend.connection
+    barrier = threading.Barrier(4)
+    results = []
+
+    def work(n):
+        barrier.wait()
+        for i in range(20):
+            redis_backend.set(f"k{n}:{i}", i, ttl=60)
+            results.append(redis_backend.get(f"k{n}:{i}") == i)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 80
+    # Idle sockets are kept for reuse, up to max_idle
+    assert 1 <= len(connection._idle) <= connection.max_idle
+
+
+def test_disabled_cache():
+    cache = Cache(None)
+    cache.set("a", 1)
+    assert cache.get("a") is MISS
+    assert cache.metrics()["backend"] is None
+
+
+def test_cache_key():
+    assert cache_key("ns", (1, "a"), {"limit": 5, "after": None}) == "ns(1, 'a', after=None, limit=5)"
+
+
+def wait_for_refreshes(cache):
+    deadline = time.monotonic() + 2
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_stale_while_revalidate(backend):
+    cache = Cache(backend)
+    versions = iter(range(1, 100))
+    load = lambda: next(versions)
+
+    assert cache.fetch("trending", load, ttl=0.5, soft_ttl=0.1) == 1
+    assert cache.fetch("trending", load, ttl=0.5, soft_ttl=0.1) == 1
+
+    # Past the soft TTL: the stale value is served while one background rebuild runs
+    time.sleep(0.15)
+    assert cache.fetch("trending", load, ttl=0.5, soft_ttl=0.1) == 1
+    wait_for_refreshes(cache)
+    assert cache.fetch("trending", load, ttl=0.5, soft_ttl=0.1) == 2
+    assert cache.metrics()["stale_hits"] == 1
+
+    # Past the hard TTL nothing is served stale
+    time.sleep(0.6)
+    assert cache.fetch("trending", load, ttl=0.5, soft_ttl=0.1) == 3
+    assert cache.metrics()["refreshes"] == 3
+
+
+def test_rebuild_is_single_flight(backend):
+    cache = Cache(backend)
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.2)
+        return ["popular"]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.fetch("popular", slow_load, ttl=60, soft_ttl=30)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [["popular"]] * 8
+    assert len(calls) == 1
+
+
+def test_stale_refresh_runs_once(backend):
+    cache = Cache(backend)
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        time.sleep(0.1)
+        return len(calls)
+
+    cache.fetch("active", slow_load, ttl=60, soft_ttl=0.01)
+    time.sleep(0.05)
+    # Many requests hit the stale entry at once; all get it immediately and only one rebuild runs
+    assert [cache.fetch("active", slow_load, ttl=60, soft_ttl=0.01) for _ in range(20)] == [1] * 20
+    wait_for_refreshes(cache)
+    assert len(calls) == 2
@@ -1,6 +1,15 @@
 from tests.base_test import BaseTest
 from sqlalchemy import text
 from api.extensions import db
+from datetime import datetime, timedelta, timezone
+
+
+def plan_nodes(plan):
+    """Every node of an EXPLAIN (FORMAT JSON) plan, depth first"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
 
 class TestDatabaseIndexes(BaseTest):
     def test_message_indexes_exist(self):
@@ -22,9 +31,13 @@ class TestDatabaseIndexes(BaseTest):
         assert 'idx_messages_sender_id' in indexes, "Missing index: idx_messages_sender_id"
         assert 'idx_messages_receiver_id' in indexes, "Missing index: idx_messages_receiver_id"
         
-        # Check for partial index
-        assert 'idx_messages_unread' in indexes, "Missing index: idx_messages_unread"
-        assert 'WHERE (is_read = false)' in indexes['idx_messages_unread'], "idx_messages_unread should be a partial index"
+        # Read state lives on Conversations watermarks, not a per-row flag
+        assert 'idx_messages_unread' not in indexes, "idx_messages_unread should be dropped"
+        assert 'idx_messages_pair_recent' in indexes, "Missing index: idx_messages_pair_recent"
+        
+        # Delta sync reads each user's changes in change_seq order
+        assert 'idx_messages_receiver_change' in indexes, "Missing index: idx_messages_receiver_change"
+        assert 'idx_messages_sender_change' in indexes, "Missing index: idx_messages_sender_change"
 
     def test_audit_log_indexes_exist(self):
         """Verify AuditLog indexes just in case"""
@@ -33,3 +46,56 @@ class TestDatabaseIndexes(BaseTest):
         index_names = [row.indexname for row in result]
         
         assert 'idx_audit_log_user_id' in index_names
+
+    def test_conversation_history_uses_pair_index(self):
+        """Conversation history is one ordered range scan of idx_messages_pair_recent, with no sort"""
+        user_ids = [
+            db.session.execute(text(
+                "INSERT INTO Users (username, email, password_hash) VALUES (:u, :e, 'x') RETURNING user_id"
+            ), {"u": name, "e": f"{name}@e.com"}).scalar()
+            for name in ("planA", "planB", "planC")
+        ]
+        db.session.execute(text("""
+            INSERT INTO Messages (sender_id, receiver_id, content)
+            SELECT (CAST(:ids AS INT[]))[1 + i % 3], (CAST(:ids AS INT[]))[1 + (i + 1) % 3], 'm' || i
+            FROM generate_series(1, 300) i
+        """), {"ids": user_ids})
+        db.session.execute(text("ANALYZE Messages"))
+        # The table is still small enough that a sequential scan would be cheapest
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        
+        plan = db.session.execute(text("""
+            EXPLAIN (FORMAT JSON)
+            SELECT * FROM Messages
+            WHERE LEAST(sender_id, receiver_id) = :user_a
+              AND GREATEST(sender_id, receiver_id) = :user_b
+              AND (created_at, message_id) < (NOW(), 2147483647)
+            ORDER BY created_at DESC, message_id DESC
+            LIMIT 50
+        """), {"user_a": min(user_ids[:2]), "user_b": max(user_ids[:2])}).scalar()
+        nodes = list(plan_nodes(plan[0]["Plan"]))
+        
+        # Messages is partitioned: the scans use each partition's copy of the index
+        partition_indexes = [row.relname for row in db.session.execute(text("""
+            SELECT child.relname FROM pg_inherits i JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE i.inhparent = 'idx_messages_pair_recent'::regclass
+        """)).fetchall()]
+        assert any(node.get("Index Name") in partition_indexes for node in nodes), plan
+        # Partitions are merged in index order (Merge Append), never sorted
+        assert not any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes), plan
+        db.session.rollback()
+
+    def test_messages_partition_pruning(self):
+        """Messages is partitioned by month, and a created_at range only scans the matching partition"""
+        relkind = db.session.execute(text("SELECT relkind FROM pg_class WHERE oid = 'messages'::regclass")).scalar()
+        assert relkind == 'p', "Messages should be a partitioned table"
+        
+        month_start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        plan = db.session.execute(text("""
+            EXPLAIN (FORMAT JSON) SELECT * FROM Messages WHERE created_at >= :start AND created_at < :end
+        """), {"start": month_start, "end": month_end}).scalar()
+        scanned = [node["Relation Name"] for node in plan_nodes(plan[0]["Plan"]) if "Relation Name" in node]
+        
+        # Only the current month's partition is scanned, not its siblings nor messages_default
+        assert scanned == [f"messages_p{month_start:%Y_%m}"], plan
@@ -59,10 +59,18 @@ class TestDiscoveryFeatures(BaseTest):
         self.assertTrue(data['success'])
         self.assertTrue(len(data['posts']) > 0)
         
-        # Verify extra fields from view exist
+        # Verify ranking fields exist and the liked post ranks first
         first_post = data['posts'][0]
         self.assertIn('like_count', first_post)
         self.assertIn('engagement_score', first_post)
+        self.assertIn('hot_score', first_post)
+        self.assertEqual(first_post['post_id'], post_id)
+        
+        # Page sizes are bounded
+        for query in ('limit=0', 'limit=101', 'offset=-1'):
+            response = self.client.get(f'/api/posts/discover?{query}',
+                                     headers={'Authorization': f'Bearer {self.user2_token}'})
+            self.assertEqual(response.status_code, 400)
 
     def test_friend_recommendations(self):
         """Test friend recommendations"""
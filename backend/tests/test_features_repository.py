@@ -1,9 +1,12 @@
+from sqlalchemy import text
 from tests.base_test import BaseTest
 from api.repositories.features_repository import FeaturesRepository
 from api.repositories.user_repository import UserRepository
 from api.repositories.post_repository import PostRepository
 from api.repositories.community_repository import CommunityRepository
-from api.entities.entities import User, Post, Community
+from api.repositories.follow_repository import FollowRepository
+from api.repositories.friend_recommendation_repository import FriendRecommendationRepository
+from api.entities.entities import User, Post, Community, Follow
 
 
 class TestFeaturesRepository(BaseTest):
@@ -76,6 +79,27 @@ class TestFeaturesRepository(BaseTest):
         assert 'roles' in stats
         assert 'engagement' in stats
 
+    def test_community_stats_follow_members_and_posts(self):
+        """Cached community stats are invalidated by joins, leaves and community posts"""
+        community = self.community_repo.create(Community(
+            name="Cached Stats Community",
+            description="Stats stay fresh",
+            creator_id=self.user1.user_id
+        ))
+        cid = community.community_id
+        before = self.features_repo.get_community_stats(cid)
+        
+        self.community_repo.add_member(cid, self.user2.user_id, 3)
+        assert self.features_repo.get_community_stats(cid)['total_members'] == before['total_members'] + 1
+        
+        post = self.post_repo.create(Post(user_id=self.user2.user_id, community_id=cid, content="In the community"))
+        assert self.features_repo.get_community_stats(cid)['total_posts'] == before['total_posts'] + 1
+        self.post_repo.delete(post.post_id)
+        assert self.features_repo.get_community_stats(cid)['total_posts'] == before['total_posts']
+        
+        self.community_repo.remove_member(cid, self.user2.user_id)
+        assert self.features_repo.get_community_stats(cid)['total_members'] == before['total_members']
+
     def test_get_community_stats_nonexistent_community(self):
         """Test getting stats for a non-existent community returns None"""
         stats = self.features_repo.get_community_stats(99999)
@@ -100,6 +124,63 @@ class TestFeaturesRepository(BaseTest):
         
         assert len(recommendations) <= 5
 
+    def test_friend_recommendations_batch_job(self):
+        """Test that the batch job precomputes friend-of-friend suggestions and refreshes dirty users"""
+        follow_repo = FollowRepository()
+        rec_repo = FriendRecommendationRepository()
+        user3 = self.user_repo.create(User(username="features_user3", email="fu3@test.com", password_hash="hash123"))
+        follow_repo.create(Follow(follower_id=self.user1.user_id, following_id=self.user2.user_id, status_id=2))
+        follow_repo.create(Follow(follower_id=self.user2.user_id, following_id=user3.user_id, status_id=2))
+        
+        assert rec_repo.rebuild_all() > 0
+        recommendations = self.features_repo.get_advanced_friend_recommendations(self.user1.user_id)
+        assert [r["suggested_user_id"] for r in recommendations] == [user3.user_id]
+        assert recommendations[0]["mutual_count"] == 1
+        
+        # Following the suggestion marks user1 dirty; the incremental run drops it
+        follow_repo.create(Follow(follower_id=self.user1.user_id, following_id=user3.user_id, status_id=2))
+        assert rec_repo.refresh_dirty() > 0
+        assert self.features_repo.get_advanced_friend_recommendations(self.user1.user_id) == []
+        assert rec_repo.refresh_dirty() == 0
+
+    def test_numpy_engine_matches_sql_function(self):
+        """Test that the NumPy engine reproduces get_friend_of_friend_recommendations exactly"""
+        follow_repo = FollowRepository()
+        rec_repo = FriendRecommendationRepository()
+        users = [self.user1, self.user2] + [
+            self.user_repo.create(User(username=f"graph_user{i}", email=f"gu{i}@test.com", password_hash="hash123"))
+            for i in range(3, 7)
+        ]
+        ids = [u.user_id for u in users]
+        edges = [(0, 1), (0, 2), (1, 3), (2, 3), (1, 4), (2, 0), (3, 5), (4, 5), (5, 0)]
+        for a, b in edges:
+            follow_repo.create(Follow(follower_id=ids[a], following_id=ids[b], status_id=2))
+        # Pending follows are ignored as edges
+        follow_repo.create(Follow(follower_id=ids[0], following_id=ids[5], status_id=1))
+        self.post_repo.create(Post(user_id=ids[4], content="Graph post"))
+        
+        graph = rec_repo.load_follow_graph()
+        engine = {}
+        for batch in graph.recommend(top_n=50):
+            for i in range(len(batch.user_id)):
+                engine.setdefault(int(batch.user_id[i]), set()).add(
+                    (int(batch.suggested_user_id[i]), int(batch.mutual_count[i]), int(batch.score_tenths[i]))
+                )
+        
+        for user_id in ids:
+            rows = self.features_repo.db.session.execute(
+                text("SELECT * FROM get_friend_of_friend_recommendations(:uid)"), {"uid": user_id}
+            ).fetchall()
+            expected = {(r.recommended_user, r.mutual_friends, int(r.connection_strength * 10)) for r in rows}
+            assert engine.get(user_id, set()) == expected
+        
+        # Both engines store the same table contents
+        rec_repo.rebuild_all(engine="sql")
+        sql_rows = self.features_repo.get_advanced_friend_recommendations(ids[0])
+        rec_repo.rebuild_all(engine="numpy")
+        assert self.features_repo.get_advanced_friend_recommendations(ids[0]) == sql_rows
+        assert len(sql_rows) > 0
+
     def test_popular_posts_structure(self):
         """Test that popular posts have correct structure"""
         # Create a post
@@ -0,0 +1,83 @@
+"""Test file for the NumPy follow-graph recommendation engine"""
+
+import sys
+import os
+import random
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.utils.follow_graph import FollowGraph
+
+
+def reference_recommendations(edges, posts, user_id, top_n=50):
+    """Pure-Python port of get_friend_of_friend_recommendations (plus the user id tie-break)"""
+    following = defaultdict(set)
+    followers = defaultdict(int)
+    for follower, followed in edges:
+        following[follower].add(followed)
+        followers[followed] += 1
+
+    mutual = defaultdict(set)
+    for friend in following[user_id]:
+        for candidate in following[friend]:
+            if candidate != user_id and candidate not in following[user_id]:
+                mutual[candidate].add(friend)
+
+    scored = [
+        (len(friends) * 100 + posts.get(candidate, 0) * 5 + followers[candidate], len(friends), candidate)
+        for candidate, friends in mutual.items()
+    ]
+    scored.sort(key=lambda row: (-row[0], -row[1], row[2]))
+    return [(candidate, mutual_count, score) for score, mutual_count, candidate in scored[:top_n]]
+
+
+def engine_recommendations(graph, user_ids=None, top_n=50, chunk_size=1000):
+    result = defaultdict(list)
+    for batch in graph.recommend(user_ids, top_n=top_n, chunk_size=chunk_size):
+        for i in range(len(batch.user_id)):
+            assert batch.rank[i] == len(result[int(batch.user_id[i])]) + 1
+            result[int(batch.user_id[i])].append(
+                (int(batch.suggested_user_id[i]), int(batch.mutual_count[i]), int(batch.score_tenths[i]))
+            )
+    return result
+
+
+def random_graph(users=200, edges=2000, seed=7):
+    rng = random.Random(seed)
+    pairs = set()
+    while len(pairs) < edges:
+        a, b = rng.randint(1, users) * 3, rng.randint(1, users) * 3
+        if a != b:
+            pairs.add((a, b))
+    posts = {rng.randint(1, users) * 3: rng.randint(1, 20) for _ in range(users // 2)}
+    return sorted(pairs), posts
+
+
+def test_matches_reference_on_random_graph():
+    edges, posts = random_graph()
+    graph = FollowGraph.from_edges(
+        [a for a, _ in edges], [b for _, b in edges], list(posts.keys()), list(posts.values())
+    )
+    result = engine_recommendations(graph, top_n=10, chunk_size=37)
+
+    users = {a for a, _ in edges}
+    for user_id in users:
+        assert result.get(user_id, []) == reference_recommendations(edges, posts, user_id, top_n=10)
+
+
+def test_scoring_and_exclusions():
+    # 1 follows 2 and 3; both follow 4; 2 also follows 1 (excluded: self) and 3 (excluded: already followed)
+    edges = [(1, 2), (1, 3), (2, 4), (3, 4), (2, 1), (2, 3), (3, 5)]
+    graph = FollowGraph.from_edges([a for a, _ in edges], [b for _, b in edges], [4, 5], [2, 10])
+    result = engine_recommendations(graph, user_ids=[1])
+
+    # 4: mutual 2, posts 2, followers 2 -> 2*10 + 2*0.5 + 2*0.1 = 21.2
+    # 5: mutual 1, posts 10, followers 1 -> 1*10 + 10*0.5 + 1*0.1 = 15.1
+    assert result[1] == [(4, 2, 212), (5, 1, 151)]
+
+
+def test_unknown_and_empty():
+    graph = FollowGraph.from_edges([1], [2])
+    assert engine_recommendations(graph, user_ids=[99]) == {}
+    assert engine_recommendations(FollowGraph.from_edges([], [])) == {}
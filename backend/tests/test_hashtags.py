@@ -0,0 +1,22 @@
+"""Test file for hashtag extraction"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.utils.hashtags import extract_hashtags
+
+
+def test_extract_hashtags():
+    assert extract_hashtags("Loving #Python and #flask!") == ["python", "flask"]
+
+
+def test_extract_hashtags_dedupes_and_ignores_bare_hash():
+    assert extract_hashtags("#a # #A #b_c #a") == ["a", "b_c"]
+
+
+def test_extract_hashtags_empty():
+    assert extract_hashtags(None) == []
+    assert extract_hashtags("no tags here") == []
+    assert extract_hashtags("#!!!") == []
@@ -0,0 +1,81 @@
+"""Test file for the request-scoped identity map"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from flask import Flask
+from api.repositories import identity_map
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+def test_loads_once_per_request(app):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"user_id": 1}
+
+    with app.test_request_context():
+        first = identity_map.get_or_load(("user", 1), loader)
+        second = identity_map.get_or_load(("user", 1), loader)
+        assert first is second
+        assert identity_map.stats() == {"hits": 1, "queries": 1}
+    assert len(calls) == 1
+
+    # A new request starts with an empty map
+    with app.test_request_context():
+        identity_map.get_or_load(("user", 1), loader)
+        assert identity_map.stats() == {"hits": 0, "queries": 1}
+    assert len(calls) == 2
+
+
+def test_caches_missing_rows(app):
+    calls = []
+    with app.test_request_context():
+        for _ in range(3):
+            assert identity_map.get_or_load(("follow", 1, 2), lambda: calls.append(1)) is None
+        assert len(calls) == 1
+
+
+def test_invalidate_and_store(app):
+    with app.test_request_context():
+        identity_map.get_or_load(("user", 1), lambda: "old")
+        identity_map.get_or_load(("user", 2), lambda: "other")
+        identity_map.invalidate(("user", 1))
+        assert identity_map.get_or_load(("user", 1), lambda: "new") == "new"
+
+        identity_map.store(("user", 1), "written")
+        assert identity_map.get_or_load(("user", 1), lambda: "unused") == "written"
+
+        identity_map.invalidate_where(lambda key, value: value == "other")
+        assert identity_map.get_or_load(("user", 2), lambda: "reloaded") == "reloaded"
+
+
+def test_outside_request_always_loads(app):
+    calls = []
+    with app.app_context():
+        identity_map.get_or_load(("user", 1), lambda: calls.append(1))
+        identity_map.get_or_load(("user", 1), lambda: calls.append(1))
+        assert identity_map.stats() == {"hits": 0, "queries": 0}
+    assert len(calls) == 2
+
+
+def test_requests_inside_one_app_context_do_not_share(app):
+    # Tests and scripts keep an app context open across requests: each request still starts empty
+    app.add_url_rule("/user", "user", lambda: str(identity_map.get_or_load(("user", 1), loader)))
+    versions = iter(["v1", "v2"])
+
+    def loader():
+        return next(versions)
+
+    with app.app_context():
+        client = app.test_client()
+        assert client.get("/user").get_data(as_text=True) == "v1"
+        assert client.get("/user").get_data(as_text=True) == "v2"
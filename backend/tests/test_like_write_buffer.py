@@ -0,0 +1,83 @@
+from unittest.mock import patch
+from tests.base_test import BaseTest
+import api.repositories.like_write_buffer as like_write_buffer_module
+from api.repositories.like_write_buffer import LikeWriteBuffer
+from api.repositories.post_repository import PostRepository
+from api.repositories.user_repository import UserRepository
+from api.entities.entities import User, Post
+
+
+class TestLikeWriteBuffer(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.post_repo = PostRepository()
+        self.user_repo = UserRepository()
+        # Long interval so only explicit flushes write during the test
+        self.buffer = LikeWriteBuffer(flush_interval_ms=60000, max_events=100)
+        
+        self.author = self.user_repo.create(User(username="buffer_author", email="ba@e.com", password_hash="x"))
+        self.post = self.post_repo.create(Post(user_id=self.author.user_id, content="Viral"))
+        self.likers = [
+            self.user_repo.create(User(username=f"buffer_liker{i}", email=f"bl{i}@e.com", password_hash="x"))
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        self.buffer.stop()
+        super().tearDown()
+
+    def test_flush_writes_batch_and_counter(self):
+        for liker in self.likers:
+            self.buffer.enqueue(self.post.post_id, liker.user_id, True)
+        assert self.buffer.pending_delta(self.post.post_id) == 3
+        assert self.post_repo.count_likes(self.post.post_id) == 0
+        
+        assert self.buffer.flush() == 3
+        assert self.post_repo.count_likes(self.post.post_id) == 3
+        assert self.post_repo.has_user_liked(self.post.post_id, self.likers[0].user_id) is True
+        assert self.buffer.pending_delta(self.post.post_id) == 0
+        
+        self.buffer.enqueue(self.post.post_id, self.likers[0].user_id, False)
+        assert self.buffer.pending_state(self.post.post_id, self.likers[0].user_id) is False
+        self.buffer.flush()
+        assert self.post_repo.count_likes(self.post.post_id) == 2
+
+    def test_opposite_events_cancel_out(self):
+        liker = self.likers[0]
+        self.buffer.enqueue(self.post.post_id, liker.user_id, True)
+        self.buffer.enqueue(self.post.post_id, liker.user_id, False)
+        assert self.buffer.pending_state(self.post.post_id, liker.user_id) is None
+        assert self.buffer.flush() == 0
+        assert self.post_repo.count_likes(self.post.post_id) == 0
+
+    def test_full_buffer_flushes_immediately(self):
+        self.buffer.max_events = 2
+        self.buffer.enqueue(self.post.post_id, self.likers[0].user_id, True)
+        assert self.post_repo.count_likes(self.post.post_id) == 0
+        self.buffer.enqueue(self.post.post_id, self.likers[1].user_id, True)
+        assert self.post_repo.count_likes(self.post.post_id) == 2
+
+    def test_failed_flush_is_retried(self):
+        self.buffer.enqueue(self.post.post_id, self.likers[0].user_id, True)
+        self.buffer.enqueue(self.post.post_id, self.likers[1].user_id, True)
+        with patch.object(like_write_buffer_module, 'FLUSH_SQL', 'SELECT no_such_function()'):
+            assert self.buffer.flush() == 0
+            # Events queued while the batch was failing merge with it
+            self.buffer.enqueue(self.post.post_id, self.likers[1].user_id, False)
+            self.buffer.enqueue(self.post.post_id, self.likers[2].user_id, True)
+        assert self.buffer.pending_state(self.post.post_id, self.likers[0].user_id) is True
+        assert self.buffer.pending_state(self.post.post_id, self.likers[1].user_id) is None
+        
+        assert self.buffer.flush() == 2
+        assert self.post_repo.count_likes(self.post.post_id) == 2
+        assert self.post_repo.has_user_liked(self.post.post_id, self.likers[1].user_id) is False
+
+    def test_retries_are_bounded(self):
+        self.buffer.max_retries = 1
+        self.buffer.enqueue(self.post.post_id, self.likers[0].user_id, True)
+        with patch.object(like_write_buffer_module, 'FLUSH_SQL', 'SELECT no_such_function()'):
+            self.buffer.flush()
+            assert self.buffer.pending_delta(self.post.post_id) == 1
+            self.buffer.flush()
+        assert self.buffer.pending_delta(self.post.post_id) == 0
+        assert self.buffer.flush() == 0
@@ -17,10 +17,13 @@ class TestMessageController(BaseTest):
         self.t2 = r.get_json()['token']
         self.id2 = r.get_json()['user']['user_id']
         
-        # U1 follows U2 (required for messaging)
+        # U1 follows U2 (required for messaging) and U2 accepts the request
         self.client.post(f'/api/users/{self.id2}/follow',
             headers={"Authorization": f"Bearer {self.t1}"}
         )
+        self.client.post(f'/api/me/follow-requests/{self.id1}/accept',
+            headers={"Authorization": f"Bearer {self.t2}"}
+        )
 
     def test_message_flow(self):
         # 1. Send (U1 -> U2)
@@ -45,3 +48,16 @@ class TestMessageController(BaseTest):
         )
         assert resp.status_code == 200
 
+
+    def test_sync_validates_params(self):
+        headers = {"Authorization": f"Bearer {self.t2}"}
+        resp = self.client.get('/api/messages/sync', headers=headers)
+        assert resp.status_code == 200
+        token = resp.get_json()['next_token']
+        
+        for query in ('limit=0', 'limit=-5', 'limit=501', 'since=garbage'):
+            resp = self.client.get(f'/api/messages/sync?{query}', headers=headers)
+            assert resp.status_code == 400
+        
+        resp = self.client.get(f'/api/messages/sync?since={token}&limit=1', headers=headers)
+        assert resp.status_code == 200
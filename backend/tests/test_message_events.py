@@ -0,0 +1,59 @@
+"""Test file for the in-process message event hub behind the message stream"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queue
+import pytest
+from api.repositories.message_events import MessageEventHub
+
+
+def test_dispatch_routes_by_user():
+    hub = MessageEventHub()
+    alice_tab, alice_phone, bob = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+    assert hub.subscriber_count() == 3
+
+    assert hub.dispatch({"type": "message", "user_ids": [1], "message_id": 7}) == 2
+    assert alice_tab.get_nowait()["message_id"] == 7
+    assert alice_phone.get_nowait()["message_id"] == 7
+    assert bob.empty()
+
+    # Events without user_ids (e.g. resync) go to every stream
+    assert hub.dispatch({"type": "resync"}) == 3
+
+
+def test_unsubscribe():
+    hub = MessageEventHub()
+    events = hub.subscribe(1)
+    hub.unsubscribe(1, events)
+    hub.unsubscribe(1, events)
+    assert hub.subscriber_count() == 0
+    assert hub.dispatch({"type": "unread", "user_ids": [1]}) == 0
+    assert events.empty()
+
+
+def test_full_queue_resyncs_stream():
+    hub = MessageEventHub(queue_size=2)
+    slow, fast = hub.subscribe(1), hub.subscribe(1)
+    for message_id in range(3):
+        hub.dispatch({"type": "message", "user_ids": [1], "message_id": message_id})
+        fast.get_nowait()
+    # A stalled stream never blocks delivery to the others; its backlog becomes one resync
+    assert slow.get_nowait() == {"type": "resync"}
+    with pytest.raises(queue.Empty):
+        slow.get_nowait()
+
+    hub.dispatch({"type": "message", "user_ids": [1], "message_id": 3})
+    assert slow.get_nowait()["message_id"] == 3
+
+
+def test_max_streams():
+    hub = MessageEventHub(max_streams=2)
+    first, second = hub.subscribe(1), hub.subscribe(2)
+    assert first is not None and second is not None
+    assert hub.subscribe(3) is None
+    hub.unsubscribe(1, first)
+    assert hub.subscribe(3) is not None
+    assert hub.subscriber_count() == 2
@@ -2,6 +2,9 @@ from tests.base_test import BaseTest
 from api.repositories.message_repository import MessageRepository
 from api.repositories.user_repository import UserRepository
 from api.entities.entities import User, Message
+from api.extensions import db
+from datetime import date, datetime, timezone
+from sqlalchemy import text
 
 class TestMessageRepository(BaseTest):
     def setUp(self):
@@ -30,3 +33,94 @@ class TestMessageRepository(BaseTest):
         
         msgs = self.message_repo.get_conversation(self.sender.user_id, self.receiver.user_id)
         assert len(msgs) == 2
+
+    def test_conversation_before_cursor(self):
+        sent = [
+            self.message_repo.create(Message(sender_id=self.sender.user_id, receiver_id=self.receiver.user_id, content=str(i)))
+            for i in range(5)
+        ]
+        page = self.message_repo.get_conversation(self.receiver.user_id, self.sender.user_id, limit=2)
+        assert [m.message_id for m in page] == [sent[4].message_id, sent[3].message_id]
+        
+        page = self.message_repo.get_conversation(
+            self.sender.user_id, self.receiver.user_id, limit=2,
+            before=(page[-1].created_at, page[-1].message_id)
+        )
+        assert [m.message_id for m in page] == [sent[2].message_id, sent[1].message_id]
+
+    def test_conversation_summaries(self):
+        third = self.user_repo.create(User(username="msgThird", email="mt@e.com", password_hash="x"))
+        first = self.message_repo.create(Message(sender_id=self.sender.user_id, receiver_id=self.receiver.user_id, content="1"))
+        self.message_repo.create(Message(sender_id=self.sender.user_id, receiver_id=self.receiver.user_id, content="2"))
+        reply = self.message_repo.create(Message(sender_id=self.receiver.user_id, receiver_id=self.sender.user_id, content="3"))
+        latest = self.message_repo.create(Message(sender_id=third.user_id, receiver_id=self.receiver.user_id, content="4"))
+        
+        inbox = self.message_repo.get_user_conversations(self.receiver.user_id)
+        assert [(c["other_user_id"], c["message_id"], c["unread_count"]) for c in inbox] == [
+            (third.user_id, latest.message_id, 1),
+            (self.sender.user_id, reply.message_id, 2)
+        ]
+        # Each side has its own unread count
+        assert self.message_repo.get_user_conversations(self.sender.user_id)[0]["unread_count"] == 1
+        
+        # Reading and deleting keep the summary in sync
+        self.message_repo.mark_as_read(first.message_id)
+        self.message_repo.delete(reply.message_id)
+        conv = self.message_repo.get_user_conversations(self.receiver.user_id)[1]
+        assert (conv["content"], conv["unread_count"]) == ("2", 1)
+        assert self.message_repo.get_user_conversations(self.sender.user_id)[0]["unread_count"] == 0
+        assert self.message_repo.mark_conversation_as_read(self.receiver.user_id, self.sender.user_id) == 1
+        assert self.message_repo.get_user_conversations(self.receiver.user_id)[1]["unread_count"] == 0
+        
+        # Read state comes from the watermark: everything up to the last message is read
+        assert all(m.is_read for m in self.message_repo.get_conversation(self.receiver.user_id, self.sender.user_id)
+                   if m.receiver_id == self.receiver.user_id)
+        assert self.message_repo.mark_conversation_as_read(self.receiver.user_id, self.sender.user_id) == 0
+        
+        # Cursor pagination walks the inbox newest first
+        page = self.message_repo.get_user_conversations(self.receiver.user_id, limit=1)
+        rest = self.message_repo.get_user_conversations(
+            self.receiver.user_id, limit=1, cursor=(page[0]["created_at"], page[0]["message_id"])
+        )
+        assert [c["other_user_id"] for c in page + rest] == [third.user_id, self.sender.user_id]
+        
+        # Deleting the only message removes the conversation
+        self.message_repo.delete(latest.message_id)
+        assert [c["other_user_id"] for c in self.message_repo.get_user_conversations(self.receiver.user_id)] == [
+            self.sender.user_id
+        ]
+        
+        # The trigger-maintained table matches a rebuild from scratch
+        before = self.message_repo.get_user_conversations(self.receiver.user_id)
+        assert self.message_repo.rebuild_conversations() == 1
+        assert self.message_repo.get_user_conversations(self.receiver.user_id) == before
+
+    def test_partitions_and_archival(self):
+        # Creating partitions is idempotent
+        self.message_repo.create_partitions(3)
+        assert self.message_repo.create_partitions(3) == 0
+        assert f"messages_p{datetime.now(timezone.utc):%Y_%m}" in self.message_repo.get_partitions()
+        
+        # A message from before the oldest partition lands in the default partition ...
+        months = datetime.now(timezone.utc).year * 12 + datetime.now(timezone.utc).month - 1
+        old_month = date((months - 14) // 12, (months - 14) % 12 + 1, 1)
+        kept_month = date((months - 12) // 12, (months - 12) % 12 + 1, 1)
+        old = self.message_repo.create(Message(sender_id=self.sender.user_id, receiver_id=self.receiver.user_id, content="old"))
+        db.session.execute(
+            text("UPDATE Messages SET created_at = :created_at WHERE message_id = :id"),
+            {"created_at": old_month.replace(day=15), "id": old.message_id}
+        )
+        db.session.commit()
+        self.message_repo.rebuild_conversations()
+        
+        # ... and moves into its month's partition once that is created
+        assert self.message_repo.create_partitions(0, months_back=14) == 2
+        assert f"messages_p{old_month:%Y_%m}" in self.message_repo.get_partitions()
+        assert self.message_repo.get_by_id(old.message_id).content == "old"
+        
+        # Archival detaches the old months; the conversation stays, without the archived message's content
+        archived = self.message_repo.archive_partitions(kept_month, drop=True)
+        assert f"messages_p{old_month:%Y_%m}" in archived
+        assert self.message_repo.get_by_id(old.message_id) is None
+        inbox = self.message_repo.get_user_conversations(self.receiver.user_id)
+        assert [(c["message_id"], c["content"]) for c in inbox] == [(old.message_id, None)]
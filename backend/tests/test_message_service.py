@@ -2,6 +2,8 @@ from tests.base_test import BaseTest
 from api.services.message_service import MessageService
 from api.services.auth_service import AuthService
 from api.services.follow_service import FollowService
+from api.utils.pagination import decode_sync_token, encode_sync_token
+from datetime import datetime, timedelta, timezone
 
 class TestMessageService(BaseTest):
     def setUp(self):
@@ -15,8 +17,9 @@ class TestMessageService(BaseTest):
         r2 = self.auth_service.register("r_svc", "r@s.com", "p")
         self.rid = r2['user']['user_id']
         
-        # Create follow relationship (sender follows receiver)
+        # Create follow relationship (sender follows receiver); follows start pending
         self.follow_service.follow_user(self.sid, self.rid)
+        self.follow_service.accept_follow_request(self.sid, self.rid)
 
     def test_send_and_read(self):
         # Send
@@ -33,6 +36,20 @@ class TestMessageService(BaseTest):
         assert read_res['success'] is True
         assert read_res['message']['is_read'] is True
 
+    def test_send_requires_receiver_and_follow(self):
+        res = self.msg_service.send_message(self.sid, 999999, "Nobody")
+        assert res == {"success": False, "error": "Receiver not found"}
+        
+        # A follow request that is still pending does not allow messaging
+        stranger = self.auth_service.register("stranger_svc", "st@s.com", "p")['user']['user_id']
+        self.follow_service.follow_user(stranger, self.rid)
+        res = self.msg_service.send_message(stranger, self.rid, "Not allowed")
+        assert res == {"success": False, "error": "You must follow this user to send them a message"}
+        assert self.msg_service.get_unread_count(self.rid)['unread_count'] == 0
+        
+        res = self.msg_service.send_message(self.sid, self.rid, "Allowed")
+        assert res['success'] is True and res['message']['content'] == "Allowed"
+
     def test_delete_ownership(self):
         res = self.msg_service.send_message(self.sid, self.rid, "To Delete")
         mid = res['message']['message_id']
@@ -45,3 +62,69 @@ class TestMessageService(BaseTest):
         del_res = self.msg_service.delete_message(mid, self.sid)
         assert del_res['success'] is True
 
+
+    def test_stream_events(self):
+        from api.repositories.message_events import message_event_hub
+        stream = self.msg_service.stream_events(self.rid, heartbeat_seconds=1)
+        assert next(stream).startswith("event: unread_count\ndata: {\"unread_count\": 0}")
+        
+        res = self.msg_service.send_message(self.sid, self.rid, "Live")
+        mid = res['message']['message_id']
+        message_event_hub.dispatch({"type": "message", "user_ids": [self.rid], "message_id": mid})
+        events = []
+        while len(events) < 2:
+            event = next(stream)
+            if not event.startswith(":"):
+                events.append(event)
+        assert events[0].startswith("event: message\n") and "Live" in events[0]
+        assert '"unread_count": 1' in events[1]
+        
+        stream.close()
+        assert message_event_hub.subscriber_count() == 0
+
+
+    def test_stream_limit(self):
+        from api.repositories.message_events import message_event_hub
+        saved, message_event_hub.max_streams = message_event_hub.max_streams, 0
+        try:
+            assert self.msg_service.stream_events(self.rid) is None
+        finally:
+            message_event_hub.max_streams = saved
+
+    def test_sync(self):
+        start = self.msg_service.sync(self.rid)
+        assert start['reset'] is False and start['messages'] == []
+        receiver_token = decode_sync_token(start['next_token'])
+        sender_token = decode_sync_token(self.msg_service.sync(self.sid)['next_token'])
+        
+        mids = [self.msg_service.send_message(self.sid, self.rid, f"Sync {i}")['message']['message_id'] for i in range(3)]
+        
+        # Paged by limit, oldest change first
+        page = self.msg_service.sync(self.rid, receiver_token, limit=2)
+        assert [m['message_id'] for m in page['messages']] == mids[:2]
+        assert page['has_more'] is True
+        page = self.msg_service.sync(self.rid, decode_sync_token(page['next_token']), limit=2)
+        assert [m['message_id'] for m in page['messages']] == mids[2:]
+        assert page['has_more'] is False
+        assert page['conversations'][0]['other_user_id'] == self.sid
+        assert page['conversations'][0]['unread_count'] == 3
+        receiver_token = decode_sync_token(page['next_token'])
+        assert self.msg_service.sync(self.rid, receiver_token)['messages'] == []
+        
+        # The sender sees its own messages and, once read, the receiver's read watermark
+        self.msg_service.mark_as_read(mids[1], self.rid)
+        res = self.msg_service.sync(self.sid, sender_token)
+        assert [m['message_id'] for m in res['messages']] == mids
+        assert res['conversations'][0]['other_read_up_to']['message_id'] == mids[1]
+        
+        self.msg_service.delete_message(mids[0], self.sid)
+        res = self.msg_service.sync(self.rid, receiver_token)
+        assert res['messages'] == []
+        assert res['deleted_messages'] == [{"message_id": mids[0], "other_user_id": self.sid}]
+        assert res['conversations'][0]['read_up_to']['message_id'] == mids[1]
+        assert res['conversations'][0]['unread_count'] == 1
+        
+        # Deletions older than the retention window are gone: the client must reload
+        expired = datetime.now(timezone.utc) - timedelta(days=365)
+        res = self.msg_service.sync(self.rid, decode_sync_token(encode_sync_token(receiver_token[0], 0, expired)))
+        assert res['reset'] is True and res['messages'] == []
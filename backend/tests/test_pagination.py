@@ -0,0 +1,68 @@
+"""Test file for keyset pagination cursor helpers"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from datetime import datetime, timezone
+from api.utils.pagination import (
+    encode_cursor, decode_cursor, keyset_params, next_cursor, encode_ranked_cursor, decode_ranked_cursor,
+    encode_sync_token, decode_sync_token
+)
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor(created_at, 42)
+    assert decode_cursor(cursor) == (created_at, 42)
+    # ISO strings (as returned by to_dict) encode the same cursor
+    assert encode_cursor(created_at.isoformat(), 42) == cursor
+
+
+def test_decode_empty_and_invalid():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("yesterday", 1))
+
+
+def test_keyset_params():
+    assert keyset_params(None, 20) == {"cursor_created_at": None, "cursor_id": None, "offset": 20}
+    created_at = datetime(2024, 1, 1)
+    assert keyset_params((created_at, 7), 20) == {"cursor_created_at": created_at, "cursor_id": 7, "offset": 0}
+
+
+def test_next_cursor():
+    items = [
+        {"post_id": 3, "created_at": datetime(2024, 1, 3)},
+        {"post_id": 2, "created_at": datetime(2024, 1, 2)},
+    ]
+    # Short page means there is nothing after it
+    assert next_cursor(items, 3, id_key="post_id") is None
+    assert next_cursor([], 2) is None
+    cursor = next_cursor(items, 2, id_key="post_id")
+    assert decode_cursor(cursor) == (datetime(2024, 1, 2), 2)
+
+
+def test_ranked_cursor_roundtrip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15)
+    cursor = encode_ranked_cursor(0.0607927, created_at, 9)
+    assert decode_ranked_cursor(cursor) == (0.0607927, created_at, 9)
+    assert decode_ranked_cursor(None) is None
+    with pytest.raises(ValueError):
+        decode_ranked_cursor(encode_cursor(created_at, 9))
+
+
+def test_sync_token_roundtrip():
+    issued_at = datetime(2024, 5, 1, 12, 30, 15, tzinfo=timezone.utc)
+    token = encode_sync_token(123456789012, 7, issued_at)
+    assert decode_sync_token(token) == (123456789012, 7, issued_at)
+    assert decode_sync_token(None) is None
+    with pytest.raises(ValueError):
+        decode_sync_token(encode_cursor(issued_at, 7))
+    with pytest.raises(ValueError):
+        decode_sync_token("not-a-token")
@@ -56,3 +56,25 @@ class TestPostController(BaseTest):
         )
         assert resp.status_code == 200
         assert resp.get_json()['like_count'] == 0
+
+    def test_get_posts_batch(self):
+        headers1 = {"Authorization": f"Bearer {self.token1}"}
+        headers2 = {"Authorization": f"Bearer {self.token2}"}
+        first = self.client.post('/api/posts', headers=headers1, json={"content": "First"}).get_json()['post']['post_id']
+        second = self.client.post('/api/posts', headers=headers1, json={"content": "Second"}).get_json()['post']['post_id']
+        
+        resp = self.client.get(f'/api/posts/batch?ids={second},99999,{first},{second}', headers=headers2)
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert [p['post_id'] for p in data['posts']] == [second, first]
+        assert data['missing'] == [99999]
+        assert data['posts'][0]['username'] == "u1"
+        
+        # Posts of a private author are hidden from non-followers but not from the author
+        self.client.put('/api/auth/me', headers=headers1, json={"is_private": True})
+        assert self.client.get(f'/api/posts/batch?ids={first}', headers=headers2).get_json()['posts'] == []
+        assert len(self.client.get(f'/api/posts/batch?ids={first}', headers=headers1).get_json()['posts']) == 1
+        
+        assert self.client.get('/api/posts/batch?ids=1,abc', headers=headers2).status_code == 400
+        too_many = ",".join(str(i) for i in range(1, 102))
+        assert self.client.get(f'/api/posts/batch?ids={too_many}', headers=headers2).status_code == 400
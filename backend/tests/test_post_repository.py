@@ -1,7 +1,9 @@
+from sqlalchemy import text
 from tests.base_test import BaseTest
 from api.repositories.post_repository import PostRepository
 from api.repositories.user_repository import UserRepository
-from api.entities.entities import User, Post
+from api.repositories.comment_repository import CommentRepository
+from api.entities.entities import User, Post, Comment
 
 class TestPostRepository(BaseTest):
     def setUp(self):
@@ -58,3 +60,113 @@ class TestPostRepository(BaseTest):
         stats_owner = self.post_repo.get_with_stats(post.post_id, user_id=self.user.user_id)
         assert stats_owner['like_count'] == 1
         assert stats_owner['liked_by_user'] is False
+
+    def test_counters_follow_likes_and_comments(self):
+        post = self.post_repo.create(Post(user_id=self.user.user_id, content="Counted"))
+        liker = self.user_repo.create(User(username="liker3", email="l3@e.com", password_hash="x"))
+        self.post_repo.like_post(post.post_id, liker.user_id)
+        comment = CommentRepository().create(Comment(post_id=post.post_id, user_id=liker.user_id, content="Nice"))
+        
+        stats = self.post_repo.get_with_stats(post.post_id)
+        assert stats['like_count'] == 1
+        assert stats['comment_count'] == 1
+        # Counter updates must not look like an edit
+        assert stats['updated_at'] == post.to_dict()['updated_at']
+        
+        CommentRepository().delete(comment.comment_id)
+        self.post_repo.unlike_post(post.post_id, liker.user_id)
+        stats = self.post_repo.get_with_stats(post.post_id)
+        assert stats['like_count'] == 0
+        assert stats['comment_count'] == 0
+
+    def test_repair_counters(self):
+        post = self.post_repo.create(Post(user_id=self.user.user_id, content="Drifted"))
+        liker = self.user_repo.create(User(username="liker4", email="l4@e.com", password_hash="x"))
+        self.post_repo.like_post(post.post_id, liker.user_id)
+        
+        # Simulate drift
+        self.post_repo.db.session.execute(
+            text("UPDATE Posts SET like_count = 7, comment_count = 3 WHERE post_id = :post_id"),
+            {"post_id": post.post_id}
+        )
+        self.post_repo.db.session.commit()
+        
+        assert self.post_repo.repair_counters() == 1
+        stats = self.post_repo.get_with_stats(post.post_id)
+        assert stats['like_count'] == 1
+        assert stats['comment_count'] == 0
+
+    def test_liked_by_user_batched(self):
+        liked = self.post_repo.create(Post(user_id=self.user.user_id, content="Liked"))
+        other = self.post_repo.create(Post(user_id=self.user.user_id, content="Not liked"))
+        viewer = self.user_repo.create(User(username="viewer", email="v@e.com", password_hash="x"))
+        self.post_repo.like_post(liked.post_id, viewer.user_id)
+        
+        ids = [liked.post_id, other.post_id]
+        assert self.post_repo.get_liked_post_ids(ids, viewer.user_id) == {liked.post_id}
+        assert self.post_repo.get_liked_post_ids([], viewer.user_id) == set()
+        assert self.post_repo.get_liked_post_ids(ids, None) == set()
+        
+        page = self.post_repo.get_by_user_id_with_stats(self.user.user_id, viewer.user_id)
+        assert {p['post_id']: p['liked_by_user'] for p in page} == {liked.post_id: True, other.post_id: False}
+
+    def test_hot_score_decays_with_age(self):
+        fresh = self.post_repo.create(Post(user_id=self.user.user_id, content="Fresh"))
+        old = self.post_repo.create(Post(user_id=self.user.user_id, content="Old"))
+        liker = self.user_repo.create(User(username="liker5", email="l5@e.com", password_hash="x"))
+        self.post_repo.like_post(fresh.post_id, liker.user_id)
+        self.post_repo.like_post(old.post_id, liker.user_id)
+        
+        # Same engagement, but one post is a day older
+        self.post_repo.db.session.execute(
+            text("UPDATE Posts SET created_at = NOW() - INTERVAL '24 hours' WHERE post_id = :post_id"),
+            {"post_id": old.post_id}
+        )
+        self.post_repo.db.session.commit()
+        assert self.post_repo.recompute_hot_scores() == 2
+        
+        hot = self.post_repo.get_hot(liker.user_id, limit=2)
+        assert [p['post_id'] for p in hot] == [fresh.post_id, old.post_id]
+        assert hot[0]['hot_score'] > hot[1]['hot_score'] > 0
+        assert hot[0]['liked_by_user'] is True
+
+    def test_hot_score_zeroed_outside_window(self):
+        post = self.post_repo.create(Post(user_id=self.user.user_id, content="Stale"))
+        liker = self.user_repo.create(User(username="liker7", email="l7@e.com", password_hash="x"))
+        self.post_repo.like_post(post.post_id, liker.user_id)
+        
+        # Liked while recent, then aged past the window
+        self.post_repo.db.session.execute(
+            text("UPDATE Posts SET created_at = NOW() - INTERVAL '200 hours' WHERE post_id = :post_id"),
+            {"post_id": post.post_id}
+        )
+        self.post_repo.db.session.commit()
+        assert self.post_repo.recompute_hot_scores(window_hours=168) == 1
+        assert self.post_repo.get_hot(liker.user_id, limit=1)[0]['hot_score'] == 0
+        # Already zeroed: the next run leaves it alone
+        assert self.post_repo.recompute_hot_scores(window_hours=168) == 0
+
+    def test_add_and_remove_like_return_counters(self):
+        post = self.post_repo.create(Post(user_id=self.user.user_id, content="One round trip"))
+        liker = self.user_repo.create(User(username="liker6", email="l6@e.com", password_hash="x"))
+        
+        liked = self.post_repo.add_like(post.post_id, liker.user_id)
+        assert liked == {"changed": True, "like_count": 1, "comment_count": 0, "liked_by_user": True}
+        # Duplicate like is a no-op and reports the current counters
+        assert self.post_repo.add_like(post.post_id, liker.user_id)["changed"] is False
+        assert self.post_repo.count_likes(post.post_id) == 1
+        
+        unliked = self.post_repo.remove_like(post.post_id, liker.user_id)
+        assert unliked == {"changed": True, "like_count": 0, "comment_count": 0, "liked_by_user": False}
+        assert self.post_repo.remove_like(post.post_id, liker.user_id)["changed"] is False
+        
+        assert self.post_repo.add_like(99999, liker.user_id) is None
+        assert self.post_repo.remove_like(99999, liker.user_id) is None
+    
+    def test_cascaded_like_delete_updates_counter(self):
+        post = self.post_repo.create(Post(user_id=self.user.user_id, content="Cascade"))
+        liker = self.user_repo.create(User(username="liker7", email="l7@e.com", password_hash="x"))
+        self.post_repo.add_like(post.post_id, liker.user_id)
+        
+        assert self.user_repo.delete(liker.user_id) is True
+        assert self.post_repo.count_likes(post.post_id) == 0
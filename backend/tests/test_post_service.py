@@ -1,6 +1,10 @@
+from unittest.mock import patch
 from tests.base_test import BaseTest
+import api.services.post_service as post_service_module
 from api.services.post_service import PostService
 from api.services.auth_service import AuthService
+from api.services.follow_service import FollowService
+from api.utils.pagination import decode_cursor
 
 class TestPostService(BaseTest):
     def setUp(self):
@@ -39,3 +43,100 @@ class TestPostService(BaseTest):
         del_res = self.post_service.delete_post(post_id, self.user_id)
         assert del_res['success'] is True
 
+    def test_feed_follows_timeline(self):
+        follow_service = FollowService()
+        res = self.auth_service.register("reader", "r@s.com", "pass")
+        reader_id = res['user']['user_id']
+        
+        # Post made before the follow is backfilled on accept
+        old_post = self.post_service.create_post(self.user_id, content="Before follow")['post']
+        follow_service.follow_user(reader_id, self.user_id)
+        follow_service.accept_follow_request(reader_id, self.user_id)
+        
+        # Post made after the follow is fanned out on create
+        new_post = self.post_service.create_post(self.user_id, content="After follow")['post']
+        
+        feed = self.post_service.get_feed(reader_id)
+        assert [p['post_id'] for p in feed['posts']] == [new_post['post_id'], old_post['post_id']]
+        
+        # Deleted posts leave the timeline
+        self.post_service.delete_post(new_post['post_id'], self.user_id)
+        feed = self.post_service.get_feed(reader_id)
+        assert [p['post_id'] for p in feed['posts']] == [old_post['post_id']]
+        
+        # Unfollowing clears the author's posts
+        follow_service.unfollow_user(reader_id, self.user_id)
+        assert self.post_service.get_feed(reader_id)['posts'] == []
+
+    def test_user_posts_cursor_pagination(self):
+        created = [self.post_service.create_post(self.user_id, content=f"Post {i}")['post']['post_id'] for i in range(5)]
+        
+        seen = []
+        cursor = None
+        while True:
+            page = self.post_service.get_user_posts(self.user_id, self.user_id, limit=2, cursor=cursor)
+            seen.extend(p['post_id'] for p in page['posts'])
+            if not page['next_cursor']:
+                break
+            cursor = decode_cursor(page['next_cursor'])
+        
+        # Newest first, every post exactly once
+        assert seen == list(reversed(created))
+
+    def test_trending_hashtags_index(self):
+        post = self.post_service.create_post(self.user_id, content="Hello #Python #flask")['post']
+        self.post_service.create_post(self.user_id, content="More #python")
+        
+        res = self.post_service.get_trending_hashtags(limit=5, window="1h")
+        assert res['success'] is True
+        assert res['hashtags'] == [{"hashtag": "python", "count": 2}, {"hashtag": "flask", "count": 1}]
+        
+        # Editing a post re-indexes its hashtags
+        self.post_service.update_post(post['post_id'], self.user_id, {"content": "Hello #django"})
+        tags = {h['hashtag']: h['count'] for h in self.post_service.get_trending_hashtags(window="24h")['hashtags']}
+        assert tags == {"python": 1, "django": 1}
+        
+        assert self.post_service.get_trending_hashtags(window="1y")['success'] is False
+
+    def test_search_posts_fulltext_and_fallback(self):
+        best = self.post_service.create_post(self.user_id, content="postgres postgres tuning")['post']
+        other = self.post_service.create_post(self.user_id, content="tuning postgres indexes")['post']
+        self.post_service.create_post(self.user_id, content="unrelated")
+        
+        res = self.post_service.search_posts("postgres", limit=1, user_id=self.user_id)
+        assert res['mode'] == "fulltext"
+        assert [p['post_id'] for p in res['posts']] == [best['post_id']]
+        
+        res = self.post_service.search_posts("postgres", limit=1, user_id=self.user_id, cursor=res['next_cursor'])
+        assert [p['post_id'] for p in res['posts']] == [other['post_id']]
+        
+        # Very short queries use substring matching
+        res = self.post_service.search_posts("tu", user_id=self.user_id)
+        assert res['mode'] == "substring"
+        assert {p['post_id'] for p in res['posts']} == {best['post_id'], other['post_id']}
+        
+        assert self.post_service.search_posts("postgres", cursor="garbage")['success'] is False
+
+    def test_private_author_visibility(self):
+        follow_service = FollowService()
+        secret_id = self.auth_service.register("secret", "sec@s.com", "pass", is_private=True)['user']['user_id']
+        post = self.post_service.create_post(secret_id, content="Private thoughts")['post']
+        
+        # Strangers see nothing: single post, profile, discover and search all apply the same predicate
+        assert self.post_service.get_post(post['post_id'], self.user_id) is None
+        assert self.post_service.get_user_posts(secret_id, self.user_id)['message'] == "This account is private"
+        assert self.post_service.get_discover_feed(self.user_id)['posts'] == []
+        assert self.post_service.search_posts("Private thoughts", user_id=self.user_id)['posts'] == []
+        
+        # The author and accepted followers do
+        assert self.post_service.get_post(post['post_id'], secret_id)['post_id'] == post['post_id']
+        follow_service.follow_user(self.user_id, secret_id)
+        follow_service.accept_follow_request(self.user_id, secret_id)
+        assert self.post_service.get_post(post['post_id'], self.user_id)['post_id'] == post['post_id']
+        assert len(self.post_service.get_user_posts(secret_id, self.user_id)['posts']) == 1
+        # Private authors' posts are merged live into the cached public discover list
+        assert [p['post_id'] for p in self.post_service.get_discover_feed(self.user_id)['posts']] == [post['post_id']]
+        # Pages past the cached depth are read live with the same visibility
+        with patch.object(post_service_module, 'DISCOVER_CACHE_MAX_POSTS', 0):
+            assert [p['post_id'] for p in self.post_service.get_discover_feed(self.user_id)['posts']] == [post['post_id']]
+        assert len(self.post_service.search_posts("Private thoughts", user_id=self.user_id)['posts']) == 1
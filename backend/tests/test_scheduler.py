@@ -0,0 +1,34 @@
+"""Test file for the in-process scheduler"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, current_app
+from api.scheduler import Scheduler
+
+
+def test_run_pending_runs_due_jobs_in_app_context():
+    app = Flask(__name__)
+    scheduler = Scheduler()
+    calls = []
+    scheduler.add_job("due", 0, lambda: calls.append(current_app.name))
+    scheduler.add_job("later", 3600, lambda: calls.append("later"))
+
+    scheduler.run_pending(app)
+    assert calls == [app.name]
+
+
+def test_failing_job_does_not_stop_others():
+    app = Flask(__name__)
+    scheduler = Scheduler()
+    calls = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    scheduler.add_job("boom", 0, boom)
+    scheduler.add_job("ok", 0, lambda: calls.append("ok"))
+    scheduler.run_pending(app)
+    assert calls == ["ok"]
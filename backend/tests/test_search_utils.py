@@ -0,0 +1,18 @@
+"""Test file for search helpers"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.utils.search import escape_like, search_patterns
+
+
+def test_escape_like():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+    assert escape_like("plain") == "plain"
+
+
+def test_search_patterns():
+    assert search_patterns("  Ali ") == ("%Ali%", "ali%")
+    assert search_patterns("a_b") == ("%a\\_b%", "a\\_b%")
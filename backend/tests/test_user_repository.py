@@ -54,3 +54,19 @@ class TestUserRepository(BaseTest):
         usernames = [u.username for u in results]
         assert "search_python" in usernames
         assert "search_java" not in usernames
+
+    def test_search_users_ranking_and_prefix(self):
+        self.repo.create(User(username="pythonista", email="p1@e.com", password_hash="x"))
+        self.repo.create(User(username="python", email="p2@e.com", password_hash="x"))
+        self.repo.create(User(username="my_python_blog", email="p3@e.com", password_hash="x"))
+        
+        # Closest match ranks first
+        assert self.repo.search("python")[0].username == "python"
+        
+        # Prefix mode only returns usernames starting with the term
+        usernames = [u.username for u in self.repo.search("PYTH", mode="prefix")]
+        assert usernames == ["python", "pythonista"]
+        
+        # Wildcards in the term are matched literally
+        assert self.repo.search("my_", mode="prefix")[0].username == "my_python_blog"
+        assert self.repo.search("%", mode="prefix") == []
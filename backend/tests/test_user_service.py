@@ -1,6 +1,9 @@
 from tests.base_test import BaseTest
 from api.services.user_service import UserService
 from api.services.auth_service import AuthService
+from api.repositories import identity_map
+from api.repositories.follow_repository import FollowRepository
+from api.entities.entities import Follow
 
 class TestUserService(BaseTest):
     def setUp(self):
@@ -57,3 +60,21 @@ class TestUserService(BaseTest):
         # Bio should be missing if masked? Check implementation logic if needed.
         # Implementation: if private and cannot view -> returns only id, username, is_private
         assert "bio" not in fetched_user
+
+    def test_identity_map_dedupes_lookups_within_request(self):
+        p_id = self.auth_service.register(
+            username="private_m", email="pm@t.com", password="x", is_private=True
+        )["user"]["user_id"]
+        v_id = self.auth_service.register(username="viewer_m", email="vm@t.com", password="x")["user"]["user_id"]
+
+        with self.app.test_request_context():
+            fetched = self.user_service.get_user(user_id=p_id, current_user_id=v_id)
+            assert fetched["can_view_profile"] is False
+            # One user query and one follow query; can_view_profile reuses both
+            assert identity_map.stats() == {"hits": 2, "queries": 2}
+
+            # A write in the same request is visible to later lookups
+            FollowRepository().create(Follow(follower_id=v_id, following_id=p_id, status_id=2))
+            fetched = self.user_service.get_user(user_id=p_id, current_user_id=v_id)
+            assert fetched["can_view_profile"] is True
+            assert fetched["is_following"] is True
@@ -0,0 +1,36 @@
+"""Production entry point, served by gunicorn's gevent worker:
+
+    gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 wsgi:app
+
+Each request, including every open message stream (GET /api/messages/stream), runs on a
+greenlet instead of a thread, so an idle stream costs a little memory rather than a
+worker slot. Periodic jobs are not started here: run the maintenance scripts from cron.
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import psycopg2
+import psycopg2.extensions
+from gevent.socket import wait_read, wait_write
+
+
+def _gevent_wait_callback(conn, timeout=None):
+    """Let psycopg2 wait for the database on the gevent hub instead of blocking the worker"""
+    while True:
+        state = conn.poll()
+        if state == psycopg2.extensions.POLL_OK:
+            break
+        elif state == psycopg2.extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == psycopg2.extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state}")
+
+
+psycopg2.extensions.set_wait_callback(_gevent_wait_callback)
+
+from api import create_app
+
+app = create_app()
@@ -0,0 +1,20 @@
+-- One row per pair of users who have exchanged messages (user_a < user_b), maintained by triggers on Messages
+-- Each side has a read watermark: the (created_at, message_id) of the last message it has read;
+-- everything it received up to there is read, anything after is unread
+-- Used by: GET /api/messages/conversations, PUT /api/messages/<id>/read
+CREATE TABLE Conversations (
+    user_a INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    user_b INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    last_message_id INT,
+    last_message_at TIMESTAMPTZ,
+    unread_for_a INT NOT NULL DEFAULT 0,
+    unread_for_b INT NOT NULL DEFAULT 0,
+    last_read_message_id_a INT,
+    last_read_at_a TIMESTAMPTZ,
+    last_read_message_id_b INT,
+    last_read_at_b TIMESTAMPTZ,
+    -- Id of the last transaction that changed the row (set by trigger), for GET /api/messages/sync
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    PRIMARY KEY (user_a, user_b),
+    CONSTRAINT chk_conversations_ordered_users CHECK (user_a < user_b)
+);
@@ -0,0 +1,20 @@
+-- Precomputed top-N friend-of-friend recommendations per user (rebuilt by a batch job)
+-- Used by: GET /api/features/users/advanced-recommendations, GET /api/auth/users/recommendations
+CREATE TABLE FriendRecommendations (
+    user_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    rank SMALLINT NOT NULL,
+    suggested_user_id INT NOT NULL REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    mutual_count INT NOT NULL,
+    post_count INT NOT NULL,
+    follower_count INT NOT NULL,
+    score NUMERIC(12, 1) NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, rank)
+);
+
+-- Users whose follow set changed since their recommendations were computed
+-- (no foreign key: rows are written by the Follows trigger, also while a user is being deleted)
+CREATE TABLE FriendRecommendationsDirty (
+    user_id INT PRIMARY KEY,
+    marked_at TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,9 @@
+-- Precomputed home feed (fan-out-on-write)
+-- Used by: GET /api/posts/feed
+CREATE TABLE HomeTimeline (
+    user_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    post_id INT REFERENCES Posts(post_id) ON DELETE CASCADE,
+    author_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, post_id)
+);
@@ -0,0 +1,6 @@
+-- Last successful refresh of each materialized view
+-- Used by: freshness timestamps in popular posts responses
+CREATE TABLE MaterializedViewRefreshes (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMPTZ NOT NULL
+);
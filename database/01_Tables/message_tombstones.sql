@@ -0,0 +1,9 @@
+-- One row per deleted message, so syncing clients learn about deletions (kept MESSAGE_SYNC_RETENTION_DAYS)
+-- Used by: GET /api/messages/sync
+CREATE TABLE MessageTombstones (
+    message_id INT NOT NULL,
+    sender_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    receiver_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -1,12 +1,18 @@
+-- Range partitioned by month on created_at (messages_pYYYY_MM, see create_message_partitions);
+-- rows outside every monthly partition land in Messages_default
 CREATE TABLE Messages (
-    message_id SERIAL PRIMARY KEY,
+    message_id SERIAL,
     sender_id INT REFERENCES Users(user_id) ON DELETE SET NULL ON UPDATE CASCADE,
     receiver_id INT REFERENCES Users(user_id) ON DELETE SET NULL ON UPDATE CASCADE,
     content TEXT,
     media_url TEXT,
-    is_read BOOLEAN DEFAULT FALSE,
     sender_deleted BOOLEAN DEFAULT FALSE,
     receiver_deleted BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Id of the inserting transaction, for GET /api/messages/sync
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    PRIMARY KEY (message_id, created_at),
     CONSTRAINT chk_messages_different_users CHECK (sender_id != receiver_id)
-);
\ No newline at end of file
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE Messages_default PARTITION OF Messages DEFAULT;
\ No newline at end of file
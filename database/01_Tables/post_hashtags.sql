@@ -0,0 +1,8 @@
+-- Hashtags extracted from post content on create/update
+-- Used by: GET /api/posts/trending
+CREATE TABLE PostHashtags (
+    post_id INT REFERENCES Posts(post_id) ON DELETE CASCADE,
+    tag VARCHAR(100) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (post_id, tag)
+);
@@ -4,6 +4,10 @@ CREATE TABLE Posts (
     community_id INT REFERENCES Communities(community_id) ON DELETE CASCADE ON UPDATE CASCADE,
     content TEXT,
     media_url TEXT,
+    like_count INT NOT NULL DEFAULT 0,
+    comment_count INT NOT NULL DEFAULT 0,
+    hot_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(content, ''))) STORED,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT chk_posts_content_or_media CHECK ((content IS NOT NULL AND content != '') OR (media_url IS NOT NULL AND media_url != ''))
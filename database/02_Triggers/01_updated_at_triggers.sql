@@ -11,8 +11,9 @@
 -- $$ LANGUAGE plpgsql;
 
 -- Trigger for Posts table
+-- Only user-editable columns bump updated_at (counter updates must not)
 CREATE TRIGGER update_posts_updated_at
-    BEFORE UPDATE ON Posts
+    BEFORE UPDATE OF content, media_url, community_id ON Posts
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
@@ -0,0 +1,15 @@
+-- Post counter triggers
+-- Keep Posts.like_count and Posts.comment_count up to date
+
+-- Likes and unlikes maintain like_count themselves; this only catches deletes
+-- issued by foreign key cascades (pg_trigger_depth() > 0), e.g. user deletion
+CREATE TRIGGER update_post_like_count_trigger
+    AFTER DELETE ON PostLikes
+    FOR EACH ROW
+    WHEN (pg_trigger_depth() > 0)
+    EXECUTE FUNCTION update_post_like_count();
+
+CREATE TRIGGER update_post_comment_count_trigger
+    AFTER INSERT OR DELETE ON Comments
+    FOR EACH ROW
+    EXECUTE FUNCTION update_post_comment_count();
@@ -0,0 +1,7 @@
+-- Friend recommendation triggers
+-- Mark the follower for recomputation whenever a follow is created, accepted or removed
+
+CREATE TRIGGER mark_friend_recommendations_dirty_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF status_id ON Follows
+    FOR EACH ROW
+    EXECUTE FUNCTION mark_friend_recommendations_dirty();
@@ -0,0 +1,14 @@
+-- Conversation summary triggers
+-- Keep Conversations up to date on send and delete (one run per statement)
+
+CREATE TRIGGER conversations_after_message_insert_trigger
+    AFTER INSERT ON Messages
+    REFERENCING NEW TABLE AS new_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION conversations_after_message_insert();
+
+CREATE TRIGGER conversations_after_message_delete_trigger
+    AFTER DELETE ON Messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION conversations_after_message_delete();
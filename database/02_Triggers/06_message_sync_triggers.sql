@@ -0,0 +1,13 @@
+-- Message sync triggers
+-- Stamp conversation changes (new message, read watermark, unread count) and record deletions
+
+CREATE TRIGGER conversations_touch_change_seq_trigger
+    BEFORE INSERT OR UPDATE ON Conversations
+    FOR EACH ROW
+    EXECUTE FUNCTION conversations_touch_change_seq();
+
+CREATE TRIGGER messages_after_delete_tombstone_trigger
+    AFTER DELETE ON Messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION messages_after_delete_tombstone();
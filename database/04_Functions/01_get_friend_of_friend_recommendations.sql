@@ -50,13 +50,14 @@ BEGIN
         FROM mutual_counts mc
         INNER JOIN Users u ON u.user_id = mc.potential_friend
     )
+    -- Qualified columns: the RETURNS TABLE names (username, ...) are variables in this scope
     SELECT 
-        potential_friend,
-        username,
-        mutual_count,
-        ROUND(strength, 2) AS connection_strength
-    FROM scored_recommendations
-    ORDER BY strength DESC, mutual_count DESC
+        sr.potential_friend,
+        sr.username,
+        CAST(sr.mutual_count AS INTEGER),
+        ROUND(sr.strength, 2) AS connection_strength
+    FROM scored_recommendations sr
+    ORDER BY sr.strength DESC, sr.mutual_count DESC
     LIMIT 50;
 END;
 $$ LANGUAGE plpgsql;
@@ -0,0 +1,35 @@
+-- Post Counter Update Trigger Functions
+-- Keep Posts.like_count / Posts.comment_count in sync with PostLikes and Comments
+-- Used by: user deletion (cascaded likes), POST/DELETE comments
+-- Likes and unlikes update like_count in the same statement (PostRepository.add_like/remove_like);
+-- this only covers likes removed by cascades, e.g. when the liking user is deleted
+CREATE OR REPLACE FUNCTION update_post_like_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE Posts
+    SET like_count = GREATEST(like_count - 1, 0),
+        hot_score = compute_hot_score(GREATEST(like_count - 1, 0), comment_count, created_at)
+    WHERE post_id = OLD.post_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_post_comment_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (TG_OP = 'INSERT') THEN
+        UPDATE Posts
+        SET comment_count = comment_count + 1,
+            hot_score = compute_hot_score(like_count, comment_count + 1, created_at)
+        WHERE post_id = NEW.post_id;
+        RETURN NEW;
+    ELSIF (TG_OP = 'DELETE') THEN
+        UPDATE Posts
+        SET comment_count = GREATEST(comment_count - 1, 0),
+            hot_score = compute_hot_score(like_count, GREATEST(comment_count - 1, 0), created_at)
+        WHERE post_id = OLD.post_id;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
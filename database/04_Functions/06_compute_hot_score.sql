@@ -0,0 +1,10 @@
+-- Hot Score Function
+-- Time-decayed ranking (Hacker News style): engagement / (age_hours + 2) ^ 1.8
+-- Used by: post counter triggers, periodic hot score recomputation, GET /api/posts/discover
+CREATE OR REPLACE FUNCTION compute_hot_score(likes INT, comments INT, posted_at TIMESTAMPTZ)
+RETURNS DOUBLE PRECISION AS $$
+BEGIN
+    RETURN (likes + comments * 2)::DOUBLE PRECISION
+        / POWER(GREATEST(EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - posted_at)) / 3600.0, 0) + 2, 1.8);
+END;
+$$ LANGUAGE plpgsql STABLE;
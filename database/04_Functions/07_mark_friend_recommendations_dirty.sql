@@ -0,0 +1,19 @@
+-- Friend Recommendations Dirty Tracking Function
+-- Used by: POST/DELETE /api/users/<id>/follow, POST /api/me/follow-requests/<id>/accept
+CREATE OR REPLACE FUNCTION mark_friend_recommendations_dirty()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_user_id INT;
+BEGIN
+    IF (TG_OP = 'DELETE') THEN
+        changed_user_id := OLD.follower_id;
+    ELSE
+        changed_user_id := NEW.follower_id;
+    END IF;
+
+    INSERT INTO FriendRecommendationsDirty (user_id, marked_at)
+    VALUES (changed_user_id, CURRENT_TIMESTAMP)
+    ON CONFLICT (user_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,84 @@
+-- Conversation Summary Trigger Functions
+-- Keep Conversations (last message + unread counts per side) in sync with Messages
+-- Statement-level: each function handles every row of one INSERT/DELETE at once
+-- Reads move the watermarks on Conversations directly (MessageRepository), so Messages rows never change on read
+-- Used by: POST /api/messages, DELETE /api/messages/<id>
+CREATE OR REPLACE FUNCTION conversations_after_message_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO Conversations AS c (user_a, user_b, last_message_id, last_message_at, unread_for_a, unread_for_b)
+    SELECT
+        LEAST(sender_id, receiver_id),
+        GREATEST(sender_id, receiver_id),
+        (ARRAY_AGG(message_id ORDER BY created_at DESC, message_id DESC))[1],
+        MAX(created_at),
+        COUNT(*) FILTER (WHERE receiver_id < sender_id),
+        COUNT(*) FILTER (WHERE receiver_id > sender_id)
+    FROM new_messages
+    WHERE sender_id IS NOT NULL AND receiver_id IS NOT NULL
+    GROUP BY LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id)
+    ON CONFLICT (user_a, user_b) DO UPDATE SET
+        last_message_id = CASE
+            WHEN c.last_message_id IS NULL
+              OR (EXCLUDED.last_message_at, EXCLUDED.last_message_id) > (c.last_message_at, c.last_message_id)
+            THEN EXCLUDED.last_message_id ELSE c.last_message_id END,
+        last_message_at = CASE
+            WHEN c.last_message_id IS NULL
+              OR (EXCLUDED.last_message_at, EXCLUDED.last_message_id) > (c.last_message_at, c.last_message_id)
+            THEN EXCLUDED.last_message_at ELSE c.last_message_at END,
+        unread_for_a = c.unread_for_a + EXCLUDED.unread_for_a,
+        unread_for_b = c.unread_for_b + EXCLUDED.unread_for_b;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION conversations_after_message_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Deleted messages past the receiver's watermark were unread
+    UPDATE Conversations c
+    SET unread_for_a = GREATEST(c.unread_for_a - d.unread_a, 0),
+        unread_for_b = GREATEST(c.unread_for_b - d.unread_b, 0)
+    FROM (
+        SELECT
+            c2.user_a,
+            c2.user_b,
+            COUNT(*) FILTER (WHERE o.receiver_id = c2.user_a AND (c2.last_read_message_id_a IS NULL
+                OR (o.created_at, o.message_id) > (c2.last_read_at_a, c2.last_read_message_id_a))) AS unread_a,
+            COUNT(*) FILTER (WHERE o.receiver_id = c2.user_b AND (c2.last_read_message_id_b IS NULL
+                OR (o.created_at, o.message_id) > (c2.last_read_at_b, c2.last_read_message_id_b))) AS unread_b
+        FROM old_messages o
+        JOIN Conversations c2
+          ON c2.user_a = LEAST(o.sender_id, o.receiver_id) AND c2.user_b = GREATEST(o.sender_id, o.receiver_id)
+        GROUP BY c2.user_a, c2.user_b
+    ) d
+    WHERE c.user_a = d.user_a AND c.user_b = d.user_b;
+
+    -- Conversations whose last message was deleted point at the newest remaining one ...
+    -- (found by primary key from the deleted messages' pairs, never by scanning Conversations)
+    UPDATE Conversations c
+    SET (last_message_id, last_message_at) = (
+        SELECT m.message_id, m.created_at
+        FROM Messages m
+        WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+          AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+        ORDER BY m.created_at DESC, m.message_id DESC
+        LIMIT 1
+    )
+    FROM old_messages o
+    WHERE c.user_a = LEAST(o.sender_id, o.receiver_id)
+      AND c.user_b = GREATEST(o.sender_id, o.receiver_id)
+      AND c.last_message_id = o.message_id
+      AND c.last_message_at = o.created_at;
+
+    -- ... or disappear when none is left
+    DELETE FROM Conversations c
+    USING (
+        SELECT DISTINCT LEAST(sender_id, receiver_id) AS user_a, GREATEST(sender_id, receiver_id) AS user_b
+        FROM old_messages
+    ) o
+    WHERE c.user_a = o.user_a AND c.user_b = o.user_b
+      AND c.last_message_id IS NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
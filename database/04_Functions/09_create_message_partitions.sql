@@ -0,0 +1,34 @@
+-- Monthly Messages Partitions
+-- Create the partitions for the months_back months before the current one, the current month and
+-- the months_ahead months after it; existing partitions are skipped. Rows of a new month that
+-- already landed in Messages_default are moved into its partition before it is attached.
+-- Used by: init.sql, the create_message_partitions scheduler job, migrate.py partition_messages
+CREATE OR REPLACE FUNCTION create_message_partitions(months_ahead INT, months_back INT DEFAULT 0)
+RETURNS INT AS $$
+DECLARE
+    month_start TIMESTAMPTZ;
+    month_end TIMESTAMPTZ;
+    partition_name TEXT;
+    created INT := 0;
+BEGIN
+    FOR i IN -months_back..months_ahead LOOP
+        month_start := date_trunc('month', CURRENT_TIMESTAMP) + make_interval(months => i);
+        month_end := month_start + INTERVAL '1 month';
+        partition_name := 'messages_p' || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+
+        EXECUTE format('CREATE TABLE %I (LIKE Messages INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM Messages_default WHERE created_at >= %L AND created_at < %L RETURNING *)
+             INSERT INTO %I SELECT * FROM moved',
+            month_start, month_end, partition_name
+        );
+        EXECUTE format(
+            'ALTER TABLE Messages ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, month_end
+        );
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
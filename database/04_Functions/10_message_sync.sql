@@ -0,0 +1,22 @@
+-- Message Sync Trigger Functions
+-- Every change a syncing client must replay carries change_seq: the id of the transaction that
+-- made it (pg_current_xact_id()), which only grows
+-- Used by: GET /api/messages/sync, DELETE /api/messages/<id>
+CREATE OR REPLACE FUNCTION conversations_touch_change_seq()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.change_seq := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION messages_after_delete_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO MessageTombstones (message_id, sender_id, receiver_id)
+    SELECT message_id, sender_id, receiver_id
+    FROM old_messages
+    WHERE sender_id IS NOT NULL OR receiver_id IS NOT NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -2,6 +2,9 @@
 -- 9. INDEXES
 -- ============================================
 
+-- Extensions required by the indexes below
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Standard performance indexes
 CREATE INDEX idx_users_username ON Users(username);
 CREATE INDEX idx_users_email ON Users(email);
@@ -17,11 +20,39 @@ CREATE INDEX IF NOT EXISTS idx_follows_follower_status ON Follows(follower_id, s
 CREATE INDEX IF NOT EXISTS idx_follows_following_status ON Follows(following_id, status_id);
 CREATE INDEX idx_messages_sender_id ON Messages(sender_id);
 CREATE INDEX idx_messages_receiver_id ON Messages(receiver_id);
-CREATE INDEX idx_messages_unread ON Messages(receiver_id) WHERE is_read = FALSE;
 CREATE INDEX IF NOT EXISTS idx_posts_user_created ON Posts(user_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_postlikes_user_id ON PostLikes(user_id);
 CREATE INDEX IF NOT EXISTS idx_comments_parent_post ON Comments(parent_comment_id, post_id);
 CREATE INDEX IF NOT EXISTS idx_follows_status ON Follows(status_id, following_id);
+CREATE INDEX IF NOT EXISTS idx_home_timeline_user_created ON HomeTimeline(user_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_post_hashtags_created_tag ON PostHashtags(created_at, tag);
+CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON Posts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_posts_hot_score ON Posts(hot_score DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_a_recent ON Conversations(user_a, last_message_at DESC, last_message_id DESC);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_b_recent ON Conversations(user_b, last_message_at DESC, last_message_id DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_pair_recent ON Messages(LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id), created_at DESC, message_id DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_receiver_change ON Messages(receiver_id, change_seq, message_id);
+CREATE INDEX IF NOT EXISTS idx_messages_sender_change ON Messages(sender_id, change_seq, message_id);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_a_change ON Conversations(user_a, change_seq);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_b_change ON Conversations(user_b, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_receiver_change ON MessageTombstones(receiver_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_sender_change ON MessageTombstones(sender_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_deleted_at ON MessageTombstones(deleted_at);
+
+-- Search indexes: trigram (substring + similarity) and lowercase prefix (autocomplete)
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm ON Users USING GIN (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_bio_trgm ON Users USING GIN (bio gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_username_prefix ON Users (LOWER(username) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_communities_name_trgm ON Communities USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_communities_description_trgm ON Communities USING GIN (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_communities_name_prefix ON Communities (LOWER(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_posts_user_keyset ON Posts(user_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_community_keyset ON Posts(community_id, created_at DESC, post_id DESC);
+CREATE INDEX IF NOT EXISTS idx_comments_post_keyset ON Comments(post_id, created_at, comment_id) WHERE parent_comment_id IS NULL;
+CREATE INDEX IF NOT EXISTS idx_comments_parent_keyset ON Comments(parent_comment_id, created_at, comment_id);
+CREATE INDEX IF NOT EXISTS idx_follows_following_keyset ON Follows(following_id, created_at DESC, follower_id DESC) WHERE status_id = 2;
+CREATE INDEX IF NOT EXISTS idx_follows_follower_keyset ON Follows(follower_id, created_at DESC, following_id DESC) WHERE status_id = 2;
+CREATE INDEX IF NOT EXISTS idx_community_members_keyset ON CommunityMembers(community_id, joined_at DESC, user_id DESC);
 
 -- Soft delete indexes (Merged from migrations)
 CREATE INDEX IF NOT EXISTS idx_messages_sender_deleted ON Messages(sender_id) WHERE sender_deleted = FALSE;
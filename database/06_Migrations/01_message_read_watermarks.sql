@@ -0,0 +1,76 @@
+-- Message read watermarks
+-- Replaces the per-row Messages.is_read flag with one read watermark per side on Conversations.
+-- Existing databases: run backend/migrate.py read_watermarks, which applies this file and then
+-- reloads 04_Functions/08_update_conversations.sql in the same transaction. Safe to re-run.
+
+ALTER TABLE Conversations ADD COLUMN IF NOT EXISTS last_read_message_id_a INT;
+ALTER TABLE Conversations ADD COLUMN IF NOT EXISTS last_read_at_a TIMESTAMPTZ;
+ALTER TABLE Conversations ADD COLUMN IF NOT EXISTS last_read_message_id_b INT;
+ALTER TABLE Conversations ADD COLUMN IF NOT EXISTS last_read_at_b TIMESTAMPTZ;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'messages' AND column_name = 'is_read'
+    ) THEN
+        -- Each side's watermark is its last received message before the first one it has not
+        -- read, so no unread message becomes read (a read message after an unread one turns unread)
+        UPDATE Conversations c
+        SET last_read_message_id_a = w.read_id_a,
+            last_read_at_a = w.read_at_a,
+            last_read_message_id_b = w.read_id_b,
+            last_read_at_b = w.read_at_b
+        FROM (
+            SELECT
+                user_a,
+                user_b,
+                (ARRAY_AGG(message_id ORDER BY created_at DESC, message_id DESC) FILTER (WHERE receiver_id = user_a))[1] AS read_id_a,
+                MAX(created_at) FILTER (WHERE receiver_id = user_a) AS read_at_a,
+                (ARRAY_AGG(message_id ORDER BY created_at DESC, message_id DESC) FILTER (WHERE receiver_id = user_b))[1] AS read_id_b,
+                MAX(created_at) FILTER (WHERE receiver_id = user_b) AS read_at_b
+            FROM (
+                SELECT
+                    LEAST(sender_id, receiver_id) AS user_a,
+                    GREATEST(sender_id, receiver_id) AS user_b,
+                    receiver_id,
+                    message_id,
+                    created_at,
+                    BOOL_AND(is_read IS TRUE) OVER (
+                        PARTITION BY LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id), receiver_id
+                        ORDER BY created_at, message_id
+                    ) AS read_so_far
+                FROM Messages
+                WHERE sender_id IS NOT NULL AND receiver_id IS NOT NULL
+            ) received
+            WHERE read_so_far
+            GROUP BY user_a, user_b
+        ) w
+        WHERE c.user_a = w.user_a AND c.user_b = w.user_b;
+
+        -- Unread counts now follow the watermarks
+        UPDATE Conversations c
+        SET unread_for_a = (
+                SELECT COUNT(*) FROM Messages m
+                WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+                  AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+                  AND m.receiver_id = c.user_a
+                  AND (c.last_read_message_id_a IS NULL
+                       OR (m.created_at, m.message_id) > (c.last_read_at_a, c.last_read_message_id_a))
+            ),
+            unread_for_b = (
+                SELECT COUNT(*) FROM Messages m
+                WHERE LEAST(m.sender_id, m.receiver_id) = c.user_a
+                  AND GREATEST(m.sender_id, m.receiver_id) = c.user_b
+                  AND m.receiver_id = c.user_b
+                  AND (c.last_read_message_id_b IS NULL
+                       OR (m.created_at, m.message_id) > (c.last_read_at_b, c.last_read_message_id_b))
+            );
+    END IF;
+END $$;
+
+-- Reads no longer update Messages: drop the read-flip trigger, the flag and its partial index
+DROP TRIGGER IF EXISTS conversations_after_message_update_trigger ON Messages;
+DROP FUNCTION IF EXISTS conversations_after_message_update();
+DROP INDEX IF EXISTS idx_messages_unread;
+ALTER TABLE Messages DROP COLUMN IF EXISTS is_read;
@@ -0,0 +1,82 @@
+-- Partition Messages by month
+-- Rebuilds an existing unpartitioned Messages table as the monthly range-partitioned table of
+-- 01_Tables/messages.sql, copying every row. Takes an exclusive lock on Messages for the copy.
+-- Existing databases: run backend/migrate.py partition_messages, which first loads
+-- 04_Functions/09_create_message_partitions.sql. Does nothing if Messages is already partitioned.
+
+DO $$
+DECLARE
+    months_back INT;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'messages'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    LOCK TABLE Messages IN ACCESS EXCLUSIVE MODE;
+    ALTER TABLE Messages RENAME TO Messages_unpartitioned;
+    ALTER INDEX messages_pkey RENAME TO messages_unpartitioned_pkey;
+    ALTER SEQUENCE messages_message_id_seq OWNED BY NONE;
+    DROP INDEX IF EXISTS idx_messages_sender_id, idx_messages_receiver_id, idx_messages_pair_recent,
+        idx_messages_sender_deleted, idx_messages_receiver_deleted;
+
+    CREATE TABLE Messages (
+        message_id INT NOT NULL DEFAULT nextval('messages_message_id_seq'),
+        sender_id INT REFERENCES Users(user_id) ON DELETE SET NULL ON UPDATE CASCADE,
+        receiver_id INT REFERENCES Users(user_id) ON DELETE SET NULL ON UPDATE CASCADE,
+        content TEXT,
+        media_url TEXT,
+        sender_deleted BOOLEAN DEFAULT FALSE,
+        receiver_deleted BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (message_id, created_at),
+        CONSTRAINT chk_messages_different_users CHECK (sender_id != receiver_id)
+    ) PARTITION BY RANGE (created_at);
+    CREATE TABLE Messages_default PARTITION OF Messages DEFAULT;
+    ALTER SEQUENCE messages_message_id_seq OWNED BY Messages.message_id;
+
+    -- One partition per month from the oldest message through three months ahead
+    SELECT COALESCE(
+        (EXTRACT(YEAR FROM age(date_trunc('month', CURRENT_TIMESTAMP), date_trunc('month', MIN(created_at)))) * 12
+         + EXTRACT(MONTH FROM age(date_trunc('month', CURRENT_TIMESTAMP), date_trunc('month', MIN(created_at)))))::INT,
+        0
+    ) INTO months_back
+    FROM Messages_unpartitioned;
+    PERFORM create_message_partitions(3, GREATEST(months_back, 0));
+
+    -- Copied before the triggers exist: Conversations already reflects these rows
+    INSERT INTO Messages (message_id, sender_id, receiver_id, content, media_url, sender_deleted, receiver_deleted, created_at)
+    SELECT message_id, sender_id, receiver_id, content, media_url, sender_deleted, receiver_deleted,
+           COALESCE(created_at, CURRENT_TIMESTAMP)
+    FROM Messages_unpartitioned;
+    DROP TABLE Messages_unpartitioned;
+
+    CREATE INDEX idx_messages_sender_id ON Messages(sender_id);
+    CREATE INDEX idx_messages_receiver_id ON Messages(receiver_id);
+    CREATE INDEX idx_messages_pair_recent ON Messages(LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id), created_at DESC, message_id DESC);
+    CREATE INDEX idx_messages_sender_deleted ON Messages(sender_id) WHERE sender_deleted = FALSE;
+    CREATE INDEX idx_messages_receiver_deleted ON Messages(receiver_id) WHERE receiver_deleted = FALSE;
+
+    CREATE TRIGGER messages_sender_soft_delete_trigger
+    BEFORE UPDATE OF sender_id ON Messages
+    FOR EACH ROW
+    WHEN (NEW.sender_id IS NULL AND OLD.sender_id IS NOT NULL)
+    EXECUTE FUNCTION messages_sender_soft_delete();
+
+    CREATE TRIGGER messages_receiver_soft_delete_trigger
+    BEFORE UPDATE OF receiver_id ON Messages
+    FOR EACH ROW
+    WHEN (NEW.receiver_id IS NULL AND OLD.receiver_id IS NOT NULL)
+    EXECUTE FUNCTION messages_receiver_soft_delete();
+
+    CREATE TRIGGER conversations_after_message_insert_trigger
+        AFTER INSERT ON Messages
+        REFERENCING NEW TABLE AS new_messages
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION conversations_after_message_insert();
+
+    CREATE TRIGGER conversations_after_message_delete_trigger
+        AFTER DELETE ON Messages
+        REFERENCING OLD TABLE AS old_messages
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION conversations_after_message_delete();
+END $$;
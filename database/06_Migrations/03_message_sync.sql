@@ -0,0 +1,45 @@
+-- Message sync change sequence
+-- Adds change_seq to Messages and Conversations, the MessageTombstones table, their
+-- (user, change_seq) indexes and the triggers behind GET /api/messages/sync. Existing messages
+-- and conversations get the id of this transaction, so any older sync token sees them once more.
+-- Existing databases: run backend/migrate.py message_sync (after partition_messages), which
+-- first loads 04_Functions/10_message_sync.sql.
+
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'messages'::regclass) <> 'p' THEN
+        RAISE EXCEPTION 'Messages is not partitioned yet: run the partition_messages migration first';
+    END IF;
+END $$;
+
+ALTER TABLE Messages ADD COLUMN IF NOT EXISTS change_seq XID8 NOT NULL DEFAULT pg_current_xact_id();
+ALTER TABLE Conversations ADD COLUMN IF NOT EXISTS change_seq XID8 NOT NULL DEFAULT pg_current_xact_id();
+
+CREATE TABLE IF NOT EXISTS MessageTombstones (
+    message_id INT NOT NULL,
+    sender_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    receiver_id INT REFERENCES Users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    change_seq XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_messages_receiver_change ON Messages(receiver_id, change_seq, message_id);
+CREATE INDEX IF NOT EXISTS idx_messages_sender_change ON Messages(sender_id, change_seq, message_id);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_a_change ON Conversations(user_a, change_seq);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_b_change ON Conversations(user_b, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_receiver_change ON MessageTombstones(receiver_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_sender_change ON MessageTombstones(sender_id, change_seq);
+CREATE INDEX IF NOT EXISTS idx_message_tombstones_deleted_at ON MessageTombstones(deleted_at);
+
+DROP TRIGGER IF EXISTS conversations_touch_change_seq_trigger ON Conversations;
+CREATE TRIGGER conversations_touch_change_seq_trigger
+    BEFORE INSERT OR UPDATE ON Conversations
+    FOR EACH ROW
+    EXECUTE FUNCTION conversations_touch_change_seq();
+
+DROP TRIGGER IF EXISTS messages_after_delete_tombstone_trigger ON Messages;
+CREATE TRIGGER messages_after_delete_tombstone_trigger
+    AFTER DELETE ON Messages
+    REFERENCING OLD TABLE AS old_messages
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION messages_after_delete_tombstone();